@@ -1,12 +1,18 @@
 """
 Agent 패키지
 - LangChain Agent 구성
+- Agent 앞단 규칙 라우터
 """
 
-from .agent import create_agent
+from .agent import create_agent, AGENT_LLM_TAG
 from .prompts import SYSTEM_PROMPT
+from .router import route_turn, record_agent_turn, get_router_stats
 
 __all__ = [
     "create_agent",
-    "SYSTEM_PROMPT"
+    "AGENT_LLM_TAG",
+    "SYSTEM_PROMPT",
+    "route_turn",
+    "record_agent_turn",
+    "get_router_stats"
 ]
\ No newline at end of file
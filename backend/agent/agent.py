@@ -10,9 +10,13 @@ from tools import (
 )
 from agent.prompts import SYSTEM_PROMPT
 
+# Agent(계획/최종 답변) LLM 호출에 붙이는 태그
+# 스트리밍 시 도구 내부 LLM 호출과 구분해서 최종 답변 토큰만 내보내는 데 사용
+AGENT_LLM_TAG = "agent_llm"
+
 def create_agent():
     """LangChain Agent 생성"""
-    llm = get_llm()
+    llm = get_llm().with_config(tags=[AGENT_LLM_TAG])
     
     tools = [
         extract_user_intent,
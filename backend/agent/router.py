@@ -0,0 +1,273 @@
+"""
+Agent 앞단 규칙 라우터
+
+확실한 패턴은 Agent(LLM 도구 선택 + 최종 답변) 없이 도구를 바로 실행
+- 지도 요청 + 순서 지정 ("두 번째만 지도 보여줘") → show_map_for_facilities
+- 지역이 있는 추천 요청 ("수원 아이랑 갈만한 곳 추천해줘")
+  → extract_user_intent → (get_weather_forecast) → search_facilities → 템플릿 답변
+애매한 턴(None 반환)은 기존 Agent가 처리
+"""
+
+from typing import Dict, List, Optional, Tuple
+import json
+import logging
+import re
+import threading
+from langchain_core.agents import AgentAction
+from tools import (
+    extract_user_intent,
+    get_weather_forecast,
+    search_facilities,
+    show_map_for_facilities
+)
+from utils.conversation_memory import get_last_search_results
+from utils.intent_parser import parse_intent
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+ROUTE_MAP = "map"
+ROUTE_RECOMMEND = "recommend"
+
+# ----------------------------------------------------------------------
+# 패턴
+# ----------------------------------------------------------------------
+_MAP_RE = re.compile(r"지도")
+# 위치를 묻는 표현은 순서("1번", "마지막")가 같이 있을 때만 이전 결과의 지도 요청 (없으면 새 검색일 수 있음)
+_LOCATION_RE = re.compile(r"위치|어디\s*(?:에\s*)?있")
+_RECOMMEND_RE = re.compile(
+    r"추천|알려\s*줘|알려\s*주|찾아\s*줘|찾아\s*주|갈\s*만한|가\s*볼\s*만한|갈\s*곳|놀\s*곳|놀\s*만한|어디\s*(?:가|갈)"
+)
+# 이전 결과를 가리키거나 조건을 빼는 표현 → 문맥 해석이 필요하므로 Agent로
+_CONTEXTUAL_RE = re.compile(r"거기|그\s*중|그중|아까|이전|말고|빼고|제외|대신|다른\s*곳|또\s*다른|더\s*(?:없|알려|추천)")
+_ALL_RE = re.compile(r"전부|모두|전체|다\s*보여|세\s*곳\s*다")
+
+_ORDINALS = [
+    (re.compile(r"첫\s*(?:번\s*)?째|첫\s*번|(?<!\d)1\s*번(?:\s*째)?"), 0),
+    (re.compile(r"두\s*번\s*째|둘\s*째|(?<!\d)2\s*번(?:\s*째)?"), 1),
+    (re.compile(r"세\s*번\s*째|셋\s*째|(?<!\d)3\s*번(?:\s*째)?"), 2),
+    (re.compile(r"마지막"), -1),
+]
+_NUMBER_RE = re.compile(r"\d+")
+_NUMBERED_ORDINAL_RE = re.compile(r"(?<!\d)[123]\s*번")
+
+MAX_ROUTED_MESSAGE_LENGTH = 60
+
+
+def parse_map_indices(message: str, available: int) -> Optional[List[int]]:
+    """
+    지도 요청의 시설 순서 → 인덱스 목록 (언급 순서 유지)
+    순서 언급이 없거나 "전부"면 전체, 범위를 벗어나거나 이해 못 한 숫자가 있으면 None ("12번", "10번")
+    """
+    if len(_NUMBER_RE.findall(message)) != len(_NUMBERED_ORDINAL_RE.findall(message)):
+        return None
+    if _ALL_RE.search(message):
+        return list(range(min(available, 3)))
+    
+    found: List[Tuple[int, int]] = []
+    for pattern, index in _ORDINALS:
+        for match in pattern.finditer(message):
+            found.append((match.start(), available - 1 if index < 0 else index))
+    if not found:
+        return list(range(min(available, 3)))
+    
+    indices = []
+    for _, index in sorted(found):
+        if index not in indices:
+            indices.append(index)
+    if any(not 0 <= index < available for index in indices):
+        return None
+    return indices
+
+
+# ----------------------------------------------------------------------
+# 지표
+# ----------------------------------------------------------------------
+class RouterStats:
+    """라우팅 / Agent fallback 횟수와 절약한 LLM 호출 수"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routed = {ROUTE_MAP: 0, ROUTE_RECOMMEND: 0}
+        self.route_failures = {ROUTE_MAP: 0, ROUTE_RECOMMEND: 0}
+        self.llm_calls_saved = 0
+        self.agent_turns = 0
+        self.agent_llm_calls = 0
+    
+    def record_route(self, route: str, llm_calls_saved: int):
+        with self._lock:
+            self.routed[route] += 1
+            self.llm_calls_saved += llm_calls_saved
+    
+    def record_failure(self, route: str):
+        with self._lock:
+            self.route_failures[route] += 1
+    
+    def record_agent_turn(self, llm_calls: int):
+        with self._lock:
+            self.agent_turns += 1
+            self.agent_llm_calls += llm_calls
+    
+    def snapshot(self) -> Dict:
+        with self._lock:
+            routed_total = sum(self.routed.values())
+            turns = routed_total + self.agent_turns
+            return {
+                "routed": dict(self.routed),
+                "route_failures": dict(self.route_failures),
+                "agent_turns": self.agent_turns,
+                "routed_ratio": routed_total / turns if turns else 0.0,
+                "llm_calls_saved": self.llm_calls_saved,
+                "avg_llm_calls_per_agent_turn": self.agent_llm_calls / self.agent_turns if self.agent_turns else 0.0,
+                "avg_llm_calls_per_turn": self.agent_llm_calls / turns if turns else 0.0,
+            }
+
+
+router_stats = RouterStats()
+
+
+def record_agent_turn(intermediate_steps: List):
+    """Agent가 처리한 턴 기록 (functions agent: 도구 선택마다 1회 + 최종 답변 1회)"""
+    router_stats.record_agent_turn(len(intermediate_steps) + 1)
+
+
+def get_router_stats() -> Dict:
+    return router_stats.snapshot()
+
+
+# ----------------------------------------------------------------------
+# 라우팅
+# ----------------------------------------------------------------------
+class RoutedTurn:
+    """규칙 라우터가 처리한 턴 (Agent 결과와 같은 output / intermediate_steps 모양)"""
+    
+    __slots__ = ("route", "output", "intermediate_steps", "llm_calls_saved")
+    
+    def __init__(self, route: str, output: str, intermediate_steps: List[Tuple[AgentAction, str]], llm_calls_saved: int):
+        self.route = route
+        self.output = output
+        self.intermediate_steps = intermediate_steps
+        self.llm_calls_saved = llm_calls_saved
+
+
+def _run_tool(steps: List, tool, tool_input: Dict) -> str:
+    """도구 실행 + Agent와 같은 형식으로 단계 기록"""
+    with span(tool.name, kind="tool", source="router"):
+        observation = tool.invoke(tool_input)
+    steps.append((AgentAction(tool=tool.name, tool_input=tool_input, log="router"), observation))
+    return observation
+
+
+def _route_map(conversation_id: str, message: str) -> Optional[RoutedTurn]:
+    stored = get_last_search_results(conversation_id)
+    if not stored:
+        return None  # 저장된 검색 결과가 없으면 LLM 추출이 필요할 수 있음
+    indices = parse_map_indices(message, len(stored))
+    if indices is None:
+        return None
+    
+    steps: List = []
+    observation = _run_tool(steps, show_map_for_facilities, {"facility_indices": ",".join(map(str, indices))})
+    if not json.loads(observation).get("success"):
+        router_stats.record_failure(ROUTE_MAP)
+        return None
+    
+    # 최종 문구는 _finalize_turn이 지도 데이터로 채움
+    return RoutedTurn(ROUTE_MAP, "지도를 표시합니다.", steps, llm_calls_saved=len(steps) + 1)
+
+
+def _render_recommendation(location: str, weather: Optional[Dict], facilities: List[Dict]) -> str:
+    lines = []
+    if weather and weather.get("success"):
+        place = "실내" if weather.get("is_indoor") else "야외"
+        lines.append(
+            f"{weather['date']} {weather['city']} 날씨는 {weather['weather']}, {weather['temp']:.0f}°C라서 "
+            f"{place} 위주로 찾아봤어요."
+        )
+    
+    if not facilities:
+        lines.append(f"아쉽지만 {location}에서 조건에 맞는 곳을 찾지 못했어요 😢 다른 지역이나 조건으로 다시 물어봐 주세요!")
+        return "\n".join(lines)
+    
+    lines.append(f"{location}에서 아이와 함께 가기 좋은 곳을 골라봤어요 😊\n")
+    for i, facility in enumerate(facilities, start=1):
+        lines.append(f"{i}. **{facility['name']}** ({facility['category']})")
+        if facility.get("note"):
+            note = str(facility["note"])
+            lines.append(f"   {note[:80]}{'…' if len(note) > 80 else ''}")
+    lines.append('\n위치가 궁금하시면 "지도 보여줘"라고 말씀해 주세요! 🗺️')
+    return "\n".join(lines)
+
+
+def _route_recommend(message: str) -> Optional[RoutedTurn]:
+    steps: List = []
+    intent = json.loads(_run_tool(steps, extract_user_intent, {"user_message": message}))
+    location = intent.get("location")
+    if not location:
+        return None
+    
+    weather = None
+    is_indoor = None
+    if intent.get("needs_weather_check"):
+        weather = json.loads(_run_tool(steps, get_weather_forecast, {
+            "city_name": location,
+            "date": intent.get("date") or "today"
+        }))
+        if weather.get("success"):
+            is_indoor = weather.get("is_indoor")
+    
+    search_input = {"original_query": message, "region": location}
+    if is_indoor is not None:
+        search_input["is_indoor"] = is_indoor
+    search = json.loads(_run_tool(steps, search_facilities, search_input))
+    if not search.get("success"):
+        router_stats.record_failure(ROUTE_RECOMMEND)
+        return None
+    
+    output = _render_recommendation(location, weather, search.get("facilities", []))
+    return RoutedTurn(ROUTE_RECOMMEND, output, steps, llm_calls_saved=len(steps) + 1)
+
+
+def classify_turn(message: str) -> Optional[str]:
+    """메시지만 보고 라우트 결정 (ROUTE_MAP / ROUTE_RECOMMEND / None)"""
+    text = message.strip()
+    if not text or len(text) > MAX_ROUTED_MESSAGE_LENGTH or _CONTEXTUAL_RE.search(text):
+        return None
+    
+    parsed = parse_intent(text)
+    has_ordinal = any(pattern.search(text) for pattern, _ in _ORDINALS)
+    wants_map = bool(_MAP_RE.search(text)) or (has_ordinal and bool(_LOCATION_RE.search(text)))
+    wants_recommendation = bool(_RECOMMEND_RE.search(text))
+    
+    # "1번 위치 알려줘"처럼 추천 표현이 섞여도 지역이 없으면 이전 결과의 지도 요청
+    # ("키즈카페 어디 있어?"처럼 순서 없이 위치만 물으면 새 검색일 수 있으므로 Agent로)
+    if wants_map and parsed.result["location"] is None:
+        return ROUTE_MAP
+    if wants_recommendation and not wants_map and parsed.confident and parsed.result["location"]:
+        return ROUTE_RECOMMEND
+    return None
+
+
+def route_turn(conversation_id: str, message: str) -> Optional[RoutedTurn]:
+    """
+    확실한 패턴이면 도구를 직접 실행한 결과, 아니면 None (Agent로 처리)
+    도구는 동기 호출이므로 스레드 풀에서 실행해야 함 (run_blocking)
+    """
+    route = classify_turn(message)
+    if route is None:
+        return None
+    
+    text = message.strip()
+    try:
+        if route == ROUTE_MAP:
+            routed = _route_map(conversation_id, text)
+        else:
+            routed = _route_recommend(text)
+    except Exception as e:
+        logger.warning(f"규칙 라우터 실패 → Agent로 처리: {e}")
+        return None
+    
+    if routed is not None:
+        router_stats.record_route(routed.route, routed.llm_calls_saved)
+        logger.info(f"🔀 규칙 라우팅: {routed.route} (LLM 호출 {routed.llm_calls_saved}회 절약)")
+    return routed
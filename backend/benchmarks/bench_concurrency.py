@@ -0,0 +1,93 @@
+"""
+/api/chat 동시성 부하 테스트
+
+Agent를 지연 시간이 주입된 가짜 executor로 교체하고, 동시 요청이
+직렬화되지 않고 스레드 풀 크기만큼 확장되는지 확인합니다.
+
+실행: python -m benchmarks.bench_concurrency [--requests 32] [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import setup_env
+
+setup_env()
+
+import httpx  # noqa: E402
+from main import app  # noqa: E402
+import routers.chat as chat_module  # noqa: E402
+from utils.concurrency import install_default_executor, run_blocking  # noqa: E402
+
+
+class _BlockingTool:
+    """requests.get / collection.query 처럼 블로킹되는 도구 흉내"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def __call__(self) -> str:
+        time.sleep(self.latency)
+        return "ok"
+
+
+class FakeAsyncExecutor:
+    """ainvoke 경로: 블로킹 도구를 스레드 풀로 넘김"""
+
+    def __init__(self, latency: float):
+        self.tool = _BlockingTool(latency)
+
+    async def ainvoke(self, inputs: dict, config: dict = None) -> dict:
+        await run_blocking(self.tool)
+        return {"output": f"응답: {inputs['input']}", "intermediate_steps": []}
+
+
+class FakeBlockingExecutor(FakeAsyncExecutor):
+    """기존 방식 재현: async 핸들러 안에서 블로킹 호출"""
+
+    async def ainvoke(self, inputs: dict, config: dict = None) -> dict:
+        self.tool()
+        return {"output": f"응답: {inputs['input']}", "intermediate_steps": []}
+
+
+async def _fire(client: httpx.AsyncClient, n: int) -> float:
+    start = time.perf_counter()
+    responses = await asyncio.gather(*[
+        client.post("/api/chat", json={"message": f"서울 실내 놀이터 {i}", "conversation_id": f"load-{i}"})
+        for i in range(n)
+    ])
+    elapsed = time.perf_counter() - start
+    failed = [r for r in responses if r.status_code != 200]
+    if failed:
+        raise SystemExit(f"❌ 실패 응답 {len(failed)}개: {failed[0].text}")
+    return elapsed
+
+
+async def main(n_requests: int, latency: float):
+    install_default_executor()
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        results = {}
+        for label, executor in [
+            ("blocking (sync in async)", FakeBlockingExecutor(latency)),
+            ("async + thread pool", FakeAsyncExecutor(latency)),
+        ]:
+            chat_module.agent_executor = executor
+            results[label] = await _fire(client, n_requests)
+
+    serial = n_requests * latency
+    print("=" * 70)
+    print(f"동시 요청 {n_requests}개, 요청당 블로킹 {latency * 1000:.0f}ms (직렬 기준 {serial:.2f}s)")
+    print("=" * 70)
+    for label, elapsed in results.items():
+        print(f"{label:<28} {elapsed:6.2f}s  {n_requests / elapsed:7.1f} req/s  (x{serial / elapsed:.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.latency))
@@ -0,0 +1,88 @@
+"""
+요청 단위 conversation_id 격리 스트레스 테스트
+
+동시에 많은 /api/chat 요청을 보내고, 도구(스레드 풀에서 실행)가 읽는
+get_current_conversation_id()가 항상 자기 요청의 ID인지 확인합니다.
+
+실행: python -m benchmarks.bench_context_isolation [--requests 500]
+"""
+
+import argparse
+import asyncio
+import contextvars
+import functools
+import random
+import time
+
+from benchmarks.common import setup_env
+
+setup_env()
+
+import httpx  # noqa: E402
+from main import app  # noqa: E402
+import routers.chat as chat_module  # noqa: E402
+from utils.concurrency import install_default_executor, run_blocking  # noqa: E402
+from utils.conversation_memory import get_current_conversation_id  # noqa: E402
+
+
+def _tool_reads_context() -> str:
+    """show_map_for_facilities 처럼 도구 안에서 conversation_id를 읽음"""
+    time.sleep(random.uniform(0, 0.01))
+    return get_current_conversation_id() or ""
+
+
+class ContextEchoExecutor:
+    """도구 두 번 호출 사이에 다른 요청이 끼어들도록 섞어서 실행"""
+
+    async def ainvoke(self, inputs: dict, config: dict = None) -> dict:
+        await asyncio.sleep(random.uniform(0, 0.01))
+        # LangChain이 sync 도구를 실행하는 경로 (기본 executor + 컨텍스트 복사)
+        loop = asyncio.get_running_loop()
+        first = await loop.run_in_executor(
+            None, functools.partial(contextvars.copy_context().run, _tool_reads_context)
+        )
+        await asyncio.sleep(random.uniform(0, 0.01))
+        second = await run_blocking(_tool_reads_context)
+        return {"output": f"{first}|{second}", "intermediate_steps": []}
+
+
+async def main(n_requests: int):
+    install_default_executor()
+    chat_module.agent_executor = ContextEchoExecutor()
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.post("/api/chat", json={"message": "지도 보여줘", "conversation_id": f"conv-{i}"})
+            for i in range(n_requests)
+        ])
+        elapsed = time.perf_counter() - start
+
+    # 실패한 요청은 혼선과 따로 셈 (응답 본문이 없으면 격리 여부를 알 수 없음)
+    failed = []
+    crosstalk = 0
+    for i, response in enumerate(responses):
+        if response.status_code != 200:
+            failed.append(response)
+            continue
+        expected = f"conv-{i}"
+        if response.json()["content"] != f"{expected}|{expected}":
+            crosstalk += 1
+
+    print("=" * 70)
+    print(f"동시 요청 {n_requests}개 완료: {elapsed:.2f}s")
+    print(f"실패 응답: {len(failed)}건")
+    print(f"conversation_id 혼선: {crosstalk}건")
+    print("=" * 70)
+    if failed:
+        print(f"❌ 첫 실패 응답 ({failed[0].status_code}): {failed[0].text}")
+    if failed or crosstalk:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
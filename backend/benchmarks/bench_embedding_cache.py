@@ -0,0 +1,110 @@
+"""
+쿼리 임베딩 캐시 벤치마크
+
+반복/유사 쿼리가 섞인 쿼리 로그를 재생하며 캐시 없음 / 메모리 / 메모리+디스크
+세 가지 설정의 지연 시간과 hit rate를 비교합니다. 원격 임베딩 호출은
+지연 시간이 주입된 가짜 모델로 대체합니다.
+
+실행: python -m benchmarks.bench_embedding_cache [--queries 500] [--latency 0.15]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from benchmarks.common import setup_env, print_summary
+
+setup_env()
+
+from models.embedding_cache import QueryEmbeddingCache  # noqa: E402
+from models.pca_embeddings import pca_embeddings  # noqa: E402
+
+BASE_QUERIES = [
+    "서울 실내 놀이터", "부산 자전거 타기 좋은 곳", "창원 아이와 갈만한 공원",
+    "수도권 배드민턴 프로그램", "제주 아이랑 갈만한 곳", "대전 과학관",
+    "인천 키즈카페", "수원 주말 체험 프로그램", "경기 실외 캠핑장", "광주 어린이 도서관",
+]
+
+
+class FakeRemoteEmbeddings:
+    """text-embedding-3-large 호출 흉내 (고정 지연 + 결정적 벡터)"""
+
+    def __init__(self, latency: float, dimensions: int):
+        self.latency = latency
+        self.dimensions = dimensions
+        self.calls = 0
+
+    def embed_query(self, text: str):
+        self.calls += 1
+        time.sleep(self.latency)
+        rng = random.Random(text)
+        return [rng.uniform(-1, 1) for _ in range(self.dimensions)]
+
+
+def build_query_log(n: int, seed: int = 7) -> list:
+    """Zipf 비슷한 분포 + 공백/문장부호 변형"""
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(len(BASE_QUERIES))]
+    log = []
+    for i in range(n):
+        if rng.random() < 0.15:
+            log.append(f"새로운 질문 {i}")  # 처음 보는 쿼리
+            continue
+        query = rng.choices(BASE_QUERIES, weights=weights)[0]
+        variant = rng.choice([query, f" {query} ", f"{query}?", query.replace(" ", "  ")])
+        log.append(variant)
+    return log
+
+
+def replay(log: list, cache) -> list:
+    pca_embeddings.query_cache = cache
+    samples = []
+    for query in log:
+        start = time.perf_counter()
+        pca_embeddings.embed_query(query)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main(n_queries: int, latency: float):
+    fake = FakeRemoteEmbeddings(latency, pca_embeddings.DIMENSIONS)
+    pca_embeddings.embeddings = fake
+    log = build_query_log(n_queries)
+
+    def new_cache(disk_dir=None):
+        return QueryEmbeddingCache(
+            model=pca_embeddings.MODEL,
+            dimensions=pca_embeddings.DIMENSIONS,
+            max_entries=256,
+            disk_dir=disk_dir,
+        )
+
+    print("=" * 70)
+    print(f"쿼리 로그 {n_queries}개, 원격 임베딩 지연 {latency * 1000:.0f}ms")
+    print("=" * 70)
+
+    fake.calls = 0
+    print_summary("no cache", replay(log, None))
+    print(f"  원격 호출: {fake.calls}")
+
+    fake.calls = 0
+    memory_cache = new_cache()
+    print_summary("memory LRU", replay(log, memory_cache))
+    print(f"  원격 호출: {fake.calls}, stats: {memory_cache.stats()}")
+
+    with tempfile.TemporaryDirectory() as disk_dir:
+        # 디스크 캐시를 채운 뒤, 새 프로세스처럼 빈 메모리 캐시로 재생
+        replay(log, new_cache(disk_dir))
+        fake.calls = 0
+        warm_disk_cache = new_cache(disk_dir)
+        print_summary("disk tier (cold memory)", replay(log, warm_disk_cache))
+        print(f"  원격 호출: {fake.calls}, stats: {warm_disk_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.15)
+    args = parser.parse_args()
+    main(args.queries, args.latency)
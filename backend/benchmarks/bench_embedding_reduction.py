@@ -0,0 +1,97 @@
+"""
+차원 축소 / 양자화별 recall@k · 인덱스 크기 · 검색 지연 시간
+
+원본 차원(3072) 로컬 인덱스의 정확한 검색 결과를 정답으로 두고,
+truncate(Matryoshka)/PCA 차원 축소와 none/int8/binary 양자화 조합을 비교합니다.
+쿼리는 저장된 문서 벡터에 노이즈를 섞어 만듭니다 (임베딩 API 호출 없음).
+PCA는 쿼리와 겹치지 않는 문서로 학습합니다.
+
+사전 준비: EMBEDDING_REDUCTION=none 상태의 컬렉션으로 python export_local_index.py
+실행: python -m benchmarks.bench_embedding_reduction [--dims 1536,1024,512,256,128] [--k 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import setup_env, summarize
+
+setup_env()
+
+from config import settings  # noqa: E402
+from models.embedding_projection import EmbeddingProjection  # noqa: E402
+from retrieval.local_index import LocalVectorIndex  # noqa: E402
+
+QUANTIZATIONS = ("none", "int8", "binary")
+
+
+def evaluate(index: LocalVectorIndex, queries: np.ndarray, truth: list, k: int) -> dict:
+    samples, recalls = [], []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        rows = {row for row, _ in index.search(query, k)}
+        samples.append(time.perf_counter() - start)
+        recalls.append(len(rows & expected) / k)
+    return {"recall": float(np.mean(recalls)), **summarize(samples)}
+
+
+def print_row(method: str, dims: int, quantization: str, index: LocalVectorIndex, result: dict):
+    print(
+        f"{method:<9} {dims:>5} {quantization:<7} "
+        f"{index.nbytes / len(index):>8.0f}B {index.nbytes / 1024 / 1024:>8.1f}MB "
+        f"recall={result['recall']:.3f} p50={result['p50_ms']:7.2f}ms p95={result['p95_ms']:7.2f}ms"
+    )
+
+
+def main(dims_list, n_queries: int, k: int, noise: float, fit_sample: int):
+    source = LocalVectorIndex.load(settings.LOCAL_INDEX_PATH, ann="exact")
+    if source.quantization != "none":
+        raise SystemExit("원본 float32 인덱스가 필요합니다 (export_local_index.py --quantization none)")
+
+    vectors = np.asarray(source.vectors, dtype=np.float32)
+    rng = np.random.default_rng(0)
+    query_rows = rng.choice(len(source), size=min(n_queries, len(source)), replace=False)
+    queries = LocalVectorIndex.normalize(
+        vectors[query_rows] + rng.normal(0, noise, (len(query_rows), vectors.shape[1])).astype(np.float32)
+    )
+    truth = [{row for row, _ in source.search(q, k)} for q in queries]
+
+    fit_rows = np.setdiff1d(np.arange(len(source)), query_rows)
+    if fit_sample and len(fit_rows) > fit_sample:
+        fit_rows = rng.choice(fit_rows, size=fit_sample, replace=False)
+
+    print("=" * 90)
+    print(f"문서 {len(source)}개, 원본 {source.dimensions}차원, 쿼리 {len(queries)}개, k={k}, noise={noise}")
+    print("=" * 90)
+    print(f"{'method':<9} {'dims':>5} {'quant':<7} {'bytes/vec':>9} {'index':>10}")
+
+    def run(method: str, dims: int, projected_docs: np.ndarray, projected_queries: np.ndarray):
+        for quantization in QUANTIZATIONS:
+            index = LocalVectorIndex.from_embeddings(
+                source.ids, projected_docs, source.documents, source.metadatas, quantization=quantization
+            )
+            print_row(method, dims, quantization, index, evaluate(index, projected_queries, truth, k))
+
+    run("full", source.dimensions, vectors, queries)
+
+    for dims in dims_list:
+        if dims >= source.dimensions:
+            continue
+        truncate = EmbeddingProjection("truncate", source.dimensions, dims)
+        run("truncate", dims, truncate.apply(vectors), truncate.apply(queries))
+
+        pca = EmbeddingProjection.fit_pca(vectors[fit_rows], dims)
+        run("pca", dims, pca.apply(vectors), pca.apply(queries))
+        print(f"{'':<9} {'':>5} (PCA 설명 분산 {pca.explained_variance:.3f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dims", default="1536,1024,512,256,128")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--noise", type=float, default=0.02)
+    parser.add_argument("--fit-sample", type=int, default=20000)
+    args = parser.parse_args()
+    main([int(d) for d in args.dims.split(",")], args.queries, args.k, args.noise, args.fit_sample)
@@ -0,0 +1,97 @@
+"""
+검색 결과 → 응답 dict 변환 비용: 요청마다 메타데이터 파싱 vs 시설 테이블 조인
+
+로컬 인덱스의 문서/메타데이터로 FacilityTable을 만들고,
+무작위 top-k ID 묶음에 대해 두 방식의 변환 시간을 비교합니다.
+
+사전 준비: python export_local_index.py
+실행: python -m benchmarks.bench_facility_table [--queries 2000] [--k 15]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.common import setup_env, print_summary
+
+setup_env()
+
+from config import settings  # noqa: E402
+from retrieval.facility_table import FacilityTable  # noqa: E402
+from retrieval.geo_index import GeoIndex  # noqa: E402
+from retrieval.local_index import LocalVectorIndex  # noqa: E402
+
+
+def parse_per_request(documents, metadatas, distances):
+    """테이블 도입 전 search_facilities의 변환 코드"""
+    facilities = []
+    for i, metadata in enumerate(metadatas):
+        lat = metadata.get("LAT", "37.5665")
+        lon = metadata.get("LON", "126.9780")
+        try:
+            lat = float(lat)
+            lon = float(lon)
+        except (ValueError, TypeError):
+            lat, lon = 37.5665, 126.9780
+        address = metadata.get("Address", "")
+        category1 = metadata.get("Category1", "")
+        category3 = metadata.get("Category3", "")
+        desc = ""
+        if i < len(documents) and documents[i]:
+            desc = documents[i][:100]
+        elif address:
+            desc = address[:100]
+        elif category3:
+            desc = f"{category1} - {category3}"
+        facilities.append({
+            "name": metadata.get("Name", metadata.get("name", "이름없음")),
+            "lat": lat,
+            "lng": lon,
+            "note": metadata.get("Note", ""),
+            "category": category3 or category1 or "시설",
+            "desc": desc,
+            "distance": distances[i]
+        })
+    return facilities
+
+
+def main(n_queries: int, k: int):
+    source = LocalVectorIndex.load(settings.LOCAL_INDEX_PATH, ann="exact")
+
+    start = time.perf_counter()
+    table = FacilityTable(source.ids, source.documents, source.metadatas, geo=GeoIndex(source.metadatas))
+    print("=" * 70)
+    print(f"시설 {len(table)}개, 테이블 생성 {time.perf_counter() - start:.2f}s")
+    print("=" * 70)
+
+    rng = random.Random(0)
+    batches = [rng.sample(range(len(source)), min(k, len(source))) for _ in range(n_queries)]
+
+    old, new = [], []
+    for rows in batches:
+        distances = [0.5] * len(rows)
+
+        t = time.perf_counter()
+        parse_per_request(
+            [source.documents[row] for row in rows],
+            [source.metadatas[row] for row in rows],
+            distances
+        )
+        old.append(time.perf_counter() - t)
+
+        ids = [source.ids[row] for row in rows]
+        t = time.perf_counter()
+        records = table.lookup(ids)
+        [record.to_payload(distance) for record, distance in zip(records[:3], distances)]
+        new.append(time.perf_counter() - t)
+
+    print_summary(f"per-request parse (k={k})", old)
+    print_summary("table join (top 3 payload)", new)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=15)
+    args = parser.parse_args()
+    main(args.queries, args.k)
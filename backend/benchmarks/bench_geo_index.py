@@ -0,0 +1,76 @@
+"""
+좌표 격자 인덱스 생성 시간 / 반경·근접 검색 지연 시간
+
+로컬 인덱스의 메타데이터(LAT/LON)로 GeoIndex를 만들고
+무작위 시설 위치 주변의 반경 검색, nearest-N, 지역 중심 계산을 측정합니다.
+전체 행 haversine 스캔과 결과를 비교해 정확성도 확인합니다.
+
+사전 준비: python export_local_index.py
+실행: python -m benchmarks.bench_geo_index [--queries 500] [--radius 10] [--n 10]
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from benchmarks.common import setup_env, print_summary
+
+setup_env()
+
+from config import settings  # noqa: E402
+from retrieval.geo_index import GeoIndex  # noqa: E402
+from retrieval.local_index import LocalVectorIndex  # noqa: E402
+
+
+def main(n_queries: int, radius_km: float, n: int):
+    source = LocalVectorIndex.load(settings.LOCAL_INDEX_PATH, ann="exact")
+
+    start = time.perf_counter()
+    geo = GeoIndex(source.metadatas, cell_degrees=settings.GEO_CELL_DEGREES)
+    print("=" * 70)
+    print(f"시설 {geo.size}개 (좌표 {geo.located}개), 셀 {len(geo.cells)}개, 생성 {time.perf_counter() - start:.2f}s")
+    print("=" * 70)
+
+    located = np.flatnonzero(~np.isnan(geo.lats))
+    rng = random.Random(0)
+    points = [geo.coordinates(int(row)) for row in rng.sample(list(located), min(n_queries, len(located)))]
+    all_rows = located
+
+    within, nearest, scan, mismatches = [], [], [], 0
+    for lat, lng in points:
+        t = time.perf_counter()
+        rows, _ = geo.within(lat, lng, radius_km)
+        within.append(time.perf_counter() - t)
+
+        t = time.perf_counter()
+        geo.nearest(lat, lng, n)
+        nearest.append(time.perf_counter() - t)
+
+        t = time.perf_counter()
+        expected = all_rows[geo.distances_km(lat, lng, all_rows) <= radius_km]
+        scan.append(time.perf_counter() - t)
+        mismatches += set(rows.tolist()) != set(expected.tolist())
+
+    print_summary(f"grid within {radius_km:g}km", within)
+    print_summary(f"grid nearest {n}", nearest)
+    print_summary("full haversine scan", scan)
+    print(f"  반경 검색 불일치: {mismatches}/{len(points)}")
+
+    sido_values = sorted({key[1] for key in geo.region_rows if key[0] == "CTPRVN_NM"})
+    samples = []
+    for value in sido_values:
+        t = time.perf_counter()
+        geo.centroid([value])
+        samples.append(time.perf_counter() - t)
+    print_summary("sido centroid", samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--radius", type=float, default=10.0)
+    parser.add_argument("--n", type=int, default=10)
+    args = parser.parse_args()
+    main(args.queries, args.radius, args.n)
@@ -0,0 +1,106 @@
+"""
+규칙 기반 의도 추출 정확도 / 지연 시간
+
+라벨이 달린 샘플 메시지로 규칙 기반 추출기를 평가합니다.
+- coverage: LLM 없이 규칙으로 답한 비율
+- accuracy: 규칙으로 답한 것 중 location/date/weather_condition이 모두 맞은 비율
+- escalated_expected: LLM으로 넘겨야 하는 메시지(label=None)를 제대로 넘긴 비율
+
+실행: python -m benchmarks.bench_intent_parser [--repeat 200]
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from benchmarks.common import setup_env, print_summary
+
+setup_env()
+
+from utils.intent_parser import parse_intent  # noqa: E402
+
+# 기준일: 2026-10-14 (수요일)
+TODAY = datetime(2026, 10, 14, 10, 0)
+
+# (메시지, 기대값) - 기대값 None이면 LLM으로 넘겨야 하는 메시지
+LABELED = [
+    ("서울 실내 놀이터 추천해줘", ("서울", "today", None)),
+    ("부산 아이랑 갈만한 곳", ("부산", "today", None)),
+    ("부산 자전거 타기 좋은 곳", ("부산", "today", None)),
+    ("창원 아이와 갈만한 공원", ("창원", "today", None)),
+    ("수도권 배드민턴 프로그램", ("수도권", "today", None)),
+    ("내일 수원에서 아이랑 놀 곳", ("수원", "tomorrow", None)),
+    ("이번 주말 제주 체험 프로그램", ("제주", "this_weekend", None)),
+    ("주말에 비 온다는데 대전 실내 놀거리", ("대전", "this_weekend", "비")),
+    ("토요일에 강릉 바다 가도 될까", ("강릉", "2026-10-17", None)),
+    ("다음 주 일요일 인천 키즈카페", ("인천", "2026-10-25", None)),
+    ("오늘 맑은데 서울 공원 추천", ("서울", "today", "맑음")),
+    ("강남구 키즈카페 알려줘", ("강남구", "today", None)),
+    ("부산 해운대 아이랑 갈만한 곳", ("해운대구", "today", None)),
+    ("분당 실내 놀이터", ("성남", "today", None)),
+    ("가평 캠핑장 추천", ("가평", "today", None)),
+    ("순천 정원 박람회 가볼까", ("순천", "today", None)),
+    ("내일 눈 온대 춘천 실내 놀거리", ("춘천", "tomorrow", "눈")),
+    ("대구 달서구 과학관", ("달서구", "today", None)),
+    ("흐린 날 울산 갈만한 곳", ("울산", "today", "흐림")),
+    ("모레 경주 역사 체험", ("경주", "2026-10-16", None)),
+    ("아이랑 갈만한 곳 추천해줘", (None, "today", None)),
+    ("날씨 확인해서 서울 놀거리 알려줘", ("서울", "today", None)),
+    ("세종 어린이 도서관", ("세종", "today", None)),
+    ("전주 한옥마을 근처 체험", ("전주", "today", None)),
+    ("다음 주말 여수 여행", ("여수", "2026-10-24", None)),
+    # LLM으로 넘겨야 하는 메시지
+    ("고양이 카페 추천해줘", None),
+    ("서울이랑 부산 중에 어디가 좋을까", None),
+    ("중구 박물관 알려줘", None),
+    ("잠실역 근처 키즈카페", None),
+    ("12월 25일에 서울 갈만한 곳", None),
+    ("오늘이나 내일 인천 가볼만한 곳", None),
+    ("공주 드레스 체험", None),
+]
+
+
+def main(repeat: int):
+    answered = correct = escalated_ok = expected_escalations = 0
+    wrong = []
+
+    for message, expected in LABELED:
+        parsed = parse_intent(message, today=TODAY)
+        if expected is None:
+            expected_escalations += 1
+            escalated_ok += not parsed.confident
+            continue
+        if not parsed.confident:
+            wrong.append((message, "escalated", parsed.reasons))
+            continue
+        answered += 1
+        got = (parsed.result["location"], parsed.result["date"], parsed.result["weather_condition"])
+        if got == expected:
+            correct += 1
+        else:
+            wrong.append((message, got, expected))
+
+    samples = []
+    for _ in range(repeat):
+        for message, _ in LABELED:
+            start = time.perf_counter()
+            parse_intent(message, today=TODAY)
+            samples.append(time.perf_counter() - start)
+
+    n_rule_labels = len(LABELED) - expected_escalations
+    print("=" * 70)
+    print(f"라벨 샘플 {len(LABELED)}개 (규칙 대상 {n_rule_labels}, LLM 대상 {expected_escalations})")
+    print("=" * 70)
+    print(f"coverage (규칙 응답):      {answered}/{n_rule_labels} ({answered / n_rule_labels:.0%})")
+    print(f"accuracy (규칙 응답 중):   {correct}/{answered} ({correct / max(answered, 1):.0%})")
+    print(f"애매한 메시지 LLM 전달:    {escalated_ok}/{expected_escalations}")
+    print_summary("parse_intent latency", samples)
+    for item in wrong:
+        print(f"  ✗ {item}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.repeat)
@@ -0,0 +1,75 @@
+"""
+BM25 역색인 색인 시간 / 검색 지연 시간 / 시설명 recall
+
+로컬 인덱스의 문서(build_doc 결과)로 LexicalIndex를 만들고
+- test_rag.py의 예시 쿼리 지연 시간과 상위 결과
+- 시설명 + 시군구로 만든 쿼리에서 해당 시설이 top-k에 드는 비율
+을 측정합니다 (임베딩 API 호출 없음).
+
+사전 준비: python export_local_index.py
+실행: python -m benchmarks.bench_lexical_index [--queries 500] [--k 3]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.common import setup_env, print_summary
+
+setup_env()
+
+from config import settings  # noqa: E402
+from retrieval.lexical_index import LexicalIndex  # noqa: E402
+from retrieval.local_index import LocalVectorIndex  # noqa: E402
+
+EXAMPLE_QUERIES = [
+    "부산 자전거 타기 좋은 곳",
+    "서울 실내 놀이터",
+    "창원 아이와 갈만한 공원",
+    "수도권 배드민턴 프로그램",
+]
+
+
+def main(n_queries: int, k: int):
+    source = LocalVectorIndex.load(settings.LOCAL_INDEX_PATH, ann="exact")
+
+    start = time.perf_counter()
+    index = LexicalIndex(source.documents)
+    print("=" * 70)
+    print(f"문서 {len(source)}개, 색인어 {len(index.postings)}개, 색인 {time.perf_counter() - start:.2f}s")
+    print("=" * 70)
+
+    for query in EXAMPLE_QUERIES:
+        hits = index.search(query, k)
+        names = [source.metadatas[row].get("Name", "?") for row, _ in hits]
+        print(f"🔍 {query} → {', '.join(names) or '(없음)'}")
+
+    samples = []
+    for _ in range(20):
+        for query in EXAMPLE_QUERIES:
+            t = time.perf_counter()
+            index.search(query, k)
+            samples.append(time.perf_counter() - t)
+    print()
+    print_summary("example queries", samples)
+
+    rng = random.Random(0)
+    rows = rng.sample(range(len(source)), min(n_queries, len(source)))
+    samples, found = [], 0
+    for row in rows:
+        meta = source.metadatas[row]
+        query = f"{meta.get('SIGNGU_NM', '')} {meta.get('Name', '')}".strip()
+        t = time.perf_counter()
+        hits = index.search(query, k)
+        samples.append(time.perf_counter() - t)
+        found += any(hit_row == row for hit_row, _ in hits)
+    print_summary("name queries", samples)
+    print(f"  name recall@{k}: {found / max(1, len(rows)):.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+    main(args.queries, args.k)
@@ -0,0 +1,283 @@
+"""
+오프라인 종단 벤치마크 (OpenAI / OpenWeatherMap / Chroma를 로컬 가짜로 교체)
+
+API 키, 네트워크, Chroma 컨테이너 없이 결정적으로 실행되며
+외부 호출마다 지정한 지연 시간(± jitter)을 주입합니다 (benchmarks/fakes.py).
+
+1) 도구별 지연 시간: search_facilities / get_weather_forecast / extract_user_intent / show_map_for_facilities
+2) /api/chat 동시성별 p50/p95/p99 + 처리량
+3) 대화 수천 개를 흘렸을 때 메모리 증가 (tracemalloc, 최대 RSS, 대화 저장소 크기)
+4) --burst N: 요청 N개를 한 번에 보냈을 때 입장 제어 결과 (상태 코드별 수, 대기 시간)
+마지막에 trace span 종류/이름별 평균 시간을 출력합니다.
+
+실행: python -m benchmarks.bench_offline [--requests 200] [--concurrency 1,8,32]
+      [--conversations 2000] [--llm-ms 800] [--embedding-ms 150] [--vector-ms 30] [--weather-ms 200]
+      [--no-router] [--no-response-cache] [--burst 0]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import time
+import tracemalloc
+
+from benchmarks.common import setup_env, print_summary
+
+setup_env()
+
+# 1~3턴 대화: 지역 추천 → (지도) → (추가 질문)
+FIRST_TURNS = [
+    "서울 실내 놀이터 추천해줘",
+    "부산 아이랑 갈만한 곳",
+    "내일 인천 키즈카페 알려줘",
+    "대전 비 오는 날 실내 체험",
+    "이번 주말 제주 가볼만한 곳 추천",
+    "수원 아이랑 놀 곳 찾아줘",
+    "강남구 어린이 박물관 알려줘",
+    "춘천 자전거 공원 추천",
+    "아이랑 주말에 갈만한 곳 있을까?",
+    "5살 아이가 좋아할 만한 체험 추천해줘",
+]
+FOLLOW_UPS = [
+    "지도 보여줘",
+    "두 번째 장소 지도로 보여줘",
+    "그 중에 실내만 다시 알려줘",
+]
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200, help="동시성 단계별 /api/chat 요청 수")
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--tool-calls", type=int, default=100, help="도구별 호출 수")
+    parser.add_argument("--conversations", type=int, default=2000, help="메모리 측정용 대화 수")
+    parser.add_argument("--facilities", type=int, default=2000)
+    parser.add_argument("--llm-ms", type=float, default=800)
+    parser.add_argument("--embedding-ms", type=float, default=150)
+    parser.add_argument("--vector-ms", type=float, default=30)
+    parser.add_argument("--weather-ms", type=float, default=200)
+    parser.add_argument("--weather-error-rate", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--no-router", action="store_true")
+    parser.add_argument("--no-response-cache", action="store_true")
+    parser.add_argument("--burst", type=int, default=0, help="한 번에 보낼 요청 수 (0이면 생략)")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def _conversation(rng: random.Random):
+    turns = [rng.choice(FIRST_TURNS)]
+    for _ in range(rng.choice([0, 1, 2])):
+        turns.append(rng.choice(FOLLOW_UPS))
+    return turns
+
+
+def bench_tools(n_calls: int):
+    from retrieval.backends import get_facility_table
+    from tools import extract_user_intent, get_weather_forecast, search_facilities, show_map_for_facilities
+    from utils.conversation_memory import save_search_results, set_current_conversation_id, reset_current_conversation_id
+
+    rng = random.Random(1)
+    get_facility_table()  # BM25 / 좌표 / 시설 테이블은 첫 검색 전에 생성 (측정에서 제외)
+    cases = {
+        "search_facilities": lambda: search_facilities.invoke({
+            "original_query": rng.choice(FIRST_TURNS), "region": rng.choice(["서울", "부산", "수원", None])
+        }),
+        "get_weather_forecast": lambda: get_weather_forecast.invoke({
+            "city_name": rng.choice(["서울", "부산", "제주", "춘천"]), "date": rng.choice(["today", "tomorrow"])
+        }),
+        "extract_user_intent": lambda: extract_user_intent.invoke({"user_message": rng.choice(FIRST_TURNS)}),
+        "show_map_for_facilities": lambda: show_map_for_facilities.invoke({"facility_indices": rng.choice(["0", "1,2", "0,1,2"])}),
+    }
+
+    token = set_current_conversation_id("bench-tools")
+    try:
+        facilities = json.loads(search_facilities.invoke({"original_query": "서울 실내 놀이터"}))["facilities"]
+        save_search_results("bench-tools", facilities)
+        print("-" * 70)
+        print(f"도구별 지연 시간 (각 {n_calls}회, 순차)")
+        for name, call in cases.items():
+            samples = []
+            for _ in range(n_calls):
+                start = time.perf_counter()
+                call()
+                samples.append(time.perf_counter() - start)
+            print_summary(name, samples)
+    finally:
+        reset_current_conversation_id(token)
+
+
+async def _run_conversations(client, conversations, concurrency: int):
+    """대화 단위로 동시 실행 (같은 대화의 턴은 순서대로), 턴별 지연 시간 반환"""
+    semaphore = asyncio.Semaphore(concurrency)
+    samples, failures = [], []
+
+    async def run(conversation_id: str, turns):
+        async with semaphore:
+            for message in turns:
+                start = time.perf_counter()
+                response = await client.post("/api/chat", json={"message": message, "conversation_id": conversation_id})
+                samples.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    failures.append(response.text[:200])
+
+    await asyncio.gather(*[run(conversation_id, turns) for conversation_id, turns in conversations])
+    return samples, failures
+
+
+async def bench_chat(client, n_requests: int, levels, seed: int):
+    print("-" * 70)
+    print(f"/api/chat 동시성별 지연 시간 / 처리량 (단계별 약 {n_requests}턴)")
+    for level in levels:
+        rng = random.Random(seed + level)
+        conversations, total = [], 0
+        while total < n_requests:
+            turns = _conversation(rng)
+            conversations.append((f"load-{level}-{len(conversations)}", turns))
+            total += len(turns)
+
+        start = time.perf_counter()
+        samples, failures = await _run_conversations(client, conversations, level)
+        elapsed = time.perf_counter() - start
+        print_summary(f"concurrency={level}", samples)
+        print(f"  처리량 {len(samples) / elapsed:7.1f} turns/s, 실패 {len(failures)}개")
+        if failures:
+            print(f"  ✗ {failures[0]}")
+
+
+async def bench_memory(client, n_conversations: int, seed: int):
+    from utils.conversation_memory import get_conversation_store_stats
+
+    print("-" * 70)
+    print(f"메모리 증가 (대화 {n_conversations}개, 동시성 32)")
+    rng = random.Random(seed)
+    checkpoints = 5
+    per_checkpoint = max(1, n_conversations // checkpoints)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    done = 0
+    previous = baseline
+    for _ in range(checkpoints):
+        conversations = [(f"mem-{done + i}", _conversation(rng)) for i in range(per_checkpoint)]
+        await _run_conversations(client, conversations, 32)
+        done += per_checkpoint
+        current = tracemalloc.get_traced_memory()[0]
+        rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(
+            f"  대화 {done:>6}: 할당 {(current - baseline) / 2**20:8.2f}MB "
+            f"(구간 {(current - previous) / per_checkpoint / 1024:6.2f}KB/대화), 최대 RSS {rss_mb:8.1f}MB"
+        )
+        previous = current
+    tracemalloc.stop()
+    stats = get_conversation_store_stats()
+    print(f"  대화 저장소: {stats}")
+
+
+async def bench_burst(client, n_requests: int, seed: int):
+    """요청 N개 동시 전송 (일부는 같은 대화에 연속 메시지) → 상태 코드 / 입장 대기 시간"""
+    from routers.chat import admission
+
+    print("-" * 70)
+    print(f"동시 요청 {n_requests}개 (10%는 같은 대화에 두 번째 메시지)")
+    rng = random.Random(seed)
+    conversation_ids = [f"burst-{i}" for i in range(n_requests)]
+    conversation_ids = [
+        rng.choice(conversation_ids[:i]) if i and rng.random() < 0.1 else conversation_id
+        for i, conversation_id in enumerate(conversation_ids)
+    ]
+    samples, statuses, retry_after = [], {}, []
+
+    async def send(conversation_id: str):
+        start = time.perf_counter()
+        response = await client.post(
+            "/api/chat", json={"message": rng.choice(FIRST_TURNS), "conversation_id": conversation_id}
+        )
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if response.status_code == 200:
+            samples.append(time.perf_counter() - start)
+        elif "retry-after" in response.headers:
+            retry_after.append(int(response.headers["retry-after"]))
+
+    await asyncio.gather(*[send(conversation_id) for conversation_id in conversation_ids])
+    print_summary("admitted", samples)
+    print(f"  상태 코드: {dict(sorted(statuses.items()))}")
+    if retry_after:
+        print(f"  Retry-After: {min(retry_after)}~{max(retry_after)}s")
+    if admission is not None:
+        stats = admission.stats()
+        print(
+            f"  입장 대기 평균 {stats['queue_wait_avg'] * 1000:.1f}ms / 최대 {stats['queue_wait_max'] * 1000:.1f}ms, "
+            f"거절: 대기열 {stats['rejected_queue_full']}, 시간 초과 {stats['rejected_queue_timeout']}, "
+            f"같은 대화 {stats['rejected_conversation_busy']}"
+        )
+
+
+def print_span_breakdown():
+    from utils.tracing import span_metrics
+
+    print("-" * 70)
+    print("trace span 평균 시간 (전체 실행 누적)")
+    rows = sorted(span_metrics.spans.items(), key=lambda item: -item[1].total)
+    for (kind, name), histogram in rows:
+        mean_ms = histogram.total / histogram.count * 1000 if histogram.count else 0.0
+        print(f"  {kind:<10} {name:<32} n={histogram.count:<6} mean={mean_ms:8.2f}ms errors={histogram.errors}")
+    cache = ", ".join(f"{cache} {result}={count}" for (cache, result), count in sorted(span_metrics.cache.items()))
+    print(f"  캐시: {cache}")
+
+
+async def main(args):
+    from benchmarks.fakes import install_fakes
+    fakes = install_fakes(
+        n_facilities=args.facilities,
+        llm_latency=args.llm_ms / 1000,
+        embedding_latency=args.embedding_ms / 1000,
+        vector_latency=args.vector_ms / 1000,
+        weather_latency=args.weather_ms / 1000,
+        weather_error_rate=args.weather_error_rate,
+        jitter=args.jitter,
+    )
+
+    import httpx
+    from main import app
+    from utils.concurrency import install_default_executor
+
+    install_default_executor()
+    levels = [int(level) for level in args.concurrency.split(",") if level]
+
+    print("=" * 70)
+    print(
+        f"가짜 의존성: LLM {args.llm_ms:.0f}ms, 임베딩 {args.embedding_ms:.0f}ms, 벡터 {args.vector_ms:.0f}ms, "
+        f"날씨 {args.weather_ms:.0f}ms (±{args.jitter:.0%}), 시설 {args.facilities}개"
+    )
+    print(f"규칙 라우터 {'off' if args.no_router else 'on'}, 응답 캐시 {'off' if args.no_response_cache else 'on'}")
+    print("=" * 70)
+
+    bench_tools(args.tool_calls)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await bench_chat(client, args.requests, levels, args.seed)
+        if args.conversations:
+            await bench_memory(client, args.conversations, args.seed)
+        if args.burst:
+            await bench_burst(client, args.burst, args.seed)
+
+    from models.chat_models import get_llm_metrics
+    print_span_breakdown()
+    llm_calls = get_llm_metrics().get("default", {}).get("calls", 0)
+    print(f"가짜 호출 수: 임베딩 {fakes['embeddings'].calls}, 날씨 {fakes['weather'].calls}, LLM {llm_calls}")
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    # settings는 import 시점에 환경변수를 읽으므로 app import 전에 설정
+    os.environ["USE_GPU"] = "false"
+    if args.no_router:
+        os.environ["ROUTER_ENABLED"] = "false"
+    if args.no_response_cache:
+        os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+    asyncio.run(main(args))
@@ -0,0 +1,77 @@
+"""
+첫 턴 응답 캐시 hit rate / 조회 지연 시간
+
+자주 반복되는 첫 질문(공백·문장부호만 다른 변형 포함)을 Zipf 분포로 섞어 보내고,
+miss일 때는 Agent 실행 대신 --agent-ms 만큼 대기한 뒤 저장합니다.
+유사 질문 매칭은 임베딩 API가 필요하므로 여기서는 정확 매칭만 측정합니다.
+
+실행: python -m benchmarks.bench_response_cache [--requests 2000] [--agent-ms 3000]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.common import setup_env, print_summary
+
+setup_env()
+
+from config import settings  # noqa: E402
+from utils.response_cache import ResponseCache  # noqa: E402
+
+QUESTIONS = [
+    "서울 실내 놀이터 추천해줘",
+    "부산 아이랑 갈만한 곳",
+    "수원 주말에 아이랑 갈 곳",
+    "내일 인천 키즈카페 알려줘",
+    "대전 비 오는 날 실내 체험",
+    "창원 아이와 갈만한 공원",
+    "제주 아이랑 가볼만한 곳",
+    "수도권 배드민턴 프로그램",
+    "강남 유아 수영 프로그램",
+    "광주 박물관 추천",
+]
+
+
+def variant(question: str, rng: random.Random) -> str:
+    """공백/문장부호만 다른 변형"""
+    return rng.choice(["", " ", "  "]) + question.replace(" ", rng.choice([" ", "  "])) + rng.choice(["", "?", "!!", "~"])
+
+
+def main(n_requests: int, agent_ms: float):
+    cache = ResponseCache(
+        ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        weather_window_seconds=settings.WEATHER_FORECAST_WINDOW_SECONDS
+    )
+    rng = random.Random(0)
+    weights = [1 / (rank + 1) for rank in range(len(QUESTIONS))]
+
+    lookups, simulated_total = [], 0.0
+    for _ in range(n_requests):
+        message = variant(rng.choices(QUESTIONS, weights)[0], rng)
+        start = time.perf_counter()
+        key = cache.make_key(message, child_age=rng.choice([None, 5]))
+        cached = cache.get(key) if key is not None else None
+        lookups.append(time.perf_counter() - start)
+
+        if cached is None:
+            simulated_total += agent_ms / 1000
+            if key is not None:
+                cache.put(key, {"content": f"답변: {message}", "type": "text", "facilities": []})
+
+    stats = cache.stats()
+    print("=" * 70)
+    print(f"요청 {n_requests}개, 질문 {len(QUESTIONS)}종 (변형 포함)")
+    print("=" * 70)
+    print_summary("key + lookup", lookups)
+    print(f"  hit rate: {stats['hit_rate']:.3f} (exact {stats['exact_hits']}, skipped {stats['skipped_not_confident']})")
+    print(f"  Agent 실행 시간 (캐시 없음): {n_requests * agent_ms / 1000:.0f}s → 캐시 사용: {simulated_total:.0f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--agent-ms", type=float, default=3000)
+    args = parser.parse_args()
+    main(args.requests, args.agent_ms)
@@ -0,0 +1,94 @@
+"""
+규칙 라우터 coverage / 분류 지연 시간
+
+라벨된 메시지로 classify_turn이 Agent를 건너뛰는 비율과 오분류를 측정합니다.
+도구 실행(임베딩 / 날씨 API)은 포함하지 않으며, 라우팅된 턴은
+functions agent 기준 LLM 호출 (도구 수 + 1)회를 절약합니다.
+
+실행: python -m benchmarks.bench_router [--repeat 200]
+"""
+
+import argparse
+import time
+
+from benchmarks.common import setup_env, print_summary
+
+setup_env()
+
+from agent.router import classify_turn, parse_map_indices, ROUTE_MAP, ROUTE_RECOMMEND  # noqa: E402
+
+LABELED = [
+    ("수원 아이랑 갈만한 곳 추천해줘", ROUTE_RECOMMEND),
+    ("부산 키즈카페 알려줘", ROUTE_RECOMMEND),
+    ("내일 인천 아이랑 놀 곳 찾아줘", ROUTE_RECOMMEND),
+    ("이번 주말 제주 가볼만한 곳 추천", ROUTE_RECOMMEND),
+    ("강남구 실내 놀이터 추천해줘", ROUTE_RECOMMEND),
+    ("대전 비 오는 날 갈 곳 알려줘", ROUTE_RECOMMEND),
+    ("지도 보여줘", ROUTE_MAP),
+    ("두 번째 장소 지도로 보여줘", ROUTE_MAP),
+    ("1번이랑 3번 위치 알려줘", ROUTE_MAP),
+    ("전부 지도에 표시해줘", ROUTE_MAP),
+    ("마지막 곳은 어디에 있어?", ROUTE_MAP),
+    # Agent가 처리해야 하는 메시지
+    ("아이랑 갈만한 곳 추천해줘", None),
+    ("거기 주차 돼?", None),
+    ("그 중에 실내만 다시 알려줘", None),
+    ("키즈카페 말고 다른 곳 추천해줘", None),
+    ("서울이랑 부산 중에 어디가 좋을까", None),
+    ("고마워!", None),
+    ("5살 아이가 좋아할 만한 체험이 뭐가 있을까요? 주말에 가족끼리 가려고 하는데 너무 멀지 않았으면 좋겠어요", None),
+    ("수원 지도 보여줘", None),
+    ("키즈카페 어디 있어?", None),
+    ("우리 동네 놀이터 위치 알려줘", None),
+]
+
+MAP_INDICES = [
+    ("지도 보여줘", 3, [0, 1, 2]),
+    ("두 번째 장소 지도로 보여줘", 3, [1]),
+    ("1번이랑 3번 위치 알려줘", 3, [0, 2]),
+    ("마지막 곳은 어디에 있어?", 2, [1]),
+    ("세 번째 지도", 2, None),
+    ("12번 지도", 3, None),
+    ("10번 지도", 3, None),
+]
+
+
+def main(repeat: int):
+    routed = correct = 0
+    wrong = []
+    for message, expected in LABELED:
+        got = classify_turn(message)
+        routed += got is not None
+        if got == expected:
+            correct += 1
+        else:
+            wrong.append((message, got, expected))
+    
+    for message, available, expected in MAP_INDICES:
+        got = parse_map_indices(message, available)
+        if got != expected:
+            wrong.append((message, got, expected))
+    
+    samples = []
+    for _ in range(repeat):
+        for message, _ in LABELED:
+            start = time.perf_counter()
+            classify_turn(message)
+            samples.append(time.perf_counter() - start)
+    
+    n_routable = sum(expected is not None for _, expected in LABELED)
+    print("=" * 70)
+    print(f"라벨 샘플 {len(LABELED)}개 (라우팅 대상 {n_routable}, Agent 대상 {len(LABELED) - n_routable})")
+    print("=" * 70)
+    print(f"라우팅된 메시지:      {routed}/{len(LABELED)}")
+    print(f"분류 정확도:          {correct}/{len(LABELED)} ({correct / len(LABELED):.0%})")
+    print_summary("classify_turn latency", samples)
+    for item in wrong:
+        print(f"  ✗ {item}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.repeat)
@@ -0,0 +1,103 @@
+"""
+show_map_for_facilities 지연 시간 비교
+
+- before: 저장된 검색 결과 없음 → 대화 기록 전체를 LLM에 넘겨 추출
+- after : save_search_results로 저장된 결과를 바로 조회
+
+LLM은 대화 길이에 비례하는 지연 시간을 가진 가짜 모델로 대체합니다.
+
+실행: python -m benchmarks.bench_show_map [--iterations 50] [--turns 10]
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.common import setup_env, print_summary
+
+setup_env()
+
+import tools.show_map_tool as show_map_module  # noqa: E402
+from utils.conversation_memory import (  # noqa: E402
+    add_message,
+    clear_conversation,
+    save_search_results,
+    set_current_conversation_id,
+    reset_current_conversation_id,
+)
+
+FACILITIES = [
+    {"name": "키즈카페 A", "lat": 37.51, "lng": 127.01, "desc": "실내 놀이터", "category": "키즈카페"},
+    {"name": "어린이 과학관", "lat": 37.52, "lng": 127.02, "desc": "체험형 과학관", "category": "과학관"},
+    {"name": "숲속 놀이터", "lat": 37.53, "lng": 127.03, "desc": "실외 놀이터", "category": "공원"},
+]
+
+
+class _Response:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeLLM:
+    """프롬프트 길이에 비례해서 느려지는 가짜 LLM (기본 500ms + 1ms/100자)"""
+
+    def __init__(self, base_latency: float):
+        self.base_latency = base_latency
+        self.calls = 0
+
+    def invoke(self, prompt: str) -> _Response:
+        self.calls += 1
+        time.sleep(self.base_latency + len(prompt) / 100 * 0.001)
+        return _Response(json.dumps({"success": True, "facilities": FACILITIES}, ensure_ascii=False))
+
+
+def _prepare_conversation(conversation_id: str, turns: int, stored: bool):
+    clear_conversation(conversation_id)
+    for i in range(turns):
+        add_message(conversation_id, "user", f"서울 실내 놀이터 추천해줘 ({i})")
+        add_message(conversation_id, "search_result", f"마지막 검색 결과: {FACILITIES}")
+        add_message(conversation_id, "ai", "추천 시설 3곳을 소개합니다. 지도 보여줘 라고 말해보세요!")
+    if stored:
+        save_search_results(conversation_id, FACILITIES)
+
+
+def _measure(conversation_id: str, iterations: int) -> list:
+    samples = []
+    token = set_current_conversation_id(conversation_id)
+    try:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            result = json.loads(show_map_module.show_map_for_facilities.invoke({"facility_indices": "1,2"}))
+            samples.append(time.perf_counter() - start)
+            assert result["success"] and len(result["facilities"]) == 2
+    finally:
+        reset_current_conversation_id(token)
+    return samples
+
+
+def main(iterations: int, turns: int, base_latency: float):
+    fake_llm = FakeLLM(base_latency)
+    show_map_module.get_llm = lambda: fake_llm
+
+    _prepare_conversation("bench-before", turns, stored=False)
+    before = _measure("bench-before", iterations)
+    llm_calls_before = fake_llm.calls
+
+    _prepare_conversation("bench-after", turns, stored=True)
+    after = _measure("bench-after", iterations)
+
+    print("=" * 70)
+    print(f"대화 {turns}턴, 반복 {iterations}회, 가짜 LLM 기본 지연 {base_latency * 1000:.0f}ms")
+    print("=" * 70)
+    print_summary("before (LLM 추출)", before)
+    print_summary("after (저장 결과 조회)", after)
+    print(f"LLM 호출 수: before={llm_calls_before}, after={fake_llm.calls - llm_calls_before}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    args = parser.parse_args()
+    main(args.iterations, args.turns, args.llm_latency)
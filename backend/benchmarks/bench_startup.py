@@ -0,0 +1,117 @@
+"""
+기동 시간 프로파일: import 시간 (python -X importtime) + 시작 작업별 시간
+
+각 측정은 새 파이썬 프로세스에서 실행합니다 (이미 import된 모듈 캐시 영향 없음).
+1) import main 총 시간과 누적 시간이 큰 최상위 모듈
+2) lifespan 시작 → /ready 까지 시작 작업별 시간 (--fakes면 OpenAI/Chroma 대신 로컬 가짜 사용)
+
+실행: python -m benchmarks.bench_startup [--top 15] [--repeat 3] [--fakes] [--detect-gpu]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.common import setup_env
+
+setup_env()
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import main
+print(f"{time.perf_counter() - start:.4f}")
+"""
+
+_READY_SCRIPT = """
+import asyncio, json, time
+start = time.perf_counter()
+if {fakes}:
+    from benchmarks.fakes import install_fakes
+    install_fakes(llm_latency=0, embedding_latency=0, vector_latency=0, weather_latency=0)
+import main
+imported = time.perf_counter() - start
+
+async def run():
+    async with main.app.router.lifespan_context(main.app):
+        await main.app.state.startup_task
+    return main.startup_state.snapshot()
+
+snapshot = asyncio.run(run())
+print(json.dumps({{"import": imported, "total": time.perf_counter() - start, "snapshot": snapshot}}))
+"""
+
+
+def _run(args, env) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+
+
+def profile_imports(env, top: int):
+    """python -X importtime 출력에서 최상위 import의 누적 시간"""
+    result = _run(["-X", "importtime", "-c", "import main"], env)
+    if result.returncode != 0:
+        raise SystemExit(f"❌ import main 실패:\n{result.stderr[-2000:]}")
+
+    top_level = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split(":", 1)[1].split("|")
+        # 들여쓰기 없는 이름 = main이 직접/간접으로 처음 import한 최상위 패키지
+        if not name.startswith("  "):
+            top_level.append((int(cumulative_us), name.strip()))
+
+    top_level.sort(reverse=True)
+    print("-" * 70)
+    print(f"누적 import 시간 상위 {top}개 (최상위 모듈)")
+    for cumulative_us, name in top_level[:top]:
+        print(f"  {cumulative_us / 1000:9.1f}ms  {name}")
+    heavy = [name for _, name in top_level if name.split(".")[0] in ("torch", "transformers", "chromadb")]
+    print(f"  무거운 선택 의존성: {', '.join(heavy) if heavy else '없음'}")
+
+
+def main(top: int, repeat: int, fakes: bool, detect_gpu: bool):
+    env = dict(os.environ)
+    if not detect_gpu:
+        env["USE_GPU"] = "false"
+
+    samples = []
+    for _ in range(repeat):
+        result = _run(["-c", _IMPORT_SCRIPT], env)
+        if result.returncode != 0:
+            raise SystemExit(f"❌ import main 실패:\n{result.stderr[-2000:]}")
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+
+    print("=" * 70)
+    print(f"import main: median {statistics.median(samples) * 1000:.0f}ms "
+          f"(min {min(samples) * 1000:.0f}ms, {repeat}회, USE_GPU={env.get('USE_GPU', '자동')})")
+    print("=" * 70)
+    profile_imports(env, top)
+
+    result = _run(["-c", _READY_SCRIPT.format(fakes=fakes)], env)
+    print("-" * 70)
+    if result.returncode != 0:
+        print(f"❌ 시작 작업 실행 실패:\n{result.stderr[-2000:]}")
+        return
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    snapshot = report["snapshot"]
+    print(f"시작 작업 ({'가짜 의존성' if fakes else '실제 의존성'}): ready={snapshot['ready']}, "
+          f"import {report['import'] * 1000:.0f}ms → 완료 {report['total'] * 1000:.0f}ms")
+    for name, step in snapshot["steps"].items():
+        error = f"  ({step['error']})" if step.get("error") else ""
+        print(f"  {name:<16} {step['status']:<6} {step.get('seconds', 0) * 1000:9.1f}ms{error}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fakes", action="store_true", help="OpenAI / Chroma 대신 benchmarks.fakes 사용")
+    parser.add_argument("--detect-gpu", action="store_true", help="USE_GPU를 비워 torch 자동 감지 비용 포함")
+    args = parser.parse_args()
+    main(args.top, args.repeat, args.fakes, args.detect_gpu)
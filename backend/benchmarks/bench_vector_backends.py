@@ -0,0 +1,72 @@
+"""
+벡터 검색 백엔드 recall / 지연 시간 비교
+
+로컬 인덱스의 정확한 내적 검색(exact)을 정답으로 두고,
+ChromaDB(HttpClient, 내부 HNSW)와 로컬 HNSW의 recall@k와 지연 시간을 측정합니다.
+쿼리는 저장된 문서 벡터에 노이즈를 섞어 만듭니다 (임베딩 API 호출 없음).
+
+사전 준비: python export_local_index.py
+실행: python -m benchmarks.bench_vector_backends [--queries 200] [--k 5] [--skip-chroma]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import setup_env, print_summary
+
+setup_env()
+
+from config import settings  # noqa: E402
+from retrieval.backends import ChromaBackend, LocalBackend  # noqa: E402
+from retrieval.local_index import LocalVectorIndex  # noqa: E402
+
+
+def make_queries(index: LocalVectorIndex, n: int, noise: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(index), size=min(n, len(index)), replace=False)
+    base = np.asarray(index.vectors[rows])
+    return LocalVectorIndex.normalize(base + rng.normal(0, noise, base.shape).astype(np.float32))
+
+
+def run(label: str, backend_query, queries: np.ndarray, k: int, truth: list):
+    samples, recalls = [], []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        ids = backend_query(query.tolist(), k)
+        samples.append(time.perf_counter() - start)
+        recalls.append(len(set(ids) & expected) / k)
+    print_summary(label, samples)
+    print(f"  recall@{k}: {np.mean(recalls):.3f}")
+
+
+def main(n_queries: int, k: int, noise: float, skip_chroma: bool):
+    exact = LocalVectorIndex.load(settings.LOCAL_INDEX_PATH, ann="exact")
+    queries = make_queries(exact, n_queries, noise)
+    truth = [{exact.ids[row] for row, _ in exact.search(q, k)} for q in queries]
+
+    print("=" * 70)
+    print(f"문서 {len(exact)}개, {exact.dimensions}차원, 쿼리 {len(queries)}개, k={k}")
+    print("=" * 70)
+
+    local = LocalBackend()
+    run("local exact", lambda q, k: local.query(q, k)["ids"], queries, k, truth)
+
+    local.index = LocalVectorIndex.load(settings.LOCAL_INDEX_PATH, ann="hnsw")
+    if local.index._hnsw is not None:
+        run("local hnsw", lambda q, k: local.query(q, k)["ids"], queries, k, truth)
+
+    if not skip_chroma:
+        chroma = ChromaBackend()
+        run("chroma (HttpClient)", lambda q, k: chroma.query(q, k)["ids"], queries, k, truth)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--noise", type=float, default=0.02)
+    parser.add_argument("--skip-chroma", action="store_true")
+    args = parser.parse_args()
+    main(args.queries, args.k, args.noise, args.skip_chroma)
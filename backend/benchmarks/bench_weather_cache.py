@@ -0,0 +1,70 @@
+"""
+날씨 예보 캐시 / single-flight 확인
+
+동시에 들어온 같은 도시 요청 burst가 upstream 호출 한 번으로 합쳐지는지,
+이후 요청은 캐시에서 바로 응답하는지 측정합니다.
+
+실행: python -m benchmarks.bench_weather_cache [--burst 50] [--latency 0.3]
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import setup_env, print_summary
+
+setup_env()
+
+import tools.weather_tool as weather_module  # noqa: E402
+
+SAMPLE_FORECAST = [
+    {
+        "dt_txt": time.strftime("%Y-%m-%d 12:00:00"),
+        "weather": [{"main": "Rain", "description": "약한 비"}],
+        "main": {"temp": 12.3},
+    }
+]
+
+
+def main(burst: int, latency: float):
+    upstream_calls = 0
+    lock = threading.Lock()
+
+    def fake_fetch(english_city):
+        nonlocal upstream_calls
+        with lock:
+            upstream_calls += 1
+        time.sleep(latency)
+        return SAMPLE_FORECAST
+
+    weather_module._fetch_forecast = fake_fetch
+    weather_module.forecast_cache.clear()
+
+    def call(_):
+        start = time.perf_counter()
+        result = json.loads(weather_module.get_weather_forecast.invoke({"city_name": "서울", "date": "today"}))
+        assert result["success"]
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=burst) as pool:
+        cold = list(pool.map(call, range(burst)))
+        cold_calls = upstream_calls
+        warm = list(pool.map(call, range(burst)))
+
+    print("=" * 70)
+    print(f"서울 동시 요청 {burst}개 x 2회, upstream 지연 {latency * 1000:.0f}ms")
+    print("=" * 70)
+    print_summary("cold burst (single-flight)", cold)
+    print_summary("warm burst (cache hit)", warm)
+    print(f"upstream 호출: cold={cold_calls}, warm={upstream_calls - cold_calls}")
+    print(f"cache stats: {weather_module.get_weather_cache_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--burst", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+    main(args.burst, args.latency)
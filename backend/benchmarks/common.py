@@ -0,0 +1,41 @@
+"""
+벤치마크 공통 유틸
+"""
+
+import os
+import statistics
+from typing import Dict, List
+
+def setup_env():
+    """실제 API 키 없이 settings를 로드할 수 있도록 더미 환경변수 설정"""
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("OPENWEATHER_API_KEY", "benchmark")
+    os.environ.setdefault("KAKAO_API_KEY", "benchmark")
+
+def percentile(values: List[float], p: float) -> float:
+    """p번째 백분위수 (0~100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """지연 시간 요약 (ms)"""
+    if not values:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    return {
+        "count": len(values),
+        "mean_ms": statistics.mean(values) * 1000,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+    }
+
+def print_summary(label: str, values: List[float]):
+    """요약 한 줄 출력"""
+    s = summarize(values)
+    print(
+        f"{label:<32} n={s['count']:<5} mean={s['mean_ms']:8.2f}ms "
+        f"p50={s['p50_ms']:8.2f}ms p95={s['p95_ms']:8.2f}ms p99={s['p99_ms']:8.2f}ms"
+    )
@@ -0,0 +1,354 @@
+"""
+오프라인 벤치마크용 로컬 가짜 의존성 (OpenAI / OpenWeatherMap / Chroma)
+
+- LatencyModel: 호출마다 주입하는 지연 시간 (평균 ± jitter, seed 고정)
+- FakeEmbeddings: 글자 bigram feature hashing 임베딩 (같은 단어가 겹치면 가까움)
+- FakeVectorBackend: 합성 시설 데이터를 LocalVectorIndex에 올리고 Chroma 왕복 지연만 흉내
+- FakeWeatherSession: requests.Session.get 대신 결정적인 5일/3시간 예보 반환
+- FakeAgentLLM: functions agent 흉내 (intent → weather → search → 최종 답변 / 지도 요청 → show_map)
+
+install_fakes()는 tools / routers를 import하기 전에 호출해야 합니다
+(rag_tool이 import 시점에 벡터 백엔드를 가져오고, routers가 Agent를 만듦).
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+import numpy as np
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, FunctionMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from retrieval.backends import LocalBackend, create_metadata_index
+from retrieval.documents import META_COLS, build_doc, build_metadata, stable_ids
+from retrieval.local_index import LocalVectorIndex
+
+
+class LatencyModel:
+    """평균 mean초, ±jitter 비율의 균등 분포 지연 (스레드 안전, seed 고정)"""
+
+    def __init__(self, mean: float, jitter: float = 0.2, seed: int = 0):
+        self.mean = mean
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        if self.mean <= 0:
+            return 0.0
+        with self._lock:
+            factor = 1 + self._random.uniform(-self.jitter, self.jitter)
+        return self.mean * factor
+
+    def sleep(self):
+        delay = self.sample()
+        if delay:
+            time.sleep(delay)
+
+    async def asleep(self):
+        delay = self.sample()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+# ----------------------------------------------------------------------
+# OpenAI 임베딩
+# ----------------------------------------------------------------------
+_WORD_RE = re.compile(r"[0-9A-Za-z가-힣]+")
+
+
+class FakeEmbeddings:
+    """OpenAIEmbeddings 대체 (embed_query / embed_documents, 결정적)"""
+
+    def __init__(self, dimensions: int = 256, latency: Optional[LatencyModel] = None):
+        self.dimensions = dimensions
+        self.latency = latency or LatencyModel(0)
+        self.calls = 0
+
+    def _vector(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for word in _WORD_RE.findall(text):
+            grams = [word] + [word[i:i + 2] for i in range(len(word) - 1)]
+            for gram in grams:
+                digest = hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest()
+                slot = int.from_bytes(digest[:4], "little") % self.dimensions
+                vector[slot] += 1.0 if digest[4] & 1 else -1.0
+        norm = float(np.linalg.norm(vector))
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        self.calls += 1
+        self.latency.sleep()
+        return self._vector(text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        self.latency.sleep()
+        return [self._vector(text) for text in texts]
+
+
+# ----------------------------------------------------------------------
+# Chroma
+# ----------------------------------------------------------------------
+# 약칭, 시도 정식 명칭, 중심 좌표, 시군구
+REGIONS = [
+    ("서울", "서울특별시", 37.5665, 126.9780, ["강남구", "마포구", "송파구", "종로구", "노원구"]),
+    ("부산", "부산광역시", 35.1796, 129.0756, ["해운대구", "부산진구", "사하구"]),
+    ("대구", "대구광역시", 35.8714, 128.6014, ["수성구", "달서구"]),
+    ("인천", "인천광역시", 37.4563, 126.7052, ["연수구", "남동구", "부평구"]),
+    ("대전", "대전광역시", 36.3504, 127.3845, ["유성구", "서구"]),
+    ("경기", "경기도", 37.2636, 127.0286, ["수원시", "성남시", "고양시", "용인시", "가평군"]),
+    ("강원", "강원특별자치도", 37.8813, 127.7298, ["춘천시", "강릉시"]),
+    ("제주", "제주특별자치도", 33.4996, 126.5312, ["제주시", "서귀포시"]),
+]
+
+CATEGORIES = [
+    ("체육시설", "실내", "실내 놀이터"),
+    ("문화시설", "실내", "어린이 박물관"),
+    ("문화시설", "실내", "과학관"),
+    ("체험시설", "실내외", "키즈카페"),
+    ("공원", "실외", "어린이 공원"),
+    ("체험시설", "실외", "농장 체험"),
+    ("체육시설", "실외", "자전거 공원"),
+    ("교육시설", "실내", "어린이 도서관"),
+]
+
+
+def synthetic_rows(n: int, seed: int = 0) -> List[Dict]:
+    """ingest.py가 읽는 CSV와 같은 컬럼의 합성 시설 행"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        _, sido, lat, lon, sigungu_list = REGIONS[i % len(REGIONS)]
+        sigungu = rng.choice(sigungu_list)
+        category1, in_out, category3 = rng.choice(CATEGORIES)
+        age_min = rng.randint(0, 7)
+        age_max = age_min + rng.randint(2, 8)
+        name = f"{sigungu.rstrip('구시군')} {category3} {i}호점"
+        rows.append({
+            "Name": name,
+            "Category1": category1,
+            "Category2": "",
+            "Category3": category3,
+            "Address": f"{sido} {sigungu} 테스트로 {i}",
+            "CTPRVN_NM": sido,
+            "SIGNGU_NM": sigungu,
+            "LAT": round(lat + rng.uniform(-0.15, 0.15), 6),
+            "LON": round(lon + rng.uniform(-0.15, 0.15), 6),
+            "in_out": in_out,
+            "Age": f"{age_min}~{age_max}세",
+            "age_min": age_min,
+            "age_max": age_max,
+            "Time": "10:00~18:00",
+            "Day": "화~일",
+            "Cost": rng.choice(["무료", "5,000원", "12,000원"]),
+            "Note": f"{category3}에서 아이와 함께 즐길 수 있는 {in_out} 공간입니다.",
+        })
+    return rows
+
+
+class FakeVectorBackend(LocalBackend):
+    """합성 시설 데이터 + LocalVectorIndex, 호출마다 Chroma HTTP 왕복 지연 주입"""
+
+    name = "fake_chroma"
+
+    def __init__(self, n_facilities: int, embeddings: FakeEmbeddings, latency: Optional[LatencyModel] = None):
+        rows = synthetic_rows(n_facilities)
+        documents = [build_doc(row) for row in rows]
+        metadatas = [build_metadata(row, META_COLS) for row in rows]
+        vectors = [embeddings._vector(document) for document in documents]
+        self.index = LocalVectorIndex.from_embeddings(stable_ids(rows), vectors, documents, metadatas)
+        self.metadata_index = create_metadata_index(self.index.metadatas)
+        self.latency = latency or LatencyModel(0)
+
+    def query(self, query_embedding, k, filters=None):
+        self.latency.sleep()
+        return super().query(query_embedding, k, filters)
+
+    def query_ids(self, query_embedding, k, filters=None):
+        self.latency.sleep()
+        return super().query_ids(query_embedding, k, filters)
+
+    def get_documents(self, ids):
+        self.latency.sleep()
+        return super().get_documents(ids)
+
+
+# ----------------------------------------------------------------------
+# OpenWeatherMap
+# ----------------------------------------------------------------------
+class _FakeResponse:
+    def __init__(self, status_code: int, payload: Dict):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self) -> Dict:
+        return self._payload
+
+
+class FakeWeatherSession:
+    """requests.Session 대체: 도시 이름으로 결정되는 5일/3시간 예보"""
+
+    CONDITIONS = [("Clear", "맑음"), ("Clouds", "구름많음"), ("Rain", "비"), ("Snow", "눈")]
+
+    def __init__(self, latency: Optional[LatencyModel] = None, error_rate: float = 0.0):
+        self.latency = latency or LatencyModel(0)
+        self.error_rate = error_rate
+        self._random = random.Random(1)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def get(self, url: str, params: Optional[Dict] = None, timeout: Optional[float] = None) -> _FakeResponse:
+        with self._lock:
+            self.calls += 1
+            failed = self._random.random() < self.error_rate
+        self.latency.sleep()
+        if failed:
+            return _FakeResponse(503, {})
+
+        city = (params or {}).get("q", "")
+        seed = int.from_bytes(hashlib.sha1(city.encode("utf-8")).digest()[:4], "little")
+        start = datetime.now().replace(minute=0, second=0, microsecond=0)
+        forecasts = []
+        for step in range(40):
+            main, description = self.CONDITIONS[(seed + step // 8) % len(self.CONDITIONS)]
+            forecasts.append({
+                "dt_txt": (start + timedelta(hours=3 * step)).strftime("%Y-%m-%d %H:%M:%S"),
+                "main": {"temp": 10 + (seed + step) % 15},
+                "weather": [{"main": main, "description": description}],
+            })
+        return _FakeResponse(200, {"list": forecasts})
+
+
+# ----------------------------------------------------------------------
+# OpenAI 채팅 모델 (functions agent)
+# ----------------------------------------------------------------------
+def _function_call(name: str, arguments: Dict) -> AIMessage:
+    return AIMessage(content="", additional_kwargs={
+        "function_call": {"name": name, "arguments": json.dumps(arguments, ensure_ascii=False)}
+    })
+
+
+class FakeAgentLLM(BaseChatModel):
+    """
+    create_openai_functions_agent가 기대하는 function_call 응답을 규칙으로 생성
+    도구 안에서 부르는 LLM(의도 추출 fallback)에는 JSON 응답
+    """
+
+    latency: Any = None
+    model_name: str = "fake-gpt-4o-mini"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-agent"
+
+    def _decide(self, messages: List[BaseMessage]) -> AIMessage:
+        last_human = max(i for i, m in enumerate(messages) if isinstance(m, HumanMessage))
+        user_message = str(messages[last_human].content)
+        if "응답 형식 (JSON만)" in user_message:
+            return AIMessage(content=json.dumps({
+                "location": None, "weather_mentioned": False, "weather_condition": None,
+                "date": "today", "needs_weather_check": True
+            }))
+
+        observations = {
+            m.name: m.content for m in messages[last_human + 1:] if isinstance(m, FunctionMessage)
+        }
+        if "지도" in user_message:
+            if "show_map_for_facilities" not in observations:
+                return _function_call("show_map_for_facilities", {"facility_indices": "0,1,2"})
+            return AIMessage(content="지도를 표시했어요.")
+
+        if "extract_user_intent" not in observations:
+            return _function_call("extract_user_intent", {"user_message": user_message})
+        intent = json.loads(observations["extract_user_intent"])
+        location = intent.get("location")
+
+        if intent.get("needs_weather_check") and location and "get_weather_forecast" not in observations:
+            return _function_call("get_weather_forecast", {"city_name": location, "date": intent.get("date") or "today"})
+
+        if "search_facilities" not in observations:
+            arguments = {"original_query": user_message}
+            if location:
+                arguments["region"] = location
+            weather = json.loads(observations.get("get_weather_forecast") or "{}")
+            if weather.get("success"):
+                arguments["is_indoor"] = weather["is_indoor"]
+            return _function_call("search_facilities", arguments)
+
+        facilities = json.loads(observations["search_facilities"]).get("facilities", [])
+        names = ", ".join(f"{i + 1}. {f['name']}" for i, f in enumerate(facilities)) or "조건에 맞는 곳이 없어요"
+        return AIMessage(content=f"추천 장소: {names}")
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        message = self._decide(messages)
+        prompt_tokens = sum(len(str(m.content)) for m in messages) // 2
+        completion_tokens = max(1, len(str(message.content)) // 2)
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={
+                "model_name": self.model_name,
+                "token_usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens},
+            },
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency is not None:
+            self.latency.sleep()
+        return self._result(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency is not None:
+            await self.latency.asleep()
+        return self._result(messages)
+
+
+# ----------------------------------------------------------------------
+# 설치
+# ----------------------------------------------------------------------
+def install_fakes(
+    n_facilities: int = 2000,
+    dimensions: int = 256,
+    llm_latency: float = 0.8,
+    embedding_latency: float = 0.15,
+    vector_latency: float = 0.03,
+    weather_latency: float = 0.2,
+    weather_error_rate: float = 0.0,
+    jitter: float = 0.2,
+) -> Dict[str, Any]:
+    """
+    전역 싱글턴을 가짜로 교체 (tools / routers import 전에 호출)
+    Returns:
+        {"embeddings", "vector_backend", "weather", "llm"} (호출 수 확인용)
+    """
+    import retrieval.backends as backends
+    from models import chat_models
+    from models.chat_models import LLMMetrics, LLMMetricsCallback
+    from models.pca_embeddings import pca_embeddings
+
+    embeddings = FakeEmbeddings(dimensions, LatencyModel(embedding_latency, jitter, seed=1))
+    pca_embeddings.embeddings = embeddings
+
+    vector_backend = FakeVectorBackend(n_facilities, embeddings, LatencyModel(vector_latency, jitter, seed=2))
+    backends._backend = vector_backend
+    backends._backend_failed_at = None
+    backends._corpus = None
+    backends._derived.clear()
+    backends._derived_errors.clear()
+
+    metrics = chat_models._metrics.setdefault("default", LLMMetrics())
+    llm = FakeAgentLLM(latency=LatencyModel(llm_latency, jitter, seed=3), callbacks=[LLMMetricsCallback(metrics)])
+    chat_models._registry["default"] = llm
+
+    weather = FakeWeatherSession(LatencyModel(weather_latency, jitter, seed=4), error_rate=weather_error_rate)
+    import tools.weather_tool as weather_tool
+    weather_tool._session = weather
+
+    return {"embeddings": embeddings, "vector_backend": vector_backend, "weather": weather, "llm": llm}
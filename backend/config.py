@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-import torch
+from typing import Optional
 
 class Settings(BaseSettings):
     # Generation 모델
@@ -15,14 +15,106 @@ class Settings(BaseSettings):
     CHROMA_PORT: int = 8000
     CHROMA_COLLECTION: str = "kid_program_collection"
     
+    # Vector search backend
+    VECTOR_BACKEND: str = "chroma"  # chroma | local (프로세스 내 인덱스)
+    LOCAL_INDEX_PATH: str = "./data/local_index"  # export_local_index.py 출력 경로
+    LOCAL_INDEX_ANN: str = "exact"  # exact | hnsw (hnswlib 필요)
+    LOCAL_INDEX_QUANTIZATION: str = "none"  # none | int8 | binary (export_local_index.py 기본값)
+    VECTOR_BACKEND_RETRY_SECONDS: float = 5.0  # 연결 실패 후 다시 시도하기까지 대기
+    
+    # Hybrid search (BM25 + 벡터, reciprocal rank fusion)
+    HYBRID_SEARCH: bool = True
+    LEXICAL_TOP_K: int = 10  # BM25 후보 수
+    RRF_K: int = 60  # RRF 상수 (클수록 하위 순위 영향 증가)
+    
+    # Geo ranking (시설 좌표 격자 인덱스)
+    GEO_CELL_DEGREES: float = 0.05  # 격자 크기 (약 5km)
+    GEO_USER_RADIUS_KM: float = 20.0  # 사용자 좌표가 있을 때 1차 검색 반경
+    GEO_REGION_RADIUS_KM: float = 30.0  # 지역 결과가 부족할 때 지역 중심에서 넓힐 반경
+    GEO_DISTANCE_SCALE_KM: float = 10.0  # 근접 점수 exp(-거리/scale)
+    GEO_PROXIMITY_WEIGHT: float = 0.4  # 최종 점수 = (1-w)·관련도 순위 + w·근접 점수
+    GEO_CANDIDATE_MULTIPLIER: int = 3  # 사용자 좌표가 있을 때 재정렬용으로 k의 몇 배를 가져올지
+    
     # GPU & LLM
-    USE_GPU: bool = torch.cuda.is_available()
+    USE_GPU: Optional[bool] = None  # None이면 LLM을 처음 만들 때 torch.cuda로 확인 (false면 torch를 import하지 않음)
     QWEN_MODEL_PATH: str = "./model_files/Qwen2-7B-Instruct"
+    LLM_WARMUP: bool = True  # 서버 시작 시 LLM 미리 생성
+    STARTUP_RETRY_INITIAL_SECONDS: float = 2.0  # 실패한 필수 시작 작업 재시도 간격 (두 배씩 증가)
+    STARTUP_RETRY_MAX_SECONDS: float = 60.0
     
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8080
     
+    # Weather
+    WEATHER_CACHE_TTL_SECONDS: int = 30 * 60  # 같은 도시 예보 재사용 시간
+    WEATHER_FORECAST_WINDOW_SECONDS: int = 3 * 60 * 60  # OpenWeatherMap 3시간 예보 갱신 주기
+    WEATHER_TIMEOUT_SECONDS: float = 5.0
+    WEATHER_MAX_RETRIES: int = 2
+    
+    # Query embedding cache
+    EMBEDDING_CACHE_SIZE: int = 2048  # 메모리 LRU 항목 수 (0이면 캐시 끔)
+    EMBEDDING_CACHE_DIR: Optional[str] = None  # 지정하면 디스크 캐시 사용 (예: ./data/query_embeddings)
+    EMBEDDING_CACHE_DTYPE: str = "float16"  # 디스크 저장 형식 (float16 | float32)
+    
+    # Document embedding store (content-addressed, 인덱싱 재실행 시 재사용)
+    EMBEDDING_STORE_DIR: Optional[str] = "./data/embedding_store"  # None이면 사용 안 함
+    EMBEDDING_STORE_DTYPE: str = "float16"  # float16 | float32
+    
+    # Dimensionality reduction (문서/쿼리에 같이 적용, 바꾸면 ingest.py --full-rebuild 필요)
+    EMBEDDING_REDUCTION: str = "none"  # none | truncate (Matryoshka) | pca
+    EMBEDDING_TARGET_DIMENSIONS: int = 512
+    EMBEDDING_PROJECTION_PATH: str = "./data/embedding_projection.npz"  # fit_projection.py 출력
+    
+    # Tracing (요청별 span / Prometheus 지표)
+    TRACE_LOG_PATH: str = ""  # 지정하면 요청마다 JSON trace 한 줄씩 저장 (JSONL)
+    
+    # Rule router (확실한 패턴은 Agent 없이 도구 직접 실행)
+    ROUTER_ENABLED: bool = True
+    
+    # Response cache (첫 턴 응답 재사용)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 3600  # 날씨 예보를 보는 질문은 예보 구간이 끝나면 더 일찍 만료
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    RESPONSE_CACHE_SIMILARITY: float = 0.0  # 0보다 크면 임베딩 코사인 유사도로 비슷한 질문도 매칭 (예: 0.95)
+    
+    # Conversation store
+    CONVERSATION_STORE: str = "memory"  # memory | sqlite (여러 워커가 공유하려면 sqlite)
+    CONVERSATION_SQLITE_PATH: str = "./data/conversations.sqlite3"
+    CONVERSATION_MAX_CONVERSATIONS: int = 10000
+    CONVERSATION_TTL_SECONDS: int = 6 * 60 * 60  # 마지막 접근 후 6시간
+    CONVERSATION_MAX_MESSAGES: int = 50  # 대화별 최대 메시지 수
+    CONVERSATION_MAX_BYTES: int = 256 * 1024 * 1024  # memory 백엔드 전체 한도
+    
+    # Agent prompt history
+    HISTORY_MAX_TOKENS: int = 2000  # chat_history 토큰 예산
+    HISTORY_SUMMARY_MAX_TOKENS: int = 200  # 잘린 오래된 턴 요약 예산
+    
+    # Concurrency
+    TOOL_THREAD_POOL_SIZE: int = 16  # 블로킹 호출(Chroma, requests, sync LLM)을 넘길 스레드 수
+    
+    # Admission control (/api/chat 동시 처리 턴 수 제한)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENT: int = 32  # 동시에 처리할 턴 수 (턴마다 LLM 호출이 여러 번)
+    ADMISSION_MAX_QUEUE: int = 64  # 대기열 길이 (꽉 차면 바로 503)
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 10.0  # 대기열 최대 대기 시간 (넘으면 503)
+    ADMISSION_MAX_PENDING_PER_CONVERSATION: int = 1  # 같은 대화에서 처리 중인 턴 뒤에 기다릴 수 있는 메시지 수 (넘으면 429)
+    
+    # Resilience (외부 의존성 타임아웃 / 서킷 브레이커)
+    RESILIENCE_ENABLED: bool = True
+    RESILIENCE_THREAD_POOL_SIZE: int = 32  # 타임아웃/hedging 호출 전용 스레드 수 (포기한 호출이 끝날 때까지 점유)
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # 연속 실패 몇 번이면 open
+    CIRCUIT_RECOVERY_SECONDS: float = 30.0  # open 후 half-open 시험 호출까지 대기
+    CIRCUIT_HALF_OPEN_MAX_CALLS: int = 1  # half-open에서 동시에 허용할 시험 호출 수
+    EMBEDDING_TIMEOUT_SECONDS: float = 5.0
+    EMBEDDING_HEDGE_AFTER_SECONDS: float = 0.0  # 0보다 크면 이 시간 안에 응답이 없을 때 같은 요청을 한 번 더 (예: p95 근처 0.8)
+    EMBEDDING_MAX_RETRIES: int = 1  # OpenAI 클라이언트 자체 재시도 (기본 2회는 타임아웃보다 길어질 수 있음)
+    VECTOR_TIMEOUT_SECONDS: float = 3.0  # Chroma 쿼리 (HttpClient에는 요청 타임아웃이 없음)
+    LLM_TIMEOUT_SECONDS: float = 30.0  # ChatOpenAI 요청 타임아웃
+    LLM_MAX_RETRIES: int = 1
+    WEATHER_STALE_SECONDS: int = 6 * 60 * 60  # 날씨 API 장애 시 이 시간 안의 지난 예보로 응답
+    SEARCH_FALLBACK_TTL_SECONDS: int = 30 * 60  # 검색 장애 시 같은 질문의 최근 결과로 응답
+    
     class Config:
         env_file = ".env"
 
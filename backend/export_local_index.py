@@ -0,0 +1,63 @@
+"""
+ChromaDB 컬렉션 → 로컬 벡터 인덱스 내보내기
+
+VECTOR_BACKEND=local 로 실행하려면 먼저 이 스크립트로 인덱스를 만드세요.
+
+실행: python export_local_index.py [--out ./data/local_index] [--page-size 500] [--quantization int8]
+"""
+
+import argparse
+import time
+import chromadb
+from chromadb.config import Settings as ChromaSettings
+from config import settings
+from retrieval.local_index import LocalVectorIndex
+
+
+def export(out_path: str, page_size: int, quantization: str):
+    print("=" * 70)
+    print("📦 ChromaDB → 로컬 인덱스 내보내기")
+    print(f"🔌 ChromaDB: {settings.CHROMA_HOST}:{settings.CHROMA_PORT}")
+    print(f"📚 컬렉션: {settings.CHROMA_COLLECTION}")
+    print(f"📁 출력: {out_path} (양자화: {quantization})")
+    print("=" * 70)
+
+    client = chromadb.HttpClient(
+        host=settings.CHROMA_HOST,
+        port=settings.CHROMA_PORT,
+        settings=ChromaSettings(anonymized_telemetry=False)
+    )
+    collection = client.get_collection(settings.CHROMA_COLLECTION)
+    total = collection.count()
+    print(f"✅ 연결 성공: 총 {total}개")
+
+    ids, embeddings, documents, metadatas = [], [], [], []
+    start = time.perf_counter()
+
+    for offset in range(0, total, page_size):
+        page = collection.get(
+            limit=page_size,
+            offset=offset,
+            include=["embeddings", "documents", "metadatas"]
+        )
+        ids.extend(page["ids"])
+        embeddings.extend(page["embeddings"])
+        documents.extend(page["documents"])
+        metadatas.extend(page["metadatas"])
+        print(f"   → {len(ids)}/{total} 읽음")
+
+    LocalVectorIndex.build(out_path, ids, embeddings, documents, metadatas, quantization=quantization)
+
+    print("\n" + "=" * 70)
+    print(f"🎉 내보내기 완료: {len(ids)}개, {time.perf_counter() - start:.1f}s")
+    print("   VECTOR_BACKEND=local 로 서버를 실행하세요")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", default=settings.LOCAL_INDEX_PATH)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--quantization", default=settings.LOCAL_INDEX_QUANTIZATION, choices=["none", "int8", "binary"])
+    args = parser.parse_args()
+    export(args.out, args.page_size, args.quantization)
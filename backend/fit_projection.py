@@ -0,0 +1,84 @@
+"""
+PCA 투영 행렬 학습
+
+CSV 전체 문서를 원본 차원(3072)으로 임베딩(저장소에 있으면 재사용)한 뒤
+PCA로 EMBEDDING_TARGET_DIMENSIONS 차원 투영 행렬을 학습해서 .npz로 저장합니다.
+
+실행:
+    python fit_projection.py [--dimensions 512] [--sample 20000]
+    EMBEDDING_REDUCTION=pca python ingest.py --full-rebuild
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+from openai import OpenAI
+
+from config import settings
+from ingest import CSV_PATH, BatchEmbedder, load_rows
+from models.embedding_projection import EmbeddingProjection
+from models.embedding_store import EmbeddingStore
+from models.pca_embeddings import OpenAIEmbeddingWrapper
+from utils.rate_limiter import RateLimiter
+
+
+def fit(args) -> int:
+    print("=" * 70)
+    print(f"📐 PCA 학습: {OpenAIEmbeddingWrapper.DIMENSIONS} → {args.dimensions}차원")
+    print(f"📁 CSV: {args.csv}")
+    print(f"💾 출력: {args.out}")
+    print("=" * 70)
+
+    _, documents, _, _ = load_rows(args.csv)
+    if args.sample and len(documents) > args.sample:
+        rng = np.random.default_rng(0)
+        documents = [documents[i] for i in sorted(rng.choice(len(documents), args.sample, replace=False))]
+    print(f"✅ 학습 문서 {len(documents)}개")
+
+    store = None
+    if settings.EMBEDDING_STORE_DIR:
+        store = EmbeddingStore(
+            directory=settings.EMBEDDING_STORE_DIR,
+            model=OpenAIEmbeddingWrapper.MODEL,
+            dimensions=OpenAIEmbeddingWrapper.DIMENSIONS,
+            dtype=settings.EMBEDDING_STORE_DTYPE
+        )
+    embedder = BatchEmbedder(
+        OpenAI(api_key=settings.OPENAI_API_KEY),
+        RateLimiter(args.rpm, burst=1),
+        args.max_retries,
+        store=store
+    )
+
+    start = time.perf_counter()
+    vectors = []
+    for offset in range(0, len(documents), args.batch_size):
+        vectors.extend(embedder.embed(documents[offset:offset + args.batch_size]))
+        print(f"   → {len(vectors)}/{len(documents)} 임베딩")
+
+    projection = EmbeddingProjection.fit_pca(np.asarray(vectors, dtype=np.float32), args.dimensions)
+    projection.save(args.out)
+
+    print("\n" + "=" * 70)
+    print(f"🎉 완료: 설명 분산 {projection.explained_variance:.3f}, {time.perf_counter() - start:.1f}s")
+    print("   EMBEDDING_REDUCTION=pca 설정 후 python ingest.py --full-rebuild 를 실행하세요")
+    print("=" * 70)
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PCA 투영 행렬 학습")
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--out", default=settings.EMBEDDING_PROJECTION_PATH)
+    parser.add_argument("--dimensions", type=int, default=settings.EMBEDDING_TARGET_DIMENSIONS)
+    parser.add_argument("--sample", type=int, default=20000, help="학습에 쓸 최대 문서 수 (0이면 전체)")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--rpm", type=float, default=300)
+    parser.add_argument("--max-retries", type=int, default=5)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(fit(parse_args()))
@@ -0,0 +1,306 @@
+"""
+Kids Program RAG - 증분 인덱싱 파이프라인
+
+- 행마다 문서+메타데이터 해시를 계산해서 새 행/바뀐 행만 다시 임베딩
+- 안정적인 ID(시설명+주소+좌표)로 upsert, CSV에서 사라진 행은 delete
+- 임베딩 배치를 여러 스레드로 동시에 실행 (분당 요청 수 제한 + 지수 백오프 재시도)
+- 문서 텍스트 sha256으로 임베딩을 저장소에 보관 → 전체 재생성/메타데이터만 바뀐 행은 API 호출 없음
+- EMBEDDING_REDUCTION 설정 시 차원 축소 후 업로드 (설정이 바뀌면 --full-rebuild 필요)
+- 배치가 끝날 때마다 상태 파일에 체크포인트 → 중단돼도 이어서 실행
+- 실패한 배치는 버리지 않고 보고 (종료 코드 1, 다음 실행 때 다시 시도)
+
+실행:
+    python ingest.py                  # 증분 업데이트
+    python ingest.py --full-rebuild   # 컬렉션 삭제 후 전체 재생성
+    python ingest.py --dry-run        # 바뀔 내용만 출력
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import chromadb
+import pandas as pd
+from chromadb.config import Settings as ChromaSettings
+from openai import OpenAI
+
+from config import settings
+from models.embedding_projection import load_projection
+from models.embedding_store import EmbeddingStore
+from models.pca_embeddings import OpenAIEmbeddingWrapper
+from retrieval.documents import META_COLS, build_doc, build_metadata, content_hash, stable_ids
+from utils.rate_limiter import RateLimiter
+
+CSV_PATH = "./rag_data_integrated_final_rev_loc.csv"
+STATE_PATH = "./data/ingest_state.json"
+
+
+# ============================================
+# 체크포인트 (id → content hash)
+# ============================================
+def embedding_signature(projection) -> str:
+    """컬렉션 벡터 형식 (모델:원본차원:축소방식)"""
+    reduction = projection.signature if projection is not None else "full"
+    return f"{OpenAIEmbeddingWrapper.MODEL}:{OpenAIEmbeddingWrapper.DIMENSIONS}:{reduction}"
+
+
+class IngestState:
+    """업로드 완료된 행의 해시 기록 (배치마다 원자적으로 저장)"""
+
+    def __init__(self, path: str, collection: str, embedding: str):
+        self.path = path
+        self.collection = collection
+        self.embedding = embedding  # 모델:차원:축소방식 → 바뀌면 기존 벡터와 호환 안 됨
+        self.hashes: Dict[str, str] = {}
+        self.embedding_changed = False
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("collection") == collection:
+                previous = data.get("embedding", embedding_signature(None))
+                if previous == embedding:
+                    self.hashes = data.get("hashes", {})
+                elif data.get("hashes"):
+                    self.embedding_changed = True
+
+    def reset(self):
+        with self._lock:
+            self.hashes = {}
+            self._save_locked()
+
+    def mark_done(self, ids: List[str], hashes: List[str]):
+        with self._lock:
+            self.hashes.update(zip(ids, hashes))
+            self._save_locked()
+
+    def forget(self, ids: List[str]):
+        with self._lock:
+            for doc_id in ids:
+                self.hashes.pop(doc_id, None)
+            self._save_locked()
+
+    def _save_locked(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"collection": self.collection, "embedding": self.embedding, "hashes": self.hashes}, f)
+        os.replace(tmp_path, self.path)
+
+
+# ============================================
+# 임베딩 (재시도 + 속도 제한)
+# ============================================
+class BatchEmbedder:
+    def __init__(self, client: OpenAI, limiter: RateLimiter, max_retries: int,
+                 store: Optional[EmbeddingStore] = None):
+        self.client = client
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.store = store
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if self.store is not None:
+            return self.store.embed(texts, self._embed_remote)
+        return self._embed_remote(texts)
+
+    def _embed_remote(self, texts: List[str]) -> List[List[float]]:
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                res = self.client.embeddings.create(
+                    model=OpenAIEmbeddingWrapper.MODEL,
+                    input=texts,
+                    dimensions=OpenAIEmbeddingWrapper.DIMENSIONS
+                )
+                return [item.embedding for item in res.data]
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                # 지수 백오프 + jitter
+                wait = min(60.0, 2 ** attempt) + random.uniform(0, 1)
+                print(f"   ⚠️  OpenAI 에러 ({type(e).__name__}: {e}) → {wait:.1f}s 후 재시도 ({attempt + 1}/{self.max_retries})")
+                time.sleep(wait)
+
+
+def load_rows(csv_path: str) -> Tuple[List[str], List[str], List[Dict], List[str]]:
+    """CSV → (ids, documents, metadatas, hashes)"""
+    df = pd.read_csv(csv_path).fillna("")
+    columns = [c for c in META_COLS if c in df.columns]
+    rows = df.to_dict(orient="records")
+
+    documents = [build_doc(row) for row in rows]
+    metadatas = [build_metadata(row, columns) for row in rows]
+    ids = stable_ids(rows)
+    hashes = [content_hash(doc, meta) for doc, meta in zip(documents, metadatas)]
+    return ids, documents, metadatas, hashes
+
+
+def connect_collection(full_rebuild: bool):
+    client = chromadb.HttpClient(
+        host=settings.CHROMA_HOST,
+        port=settings.CHROMA_PORT,
+        settings=ChromaSettings(anonymized_telemetry=False)
+    )
+    if full_rebuild:
+        existing = [c.name for c in client.list_collections()]
+        if settings.CHROMA_COLLECTION in existing:
+            print(f"🗑 기존 컬렉션 '{settings.CHROMA_COLLECTION}' 삭제")
+            client.delete_collection(settings.CHROMA_COLLECTION)
+    return client.get_or_create_collection(settings.CHROMA_COLLECTION)
+
+
+def run(args) -> int:
+    print("=" * 70)
+    print("🔥 Kids Program RAG - 증분 인덱싱")
+    print("=" * 70)
+    print(f"📁 CSV: {args.csv}")
+    print(f"🔌 ChromaDB: {settings.CHROMA_HOST}:{settings.CHROMA_PORT}")
+    print(f"📚 컬렉션: {settings.CHROMA_COLLECTION}")
+    print(f"⚙️  batch={args.batch_size}, workers={args.workers}, rpm={args.rpm}, retries={args.max_retries}")
+    print("=" * 70)
+
+    if not os.path.exists(args.csv):
+        print(f"❌ CSV 파일 없음: {args.csv}")
+        return 1
+
+    # ---- 1. CSV → 문서/메타데이터/해시 ----
+    ids, documents, metadatas, hashes = load_rows(args.csv)
+    print(f"✅ {len(ids)}개 행 로드")
+
+    # ---- 2. 상태 비교 ----
+    projection = load_projection(
+        settings.EMBEDDING_REDUCTION,
+        OpenAIEmbeddingWrapper.DIMENSIONS,
+        settings.EMBEDDING_TARGET_DIMENSIONS,
+        settings.EMBEDDING_PROJECTION_PATH
+    )
+    signature = embedding_signature(projection)
+    print(f"📐 임베딩: {signature}")
+
+    state = IngestState(args.state, settings.CHROMA_COLLECTION, signature)
+    if state.embedding_changed and not args.full_rebuild:
+        print("❌ 임베딩 차원/축소 설정이 기존 컬렉션과 다릅니다 → --full-rebuild 로 다시 실행하세요")
+        return 1
+
+    collection = connect_collection(args.full_rebuild and not args.dry_run)
+    if args.full_rebuild and not args.dry_run:
+        state.reset()
+
+    current = dict(zip(ids, hashes))
+    stored_ids = set(collection.get(include=[])["ids"])
+
+    pending = [i for i, doc_id in enumerate(ids) if state.hashes.get(doc_id) != hashes[i] or doc_id not in stored_ids]
+    stale = sorted((stored_ids | set(state.hashes)) - set(current))
+
+    print(f"📊 변경/신규 {len(pending)}개, 삭제 {len(stale)}개, 그대로 {len(ids) - len(pending)}개")
+
+    if args.dry_run:
+        return 0
+
+    if not pending and not stale:
+        print("🎉 변경 사항 없음")
+        return 0
+
+    # ---- 3. 임베딩 + upsert (동시 실행) ----
+    store = None
+    if settings.EMBEDDING_STORE_DIR and not args.no_embedding_store:
+        store = EmbeddingStore(
+            directory=settings.EMBEDDING_STORE_DIR,
+            model=OpenAIEmbeddingWrapper.MODEL,
+            dimensions=OpenAIEmbeddingWrapper.DIMENSIONS,
+            dtype=settings.EMBEDDING_STORE_DTYPE
+        )
+        print(f"💾 임베딩 저장소: {settings.EMBEDDING_STORE_DIR} ({len(store)}개 보관 중)")
+    embedder = BatchEmbedder(
+        OpenAI(api_key=settings.OPENAI_API_KEY),
+        RateLimiter(args.rpm, burst=args.workers),
+        args.max_retries,
+        store=store
+    )
+    batches = [pending[s:s + args.batch_size] for s in range(0, len(pending), args.batch_size)]
+    done_rows = 0
+    failed: List[Tuple[int, str]] = []
+    started = time.perf_counter()
+
+    def process(batch: List[int]) -> int:
+        embeddings = embedder.embed([documents[i] for i in batch])
+        if projection is not None:
+            embeddings = projection.apply(embeddings).tolist()
+        batch_ids = [ids[i] for i in batch]
+        collection.upsert(
+            ids=batch_ids,
+            documents=[documents[i] for i in batch],
+            metadatas=[metadatas[i] for i in batch],
+            embeddings=embeddings
+        )
+        state.mark_done(batch_ids, [hashes[i] for i in batch])
+        return len(batch)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(process, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                done_rows += future.result()
+                elapsed = time.perf_counter() - started
+                print(f"   → {done_rows}/{len(pending)} ({done_rows / len(pending) * 100:.1f}%), "
+                      f"{done_rows / elapsed:.1f} rows/s")
+            except Exception as e:
+                failed.append((len(batch), f"{type(e).__name__}: {e}"))
+                print(f"   ❌ 배치 실패 ({len(batch)}개 행, 다음 실행 때 재시도): {e}")
+
+    elapsed = time.perf_counter() - started
+
+    # ---- 4. 사라진 행 삭제 (업로드가 모두 성공했을 때만 → 검색 공백 방지) ----
+    if stale and not failed:
+        for start in range(0, len(stale), 500):
+            chunk = stale[start:start + 500]
+            to_delete = [doc_id for doc_id in chunk if doc_id in stored_ids]
+            if to_delete:
+                collection.delete(ids=to_delete)
+            state.forget(chunk)
+        print(f"🗑 {len(stale)}개 삭제 완료")
+
+    # ---- 5. 결과 ----
+    print("\n" + "=" * 70)
+    print(f"✅ 업로드: {done_rows}개 행, {elapsed:.1f}s ({done_rows / max(elapsed, 1e-9):.1f} rows/s)")
+    print(f"📌 컬렉션 문서 수: {collection.count()}")
+    if store is not None:
+        store_stats = store.stats()
+        print(f"💾 임베딩 저장소: 재사용 {store_stats['hits']}개, 신규 {store_stats['writes']}개")
+    if failed:
+        print(f"❌ 실패: {sum(n for n, _ in failed)}개 행 ({len(failed)}개 배치) → 다시 실행하면 이어서 처리")
+        if stale:
+            print(f"   삭제 대상 {len(stale)}개는 실패가 없을 때 삭제됩니다")
+        print("=" * 70)
+        return 1
+    print("=" * 70)
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Kids Program RAG 증분 인덱싱")
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--state", default=STATE_PATH, help="체크포인트 파일")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4, help="동시 임베딩 배치 수")
+    parser.add_argument("--rpm", type=float, default=300, help="분당 임베딩 요청 수 제한")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--full-rebuild", action="store_true", help="컬렉션 삭제 후 전체 재생성")
+    parser.add_argument("--dry-run", action="store_true", help="변경 사항만 출력")
+    parser.add_argument("--no-embedding-store", action="store_true", help="저장된 임베딩을 쓰지 않고 모두 다시 임베딩")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(run(parse_args()))
@@ -1,8 +1,61 @@
+from contextlib import asynccontextmanager
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from config import settings
+from models.chat_models import warmup_llms
+from models.pca_embeddings import pca_embeddings
+from retrieval.backends import get_facility_table, get_lexical_searcher, get_vector_backend
 from routers import chat_router  # 수정
+from routers.chat import get_agent_executor
+from utils.concurrency import install_default_executor, run_blocking, shutdown_executor
+from utils.lifecycle import StartupStep, startup_state
+from utils.tracing import render_prometheus
 
-app = FastAPI(title="Kids Guide Chatbot API")
+def _connect_vector_backend():
+    if get_vector_backend() is None:
+        raise RuntimeError(f"벡터 백엔드 연결 실패 ({settings.VECTOR_BACKEND})")
+
+def _build_search_indexes():
+    # BM25 / 좌표 격자 / 시설 테이블 (실패해도 검색은 해당 기능 없이 동작)
+    get_facility_table()
+    get_lexical_searcher()
+
+async def _retry_startup(first_pass: asyncio.Task):
+    """첫 시작 작업이 끝난 뒤 실패한 필수 작업을 간격을 늘려가며 재시도 (ready가 될 때까지)"""
+    await first_pass
+    delay = settings.STARTUP_RETRY_INITIAL_SECONDS
+    while not startup_state.ready:
+        await asyncio.sleep(delay)
+        if await run_blocking(startup_state.retry_failed):
+            break
+        delay = min(delay * 2, settings.STARTUP_RETRY_MAX_SECONDS)
+
+def _startup_steps():
+    steps = [
+        StartupStep("vector_backend", _connect_vector_backend),
+        StartupStep("search_indexes", _build_search_indexes, required=False),
+        StartupStep("embeddings", lambda: pca_embeddings.embeddings),
+    ]
+    if settings.LLM_WARMUP:
+        steps.append(StartupStep("llm", warmup_llms))
+    steps.append(StartupStep("agent", get_agent_executor))
+    return steps
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 동기 도구(Chroma, requests, LLM invoke)는 공유 스레드 풀에서 실행
+    install_default_executor()
+    # 무거운 초기화는 백그라운드로 (포트는 바로 열고, 준비 여부는 /ready로 확인)
+    app.state.startup_task = asyncio.create_task(run_blocking(startup_state.run, _startup_steps()))
+    # 실패한 필수 작업(예: Chroma가 아직 안 뜸)은 ready가 될 때까지 재시도
+    app.state.startup_retry_task = asyncio.create_task(_retry_startup(app.state.startup_task))
+    yield
+    app.state.startup_retry_task.cancel()
+    shutdown_executor()
+
+app = FastAPI(title="Kids Guide Chatbot API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,4 +69,16 @@ app.include_router(chat_router, prefix="/api", tags=["chat"])
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    """liveness: 프로세스가 응답하면 항상 200"""
+    return {"status": "healthy"}
+
+@app.get("/ready")
+async def readiness_check():
+    """readiness: 시작 작업이 끝나고 필수 작업이 모두 성공해야 200"""
+    snapshot = startup_state.snapshot()
+    return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 지표 (구간별 지연 시간, LLM 토큰 수, 캐시 hit/miss, 각종 stats)"""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
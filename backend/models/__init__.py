@@ -6,7 +6,7 @@ Models 패키지
 """
 
 from .schemas import ChatRequest, ChatResponse, MapData, MarkerData
-from .chat_models import get_llm
+from .chat_models import get_llm, warmup_llms, get_llm_metrics
 from .pca_embeddings import pca_embeddings
 
 __all__ = [
@@ -15,5 +15,7 @@ __all__ = [
     "MapData",
     "MarkerData",
     "get_llm",
+    "warmup_llms",
+    "get_llm_metrics",
     "pca_embeddings"
 ]
\ No newline at end of file
@@ -1,12 +1,99 @@
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_openai import ChatOpenAI
-from langchain_community.llms import HuggingFacePipeline
-from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline, BitsAndBytesConfig
-import torch
+from typing import Any, Dict, Iterable
+import bisect
+import logging
+import threading
+import time
 from config import settings
 
-def get_llm():
-    """GPU 여부에 따라 LLM 반환"""
-    if settings.USE_GPU and torch.cuda.is_available():
+logger = logging.getLogger(__name__)
+
+# 지연 시간 히스토그램 버킷 (초)
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LLMMetrics:
+    """모델별 호출 수 / 에러 수 / 지연 시간 히스토그램"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)  # 마지막은 +Inf
+    
+    def observe(self, seconds: float, error: bool = False):
+        with self._lock:
+            self.calls += 1
+            self.errors += int(error)
+            self.latency_sum += seconds
+            self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    
+    def snapshot(self) -> Dict:
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for bound, count in zip(list(LATENCY_BUCKETS) + ["+Inf"], self.bucket_counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "latency_sum": self.latency_sum,
+                "latency_avg": self.latency_sum / self.calls if self.calls else 0.0,
+                "latency_buckets": buckets,
+            }
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """LLM 호출 시작/종료 시각으로 지연 시간 측정"""
+    
+    def __init__(self, metrics: LLMMetrics):
+        self.metrics = metrics
+        self._started: Dict[Any, float] = {}
+    
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+    
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+    
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            self.metrics.observe(time.perf_counter() - started)
+    
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            self.metrics.observe(time.perf_counter() - started, error=True)
+
+
+# 프로세스 전역 LLM 레지스트리 (모델은 이름별로 한 번만 생성)
+_registry: Dict[str, Any] = {}
+_metrics: Dict[str, LLMMetrics] = {}
+_registry_lock = threading.Lock()
+
+
+def _use_gpu() -> bool:
+    """USE_GPU=false면 torch를 import하지 않음 (CPU 환경 기동 시간 단축)"""
+    if settings.USE_GPU is False:
+        return False
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+def _build_llm(callbacks: list):
+    """GPU 여부에 따라 LLM 생성"""
+    if _use_gpu():
+        # GPU 모드에서만 필요한 무거운 라이브러리
+        import torch
+        from langchain_community.llms import HuggingFacePipeline
+        from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline, BitsAndBytesConfig
+        
         print("="*70)
         print("🚀 Qwen 2.5 7B 모델 로딩 중...")
         print("="*70)
@@ -47,12 +134,46 @@ def get_llm():
         print("✅ 파이프라인 준비 완료!")
         print("="*70)
         
-        return HuggingFacePipeline(pipeline=pipe)
+        return HuggingFacePipeline(pipeline=pipe, callbacks=callbacks)
     
     else:
         print("⚠️  CPU 모드: OpenAI API 사용")
         return ChatOpenAI(
             model="gpt-4o-mini",
             temperature=0.7,
-            openai_api_key=settings.OPENAI_API_KEY
-        )
\ No newline at end of file
+            openai_api_key=settings.OPENAI_API_KEY,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_retries=settings.LLM_MAX_RETRIES,
+            callbacks=callbacks
+        )
+
+
+def get_llm(name: str = "default"):
+    """
+    GPU 여부에 따라 LLM 반환 (프로세스당 한 번만 생성해서 재사용)
+    
+    ChatOpenAI는 인스턴스마다 HTTP 커넥션 풀을 가지므로, 재사용하면 커넥션도 재사용됩니다.
+    """
+    llm = _registry.get(name)
+    if llm is not None:
+        return llm
+    
+    with _registry_lock:
+        if name not in _registry:
+            metrics = _metrics.setdefault(name, LLMMetrics())
+            _registry[name] = _build_llm(callbacks=[LLMMetricsCallback(metrics)])
+            logger.info(f"LLM 생성: {name}")
+        return _registry[name]
+
+
+def warmup_llms(names: Iterable[str] = ("default",)):
+    """서버 시작 시 모델 미리 생성 (첫 요청에서 로딩 시간 제거)"""
+    for name in names:
+        start = time.perf_counter()
+        get_llm(name)
+        logger.info(f"LLM 워밍업 완료: {name} ({time.perf_counter() - start:.2f}s)")
+
+
+def get_llm_metrics() -> Dict[str, Dict]:
+    """모델별 호출 수 / 지연 시간 히스토그램"""
+    return {name: metrics.snapshot() for name, metrics in _metrics.items()}
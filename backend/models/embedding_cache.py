@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import hashlib
+import logging
+import os
+import re
+import threading
+import unicodedata
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCT = re.compile(r"[\s?!.~,]+$")
+
+def normalize_query(text: str) -> str:
+    """
+    캐시 키용 쿼리 정규화
+    - 유니코드 NFKC (전각/반각, 자모 조합 통일)
+    - 소문자, 공백 정리, 끝의 문장부호 제거
+    예: "  서울  실내 놀이터?? " → "서울 실내 놀이터"
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _TRAILING_PUNCT.sub("", text)
+
+
+class QueryEmbeddingCache:
+    """
+    쿼리 임베딩 캐시
+    - 메모리: LRU (max_entries)
+    - 디스크 (선택): disk_dir/<sha256>.npy, float16/float32로 압축 저장
+    키는 (모델, 차원, 정규화된 쿼리)
+    """
+    
+    def __init__(
+        self,
+        model: str,
+        dimensions: int,
+        max_entries: int = 2048,
+        disk_dir: Optional[str] = None,
+        disk_dtype: str = "float16"
+    ):
+        self.model = model
+        self.dimensions = dimensions
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_dtype = np.dtype(disk_dtype)
+        
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            logger.info(f"쿼리 임베딩 디스크 캐시: {disk_dir} ({self.disk_dtype})")
+    
+    def _key(self, text: str) -> str:
+        raw = f"{self.model}:{self.dimensions}:{normalize_query(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.npy")
+    
+    def _remember(self, key: str, embedding: List[float]):
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+    
+    def get(self, text: str) -> Optional[List[float]]:
+        """캐시된 임베딩 반환 (없으면 None)"""
+        key = self._key(text)
+        
+        with self._lock:
+            embedding = self._memory.get(key)
+            if embedding is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return embedding
+        
+        if self.disk_dir:
+            try:
+                vector = np.load(self._disk_path(key))
+                embedding = vector.astype(np.float32).tolist()
+                with self._lock:
+                    self._remember(key, embedding)
+                    self._stats["disk_hits"] += 1
+                return embedding
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"디스크 캐시 읽기 실패 ({key[:12]}): {e}")
+        
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+    
+    def put(self, text: str, embedding: List[float]):
+        """임베딩 저장 (메모리 + 디스크)"""
+        key = self._key(text)
+        
+        with self._lock:
+            self._remember(key, embedding)
+        
+        if self.disk_dir:
+            try:
+                # 임시 파일에 쓰고 rename → 다른 워커가 반쯤 쓴 파일을 읽지 않음
+                path = self._disk_path(key)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    np.save(f, np.asarray(embedding, dtype=self.disk_dtype))
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.warning(f"디스크 캐시 쓰기 실패 ({key[:12]}): {e}")
+    
+    def stats(self) -> Dict:
+        """hit/miss 지표"""
+        with self._lock:
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            total = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._memory),
+                "hit_rate": hits / total if total else 0.0,
+            }
@@ -0,0 +1,141 @@
+from typing import Optional
+import hashlib
+import logging
+import os
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+REDUCTION_METHODS = ("none", "truncate", "pca")
+
+
+class EmbeddingProjection:
+    """
+    임베딩 차원 축소 (문서와 쿼리에 똑같이 적용)
+    - truncate: 앞쪽 N차원만 사용 (text-embedding-3의 Matryoshka 특성, API의 dimensions 파라미터와 동일)
+    - pca: 코퍼스로 학습한 평균/주성분 행렬로 투영 (.npz로 저장)
+    결과는 항상 L2 정규화된 float32
+    """
+    
+    def __init__(
+        self,
+        method: str,
+        source_dimensions: int,
+        target_dimensions: int,
+        mean: Optional[np.ndarray] = None,
+        components: Optional[np.ndarray] = None,
+        explained_variance: float = 0.0
+    ):
+        if method not in ("truncate", "pca"):
+            raise ValueError(f"알 수 없는 차원 축소 방식: {method}")
+        if not 0 < target_dimensions <= source_dimensions:
+            raise ValueError(f"목표 차원 {target_dimensions}은 1~{source_dimensions} 사이여야 합니다")
+        if method == "pca" and (mean is None or components is None):
+            raise ValueError("pca에는 mean/components가 필요합니다")
+        
+        self.method = method
+        self.source_dimensions = source_dimensions
+        self.target_dimensions = target_dimensions
+        self.mean = mean
+        self.components = components  # (source, target)
+        self.explained_variance = explained_variance
+    
+    @property
+    def signature(self) -> str:
+        """
+        인덱스 호환성 확인용 (예: truncate512, pca512-1a2b3c4d)
+        pca는 같은 차원으로 다시 학습해도 공간이 달라지므로 평균/주성분 해시를 붙임
+        """
+        if self.method != "pca":
+            return f"{self.method}{self.target_dimensions}"
+        digest = hashlib.sha1()
+        digest.update(np.ascontiguousarray(self.mean, dtype=np.float32).tobytes())
+        digest.update(np.ascontiguousarray(self.components, dtype=np.float32).tobytes())
+        return f"{self.method}{self.target_dimensions}-{digest.hexdigest()[:8]}"
+    
+    @classmethod
+    def fit_pca(cls, vectors: np.ndarray, target_dimensions: int) -> "EmbeddingProjection":
+        """
+        코퍼스 벡터로 PCA 학습
+        공분산(D×D) 고유분해라서 문서 수와 무관하게 3072차원 기준 수 초 안에 끝남
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        mean = vectors.mean(axis=0)
+        centered = vectors - mean
+        covariance = (centered.T @ centered) / max(1, len(vectors) - 1)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance.astype(np.float64))
+        
+        order = np.argsort(eigenvalues)[::-1][:target_dimensions]
+        components = eigenvectors[:, order].astype(np.float32)
+        explained = float(eigenvalues[order].sum() / max(eigenvalues.sum(), 1e-12))
+        
+        logger.info(f"✅ PCA 학습: {vectors.shape[1]} → {target_dimensions}차원, 설명 분산 {explained:.3f}")
+        return cls("pca", vectors.shape[1], target_dimensions, mean, components, explained)
+    
+    def apply(self, vectors) -> np.ndarray:
+        """(N, source) 또는 (source,) → 정규화된 (N, target) 또는 (target,)"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.shape[-1] != self.source_dimensions:
+            raise ValueError(f"입력 차원 {vectors.shape[-1]} != {self.source_dimensions}")
+        
+        if self.method == "truncate":
+            reduced = vectors[..., :self.target_dimensions]
+        else:
+            reduced = (vectors - self.mean) @ self.components
+        
+        norms = np.linalg.norm(reduced, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (reduced / norms).astype(np.float32)
+    
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            method=self.method,
+            source_dimensions=self.source_dimensions,
+            target_dimensions=self.target_dimensions,
+            mean=self.mean if self.mean is not None else np.zeros(0, dtype=np.float32),
+            components=self.components if self.components is not None else np.zeros((0, 0), dtype=np.float32),
+            explained_variance=self.explained_variance
+        )
+        os.replace(tmp_path, path)
+        logger.info(f"✅ 투영 행렬 저장: {path} ({self.signature})")
+    
+    @classmethod
+    def load(cls, path: str) -> "EmbeddingProjection":
+        with np.load(path) as data:
+            method = str(data["method"])
+            return cls(
+                method,
+                int(data["source_dimensions"]),
+                int(data["target_dimensions"]),
+                mean=data["mean"] if method == "pca" else None,
+                components=data["components"] if method == "pca" else None,
+                explained_variance=float(data["explained_variance"])
+            )
+
+
+def load_projection(method: str, source_dimensions: int, target_dimensions: int, path: str) -> Optional[EmbeddingProjection]:
+    """
+    설정에 맞는 투영 반환 (none이면 None)
+    pca는 fit_projection.py로 만든 파일이 있어야 함
+    """
+    if method not in REDUCTION_METHODS:
+        raise ValueError(f"알 수 없는 EMBEDDING_REDUCTION: {method} (가능: {', '.join(REDUCTION_METHODS)})")
+    if method == "none":
+        return None
+    if method == "truncate":
+        return EmbeddingProjection("truncate", source_dimensions, target_dimensions)
+    
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"PCA 투영 파일 없음: {path} (python fit_projection.py 로 먼저 생성)")
+    projection = EmbeddingProjection.load(path)
+    if projection.source_dimensions != source_dimensions or projection.target_dimensions != target_dimensions:
+        raise ValueError(
+            f"투영 파일 차원 불일치: {projection.source_dimensions}→{projection.target_dimensions}, "
+            f"설정 {source_dimensions}→{target_dimensions} (fit_projection.py 재실행 필요)"
+        )
+    return projection
@@ -0,0 +1,161 @@
+from typing import Callable, Dict, List, Optional, Sequence
+import hashlib
+import logging
+import os
+import re
+import struct
+import threading
+import numpy as np
+
+try:
+    import fcntl  # 여러 워커 프로세스가 같은 저장소에 append할 때 파일 락
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_DIGEST_SIZE = 32
+_RECORD = struct.Struct(f"<{_DIGEST_SIZE}sQ")  # (sha256, row)
+
+
+class EmbeddingStore:
+    """
+    문서 임베딩 content-addressed 저장소
+    키: (모델, 차원, sha256(문서 텍스트))
+    
+    파일 (모델/차원/dtype별 한 쌍):
+    - <name>.vec: 행렬 (float16/float32 raw, append-only, memory-map으로 읽음)
+    - <name>.idx: (sha256 32바이트, 행 번호 8바이트) 레코드 목록
+    벡터를 먼저 쓰고 인덱스를 나중에 쓰므로 중간에 죽어도 인덱스가 없는 행을 가리키지 않음
+    """
+    
+    def __init__(self, directory: str, model: str, dimensions: int, dtype: str = "float16"):
+        self.model = model
+        self.dimensions = dimensions
+        self.dtype = np.dtype(dtype)
+        
+        os.makedirs(directory, exist_ok=True)
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{model}-{dimensions}-{self.dtype.name}")
+        self.vec_path = os.path.join(directory, f"{name}.vec")
+        self.idx_path = os.path.join(directory, f"{name}.idx")
+        self.lock_path = os.path.join(directory, f"{name}.lock")
+        
+        self._row_bytes = self.dimensions * self.dtype.itemsize
+        self._index: Dict[bytes, int] = {}
+        self._idx_offset = 0
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0}
+        
+        for path in (self.vec_path, self.idx_path):
+            if not os.path.exists(path):
+                open(path, "ab").close()
+        
+        with self._lock:
+            self._refresh_index()
+        logger.info(f"문서 임베딩 저장소: {self.vec_path} ({len(self._index)}개)")
+    
+    @staticmethod
+    def digest(text: str) -> bytes:
+        return hashlib.sha256(text.encode("utf-8")).digest()
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    def _refresh_index(self):
+        """다른 프로세스가 추가한 레코드까지 읽기 (마지막으로 읽은 위치부터)"""
+        with open(self.idx_path, "rb") as f:
+            f.seek(self._idx_offset)
+            data = f.read()
+        usable = len(data) - len(data) % _RECORD.size
+        for offset in range(0, usable, _RECORD.size):
+            digest, row = _RECORD.unpack_from(data, offset)
+            self._index[digest] = row
+        self._idx_offset += usable
+    
+    def _row(self, row: int) -> np.ndarray:
+        if self._matrix is None or row >= self._matrix.shape[0]:
+            rows = os.path.getsize(self.vec_path) // self._row_bytes
+            self._matrix = np.memmap(self.vec_path, dtype=self.dtype, mode="r", shape=(rows, self.dimensions))
+        return self._matrix[row]
+    
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """저장된 벡터 (float32), 없으면 None"""
+        digests = [self.digest(t) for t in texts]
+        with self._lock:
+            if any(d not in self._index for d in digests):
+                self._refresh_index()
+            results = []
+            for d in digests:
+                row = self._index.get(d)
+                if row is None:
+                    self._stats["misses"] += 1
+                    results.append(None)
+                else:
+                    self._stats["hits"] += 1
+                    results.append(np.asarray(self._row(row), dtype=np.float32))
+            return results
+    
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        """벡터 추가 (이미 있는 텍스트는 건너뜀)"""
+        matrix = np.asarray(vectors, dtype=self.dtype)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dimensions:
+            raise ValueError(f"차원 불일치: {matrix.shape}, 기대값 (*, {self.dimensions})")
+        
+        with self._lock, open(self.lock_path, "ab") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh_index()
+                new = [(self.digest(t), matrix[i]) for i, t in enumerate(texts)]
+                new = [(d, v) for d, v in dict(new).items() if d not in self._index]
+                if not new:
+                    return
+                
+                with open(self.vec_path, "ab") as vec_file:
+                    first_row = os.fstat(vec_file.fileno()).st_size // self._row_bytes
+                    # 이전에 잘린 쓰기가 있으면 행 경계에 맞춤
+                    vec_file.truncate(first_row * self._row_bytes)
+                    vec_file.seek(first_row * self._row_bytes)
+                    vec_file.write(np.stack([v for _, v in new]).tobytes())
+                    vec_file.flush()
+                    os.fsync(vec_file.fileno())
+                
+                with open(self.idx_path, "ab") as idx_file:
+                    idx_file.write(b"".join(
+                        _RECORD.pack(d, first_row + i) for i, (d, _) in enumerate(new)
+                    ))
+                
+                self._refresh_index()
+                self._stats["writes"] += len(new)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def embed(self, texts: Sequence[str], embed_fn: Callable[[List[str]], List[List[float]]]) -> List[List[float]]:
+        """
+        저장소에 있는 것은 재사용하고 없는 것만 embed_fn으로 한 번에 임베딩
+        
+        Args:
+            texts: 문서 텍스트
+            embed_fn: 미스 난 텍스트 리스트 → 임베딩 리스트 (API 호출)
+        """
+        cached = self.get_many(texts)
+        missing = [i for i, v in enumerate(cached) if v is None]
+        
+        if missing:
+            fresh = embed_fn([texts[i] for i in missing])
+            self.put_many([texts[i] for i in missing], fresh)
+            for i, vector in zip(missing, fresh):
+                cached[i] = vector
+        
+        return [list(map(float, v)) if isinstance(v, np.ndarray) else list(v) for v in cached]
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._index),
+                "file_bytes": os.path.getsize(self.vec_path),
+                "dtype": self.dtype.name,
+            }
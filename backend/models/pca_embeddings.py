@@ -1,24 +1,109 @@
 from langchain_openai import OpenAIEmbeddings
 from config import settings
+from models.embedding_cache import QueryEmbeddingCache
+from models.embedding_store import EmbeddingStore
+from models.embedding_projection import load_projection
+from utils.resilience import guarded_call
+from utils.tracing import record_cache, span
+from typing import Dict
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
 class OpenAIEmbeddingWrapper:
     """OpenAI text-embedding-3-large 모델을 사용하는 임베딩 래퍼"""
     
+    MODEL = "text-embedding-3-large"
+    DIMENSIONS = 3072  # text-embedding-3-large의 기본 차원
+    
     def __init__(self):
-        """OpenAI Embeddings 초기화"""
-        try:
-            self.embeddings = OpenAIEmbeddings(
-                model="text-embedding-3-large",
-                openai_api_key=settings.OPENAI_API_KEY,
-                dimensions=3072  # text-embedding-3-large의 기본 차원
+        """설정만 읽음 (OpenAI 클라이언트는 첫 임베딩 호출 또는 시작 작업에서 생성)"""
+        self._embeddings = None
+        self._embeddings_lock = threading.Lock()
+        
+        # 반복 쿼리는 원격 호출 없이 캐시에서 반환
+        self.query_cache = None
+        if settings.EMBEDDING_CACHE_SIZE > 0:
+            self.query_cache = QueryEmbeddingCache(
+                model=self.MODEL,
+                dimensions=self.DIMENSIONS,
+                max_entries=settings.EMBEDDING_CACHE_SIZE,
+                disk_dir=settings.EMBEDDING_CACHE_DIR,
+                disk_dtype=settings.EMBEDDING_CACHE_DTYPE
             )
-            logger.info("✅ OpenAI Embeddings 초기화 성공 (text-embedding-3-large)")
-        except Exception as e:
-            logger.error(f"❌ OpenAI Embeddings 초기화 실패: {e}")
-            raise
+        
+        # 차원 축소 (캐시/저장소에는 원본 3072차원을 두고 반환 직전에 투영 → 재학습해도 재임베딩 불필요)
+        # 첫 임베딩 때 로드 (fit_projection.py가 이 모듈을 import할 때는 아직 파일이 없음)
+        self._projection = None
+        self._projection_loaded = False
+        
+        # 문서 임베딩 저장소는 embed_documents를 처음 호출할 때 연다 (서버 기동 시 디스크 접근 없음)
+        self._document_store = None
+    
+    @property
+    def embeddings(self):
+        """OpenAI Embeddings 클라이언트 (처음 접근할 때 생성)"""
+        if self._embeddings is None:
+            with self._embeddings_lock:
+                if self._embeddings is None:
+                    try:
+                        self._embeddings = OpenAIEmbeddings(
+                            model=self.MODEL,
+                            openai_api_key=settings.OPENAI_API_KEY,
+                            dimensions=self.DIMENSIONS,
+                            request_timeout=settings.EMBEDDING_TIMEOUT_SECONDS,
+                            max_retries=settings.EMBEDDING_MAX_RETRIES
+                        )
+                        logger.info("✅ OpenAI Embeddings 초기화 성공 (text-embedding-3-large)")
+                    except Exception as e:
+                        logger.error(f"❌ OpenAI Embeddings 초기화 실패: {e}")
+                        raise
+        return self._embeddings
+    
+    @embeddings.setter
+    def embeddings(self, client):
+        """임베딩 클라이언트 교체 (벤치마크용 가짜 클라이언트 등)"""
+        self._embeddings = client
+    
+    @property
+    def document_store(self):
+        """(모델, 차원, sha256) 키의 문서 임베딩 저장소, 설정이 없으면 None"""
+        if self._document_store is None and settings.EMBEDDING_STORE_DIR:
+            self._document_store = EmbeddingStore(
+                directory=settings.EMBEDDING_STORE_DIR,
+                model=self.MODEL,
+                dimensions=self.DIMENSIONS,
+                dtype=settings.EMBEDDING_STORE_DTYPE
+            )
+        return self._document_store
+    
+    @property
+    def projection(self):
+        """설정(EMBEDDING_REDUCTION)에 맞는 차원 축소, 없으면 None"""
+        if not self._projection_loaded:
+            self._projection = load_projection(
+                settings.EMBEDDING_REDUCTION,
+                self.DIMENSIONS,
+                settings.EMBEDDING_TARGET_DIMENSIONS,
+                settings.EMBEDDING_PROJECTION_PATH
+            )
+            self._projection_loaded = True
+            if self._projection is not None:
+                logger.info(f"✅ 임베딩 차원 축소: {self.DIMENSIONS} → {self._projection.target_dimensions} ({self._projection.method})")
+        return self._projection
+    
+    @property
+    def output_dimensions(self) -> int:
+        """embed_query/embed_documents가 반환하는 차원"""
+        return self.projection.target_dimensions if self.projection is not None else self.DIMENSIONS
+    
+    def project(self, embeddings):
+        """원본 임베딩(1개 또는 리스트)에 차원 축소 적용"""
+        projection = self.projection
+        if projection is None:
+            return embeddings
+        return projection.apply(embeddings).tolist()
     
     def embed_query(self, text: str) -> list[float]:
         """
@@ -28,12 +113,27 @@ class OpenAIEmbeddingWrapper:
             text: 임베딩할 텍스트
             
         Returns:
-            임베딩 벡터 (3072차원)
+            임베딩 벡터 (3072차원, 차원 축소 설정 시 EMBEDDING_TARGET_DIMENSIONS)
         """
+        if self.query_cache is not None:
+            cached = self.query_cache.get(text)
+            record_cache("query_embedding", cached is not None)
+            if cached is not None:
+                logger.info(f"✅ 쿼리 임베딩 캐시 hit: {len(cached)}차원")
+                return self.project(cached)
+        
         try:
-            embedding = self.embeddings.embed_query(text)
+            # 전체 제한 시간 + 서킷 브레이커, 설정 시 느린 요청은 hedging
+            with span("openai.embed_query", kind="embedding", model=self.MODEL):
+                embedding = guarded_call(
+                    "openai_embeddings", self.embeddings.embed_query, text,
+                    timeout=settings.EMBEDDING_TIMEOUT_SECONDS,
+                    hedge_after=settings.EMBEDDING_HEDGE_AFTER_SECONDS
+                )
             logger.info(f"✅ 쿼리 임베딩 생성 완료: {len(embedding)}차원")
-            return embedding
+            if self.query_cache is not None:
+                self.query_cache.put(text, embedding)
+            return self.project(embedding)
         except Exception as e:
             logger.error(f"❌ 쿼리 임베딩 생성 실패: {e}")
             raise
@@ -49,13 +149,25 @@ class OpenAIEmbeddingWrapper:
             임베딩 벡터 리스트
         """
         try:
-            embeddings = self.embeddings.embed_documents(texts)
+            store = self.document_store
+            if store is not None:
+                # 이미 임베딩한 텍스트는 저장소에서 읽고 나머지만 API 호출
+                embeddings = store.embed(texts, self.embeddings.embed_documents)
+            else:
+                embeddings = self.embeddings.embed_documents(texts)
             logger.info(f"✅ 문서 임베딩 생성 완료: {len(embeddings)}개, 각 {len(embeddings[0])}차원")
-            return embeddings
+            return self.project(embeddings)
         except Exception as e:
             logger.error(f"❌ 문서 임베딩 생성 실패: {e}")
             raise
 
+    
+    def cache_stats(self) -> Dict:
+        """쿼리 임베딩 캐시 hit/miss 지표"""
+        if self.query_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.query_cache.stats()}
+
 
 # 전역 인스턴스 생성 (기존 pca_embeddings와 호환성 유지)
 pca_embeddings = OpenAIEmbeddingWrapper()
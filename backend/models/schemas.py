@@ -5,6 +5,9 @@ class ChatRequest(BaseModel):
     message: str = Field(..., description="사용자 메시지")
     conversation_id: Optional[str] = Field(None, description="대화 ID (없으면 서버가 생성)")  # Optional로 변경
     child_age: Optional[int] = Field(None, description="아이 나이 (선택)")
+    latitude: Optional[float] = Field(None, ge=-90, le=90, description="사용자 위도 (선택, 가까운 시설 우선)")
+    longitude: Optional[float] = Field(None, ge=-180, le=180, description="사용자 경도 (선택)")
+    trace: bool = Field(False, description="응답에 요청 trace(JSON) 포함 여부")
 
 class MarkerData(BaseModel):
     name: str
@@ -22,4 +25,5 @@ class ChatResponse(BaseModel):
     type: str = Field(default="text", description="응답 타입 (text/map)")
     link: Optional[str] = Field(None, description="카카오맵 링크")
     data: Optional[MapData] = Field(None, description="지도 데이터")
-    conversation_id: str = Field(..., description="대화 ID")  # 항상 반환
\ No newline at end of file
+    conversation_id: str = Field(..., description="대화 ID")  # 항상 반환
+    trace: Optional[Dict[str, Any]] = Field(None, description="요청 trace (요청에 trace=true일 때)")
\ No newline at end of file
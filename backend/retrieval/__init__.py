@@ -0,0 +1,30 @@
+"""
+Retrieval 패키지
+- 벡터 검색 백엔드 (ChromaDB / 로컬 인덱스)
+- 메타데이터 필터
+- BM25 역색인 (하이브리드 검색)
+- 좌표 격자 인덱스 (반경/근접 검색)
+- 시설 응답 테이블 (문서 ID → 미리 검증/렌더링된 응답)
+"""
+
+from .backends import get_facility_table, get_geo_index, get_lexical_searcher, get_vector_backend
+from .facility_table import FacilityRecord, FacilityTable
+from .filters import SearchFilters
+from .geo_index import GeoIndex, haversine_km
+from .lexical_index import LexicalIndex, reciprocal_rank_fusion
+from .local_index import LocalVectorIndex
+
+__all__ = [
+    "get_vector_backend",
+    "get_lexical_searcher",
+    "get_geo_index",
+    "get_facility_table",
+    "FacilityRecord",
+    "FacilityTable",
+    "SearchFilters",
+    "GeoIndex",
+    "haversine_km",
+    "LexicalIndex",
+    "reciprocal_rank_fusion",
+    "LocalVectorIndex"
+]
@@ -0,0 +1,322 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+import threading
+import time
+from config import settings
+from retrieval.facility_table import FacilityTable
+from retrieval.filters import MetadataInvertedIndex, SearchFilters
+from retrieval.geo_index import GeoIndex
+from retrieval.lexical_index import LexicalSearcher
+from retrieval.local_index import LocalVectorIndex
+from utils.resilience import guarded_call
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class VectorBackend(ABC):
+    """search_facilities가 사용하는 벡터 검색 백엔드"""
+    
+    name = "base"
+    
+    @abstractmethod
+    def query(
+        self,
+        query_embedding: List[float],
+        k: int,
+        filters: Optional[SearchFilters] = None
+    ) -> Dict[str, List]:
+        """
+        top-k 검색
+        
+        Args:
+            query_embedding: 쿼리 벡터
+            k: 반환 개수
+            filters: 메타데이터 필터 (지역, 실내/실외, 나이), 후보를 먼저 좁힌 뒤 검색
+        
+        Returns:
+            {"ids": [...], "documents": [...], "metadatas": [...], "distances": [...]}
+            (distance 오름차순, Chroma 결과의 첫 번째 쿼리 부분과 같은 모양)
+        """
+    
+    def query_ids(
+        self,
+        query_embedding: List[float],
+        k: int,
+        filters: Optional[SearchFilters] = None
+    ) -> Dict[str, List]:
+        """
+        top-k 검색 (ID + distance만, 응답 내용은 FacilityTable에서 조인)
+        
+        Returns:
+            {"ids": [...], "distances": [...]}
+        """
+        results = self.query(query_embedding, k, filters)
+        return {"ids": results["ids"], "distances": results["distances"]}
+    
+    @abstractmethod
+    def count(self) -> int:
+        """저장된 문서 수"""
+    
+    @abstractmethod
+    def all_documents(self) -> Dict[str, List]:
+        """전체 {"ids", "documents", "metadatas"} (BM25 색인/시설 테이블 생성용)"""
+    
+    @abstractmethod
+    def get_documents(self, ids: List[str]) -> Dict[str, List]:
+        """지정한 ID의 {"ids", "documents", "metadatas"} (없는 ID는 빠짐)"""
+
+
+class ChromaBackend(VectorBackend):
+    """ChromaDB HttpClient (별도 컨테이너)"""
+    
+    name = "chroma"
+    
+    def __init__(self):
+        # VECTOR_BACKEND=local이면 chromadb를 import하지 않음
+        import chromadb
+        from chromadb.config import Settings as ChromaSettings
+        
+        client = chromadb.HttpClient(
+            host=settings.CHROMA_HOST,
+            port=settings.CHROMA_PORT,
+            settings=ChromaSettings(
+                anonymized_telemetry=False
+            )
+        )
+        self.collection = client.get_collection(name=settings.CHROMA_COLLECTION)
+        logger.info(f"✅ ChromaDB 연결 성공: {self.collection.name} ({settings.CHROMA_HOST}:{settings.CHROMA_PORT})")
+    
+    def _query(self, query_embedding: List[float], k: int, filters: Optional[SearchFilters], include: List[str]):
+        """요청 타임아웃이 없는 HttpClient 대신 전체 제한 시간 + 서킷 브레이커 적용"""
+        return guarded_call(
+            "chroma",
+            self.collection.query,
+            query_embeddings=[query_embedding],
+            n_results=k,
+            where=filters.to_chroma_where() if filters else None,
+            include=include,
+            timeout=settings.VECTOR_TIMEOUT_SECONDS
+        )
+    
+    def query(
+        self,
+        query_embedding: List[float],
+        k: int,
+        filters: Optional[SearchFilters] = None
+    ) -> Dict[str, List]:
+        results = self._query(query_embedding, k, filters, ["metadatas", "documents", "distances"])
+        if not results or not results["ids"]:
+            return {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        return {
+            "ids": results["ids"][0],
+            "documents": results["documents"][0],
+            "metadatas": results["metadatas"][0],
+            "distances": results["distances"][0],
+        }
+    
+    def query_ids(
+        self,
+        query_embedding: List[float],
+        k: int,
+        filters: Optional[SearchFilters] = None
+    ) -> Dict[str, List]:
+        # 문서/메타데이터를 받지 않으므로 응답 크기와 역직렬화 비용이 줄어듦
+        results = self._query(query_embedding, k, filters, ["distances"])
+        if not results or not results["ids"]:
+            return {"ids": [], "distances": []}
+        return {"ids": results["ids"][0], "distances": results["distances"][0]}
+    
+    def count(self) -> int:
+        return self.collection.count()
+    
+    def get_documents(self, ids: List[str]) -> Dict[str, List]:
+        page = self.collection.get(ids=ids, include=["documents", "metadatas"])
+        return {"ids": page["ids"], "documents": page["documents"], "metadatas": page["metadatas"]}
+    
+    def all_documents(self, page_size: int = 1000) -> Dict[str, List]:
+        merged = {"ids": [], "documents": [], "metadatas": []}
+        total = self.collection.count()
+        for offset in range(0, total, page_size):
+            page = self.collection.get(limit=page_size, offset=offset, include=["documents", "metadatas"])
+            for key in merged:
+                merged[key].extend(page[key])
+        return merged
+
+
+def create_metadata_index(metadatas: List[Dict]) -> MetadataInvertedIndex:
+    """설정한 격자 크기(GEO_CELL_DEGREES)의 좌표 인덱스를 포함한 메타데이터 역색인"""
+    return MetadataInvertedIndex(metadatas, geo=GeoIndex(metadatas, cell_degrees=settings.GEO_CELL_DEGREES))
+
+
+class LocalBackend(VectorBackend):
+    """프로세스 내 인덱스 (export_local_index.py로 생성)"""
+    
+    name = "local"
+    
+    def __init__(self):
+        self.index = LocalVectorIndex.load(settings.LOCAL_INDEX_PATH, ann=settings.LOCAL_INDEX_ANN)
+        self.metadata_index = create_metadata_index(self.index.metadatas)
+    
+    def query(
+        self,
+        query_embedding: List[float],
+        k: int,
+        filters: Optional[SearchFilters] = None
+    ) -> Dict[str, List]:
+        candidate_rows = self.metadata_index.candidate_rows(filters)
+        hits = self.index.search(query_embedding, k, candidate_rows=candidate_rows)
+        return {
+            "ids": [self.index.ids[row] for row, _ in hits],
+            "documents": [self.index.documents[row] for row, _ in hits],
+            "metadatas": [self.index.metadatas[row] for row, _ in hits],
+            "distances": [distance for _, distance in hits],
+        }
+    
+    def count(self) -> int:
+        return len(self.index)
+    
+    def query_ids(
+        self,
+        query_embedding: List[float],
+        k: int,
+        filters: Optional[SearchFilters] = None
+    ) -> Dict[str, List]:
+        candidate_rows = self.metadata_index.candidate_rows(filters)
+        hits = self.index.search(query_embedding, k, candidate_rows=candidate_rows)
+        return {
+            "ids": [self.index.ids[row] for row, _ in hits],
+            "distances": [distance for _, distance in hits],
+        }
+    
+    def all_documents(self) -> Dict[str, List]:
+        return {"ids": self.index.ids, "documents": self.index.documents, "metadatas": self.index.metadatas}
+    
+    def get_documents(self, ids: List[str]) -> Dict[str, List]:
+        rows = [self.index.id_to_row[doc_id] for doc_id in ids if doc_id in self.index.id_to_row]
+        return {
+            "ids": [self.index.ids[row] for row in rows],
+            "documents": [self.index.documents[row] for row in rows],
+            "metadatas": [self.index.metadatas[row] for row in rows],
+        }
+
+
+BACKENDS = {
+    ChromaBackend.name: ChromaBackend,
+    LocalBackend.name: LocalBackend,
+}
+
+
+def create_vector_backend(name: str) -> VectorBackend:
+    """이름으로 백엔드 생성 (chroma | local)"""
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 VECTOR_BACKEND: {name} (가능: {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
+
+
+_backend = None
+_backend_failed_at: Optional[float] = None
+_backend_lock = threading.Lock()
+
+def get_vector_backend():
+    """
+    설정(VECTOR_BACKEND)에 맞는 백엔드 반환 (시작 작업과 첫 요청이 동시에 불러도 한 번만 생성)
+    연결/로드 실패 시 None (search_facilities가 실패 응답 반환),
+    VECTOR_BACKEND_RETRY_SECONDS가 지나면 다시 연결 시도
+    """
+    global _backend, _backend_failed_at
+    if _backend is not None:
+        return _backend
+    
+    with _backend_lock:
+        if _backend is None:
+            if _backend_failed_at is not None and time.monotonic() - _backend_failed_at < settings.VECTOR_BACKEND_RETRY_SECONDS:
+                return None
+            try:
+                backend = create_vector_backend(settings.VECTOR_BACKEND)
+                logger.info(f"벡터 백엔드: {backend.name}, 항목 수: {backend.count()}")
+                _backend, _backend_failed_at = backend, None
+            except Exception as e:
+                _backend_failed_at = time.monotonic()
+                logger.error(f"❌ 벡터 백엔드 초기화 실패 ({settings.VECTOR_BACKEND}): {e}")
+    return _backend
+
+
+
+# ============================================
+# 백엔드 문서로 만드는 보조 인덱스 (BM25, 좌표 격자, 시설 테이블)
+# ============================================
+_corpus = None
+_derived: Dict[str, object] = {}
+_derived_errors: Dict[str, Exception] = {}
+_derived_lock = threading.RLock()  # 시설 테이블이 생성 중에 좌표 인덱스를 요청함
+
+def _get_derived(name: str, factory):
+    """
+    벡터 백엔드의 전체 문서로 보조 인덱스 생성 (처음 호출할 때 한 번, 문서는 한 번만 읽음)
+    생성 실패 시 None을 유지 (검색은 해당 기능 없이 계속)
+    """
+    global _corpus
+    if name in _derived or name in _derived_errors:
+        return _derived.get(name)
+    
+    with _derived_lock:
+        if name not in _derived and name not in _derived_errors:
+            backend = get_vector_backend()
+            if backend is None:
+                return None
+            try:
+                if _corpus is None:
+                    _corpus = backend.all_documents()
+                _derived[name] = factory(_corpus)
+            except Exception as e:
+                _derived_errors[name] = e
+                logger.error(f"❌ {name} 인덱스 생성 실패: {e}")
+    return _derived.get(name)
+
+def get_lexical_searcher():
+    """BM25 검색기 (HYBRID_SEARCH가 꺼져 있거나 생성 실패 시 None → 벡터 검색만 사용)"""
+    if not settings.HYBRID_SEARCH:
+        return None
+    return _get_derived(
+        "lexical",
+        lambda docs: LexicalSearcher(docs["ids"], docs["documents"], docs["metadatas"], geo=get_geo_index())
+    )
+
+def _build_geo_index(docs: Dict[str, List]) -> GeoIndex:
+    # 로컬 백엔드는 같은 행 순서(all_documents)의 격자 인덱스를 이미 가지고 있으므로 재사용
+    metadata_index = getattr(get_vector_backend(), "metadata_index", None)
+    if metadata_index is not None:
+        return metadata_index.geo
+    return GeoIndex(docs["metadatas"], cell_degrees=settings.GEO_CELL_DEGREES)
+
+def get_geo_index():
+    """시설 좌표 격자 인덱스 (생성 실패 시 None → 거리 기반 정렬 없이 검색)"""
+    return _get_derived("geo", _build_geo_index)
+
+_on_demand_table = None
+
+def get_facility_table():
+    """
+    문서 ID → 시설 응답 레코드 테이블
+    전체 문서 로드에 실패하면 빈 테이블에서 시작해 검색된 ID만 그때그때 읽어서 채움
+    """
+    global _on_demand_table
+    table = _get_derived(
+        "facilities",
+        lambda docs: FacilityTable(
+            docs["ids"], docs["documents"], docs["metadatas"],
+            geo=get_geo_index(),
+            loader=get_vector_backend().get_documents
+        )
+    )
+    if table is not None:
+        return table
+    
+    backend = get_vector_backend()
+    if backend is None:
+        return None
+    with _derived_lock:
+        if _on_demand_table is None:
+            _on_demand_table = FacilityTable([], [], [], loader=backend.get_documents)
+    return _on_demand_table
@@ -0,0 +1,103 @@
+"""
+CSV 행 → 임베딩 문서 / 메타데이터 / 안정적인 ID
+(ingest.py 와 인덱스 빌드 스크립트가 공유)
+"""
+
+from typing import Dict, Iterable, List
+import hashlib
+import json
+
+# 메타데이터 컬럼 (필터링/정렬용)
+META_COLS = [
+    "Name", "Category1", "Category2", "Category3",
+    "Address", "CTPRVN_NM", "SIGNGU_NM",
+    "LAT", "LON", "in_out",
+    "Age", "age_min", "age_max",
+    "Time", "Day", "Cost",
+    "Note"
+]
+
+def build_doc(row) -> str:
+    """문서(document) 생성 (임베딩 내용)"""
+    parts = []
+
+    # 1) 시설명
+    if row.get("Name"):
+        parts.append(f"시설명: {row['Name']}")
+
+    # 2) 분류 Category1~3
+    cats = [row.get("Category1",""), row.get("Category2",""), row.get("Category3","")]
+    cats = [c for c in cats if c]
+    if cats:
+        parts.append("분류: " + ", ".join(cats))
+
+    # 3) 행정동/시군구
+    if row.get("CTPRVN_NM") or row.get("SIGNGU_NM"):
+        parts.append(f"지역: {row['CTPRVN_NM']} {row['SIGNGU_NM']}")
+
+    # 4) 주소
+    if row.get("Address"):
+        parts.append(f"주소: {row['Address']}")
+
+    # 5) 운영시간
+    if row.get("Time"):
+        parts.append(f"운영시간: {row['Time']}")
+
+    # 6) 운영요일
+    if row.get("Day"):
+        parts.append(f"운영요일: {row['Day']}")
+
+    # 7) 비용
+    if row.get("Cost"):
+        parts.append(f"이용요금: {row['Cost']}")
+
+    # 8) 실내/실외
+    if row.get("in_out"):
+        parts.append(f"시설 형태: {row['in_out']}")
+
+    # 9) 권장연령 (자연어로 의미 있으므로 포함)
+    if row.get("Age"):
+        parts.append(f"권장연령: {row['Age']}")
+
+    # 10) 자유 텍스트 Note
+    if row.get("Note"):
+        parts.append(f"추가설명: {row['Note']}")
+
+    return ". ".join(parts)
+
+# 숫자로 저장해야 범위 조건($gte/$lte)이 동작하는 컬럼
+NUMERIC_COLS = ("LAT", "LON")
+
+def build_metadata(row, columns: Iterable[str]) -> Dict:
+    """메타데이터 dict (Chroma는 str/int/float/bool만 허용)"""
+    metadata = {}
+    for col in columns:
+        value = row.get(col, "")
+        if hasattr(value, "item"):  # numpy 스칼라 → 파이썬 기본형
+            value = value.item()
+        if col in NUMERIC_COLS and isinstance(value, str) and value.strip():
+            try:
+                value = float(value)
+            except ValueError:
+                pass
+        metadata[col] = value
+    return metadata
+
+def stable_ids(rows: List[Dict]) -> List[str]:
+    """
+    행 순서와 무관한 안정적인 ID (시설명 + 주소 + 좌표 기반)
+    같은 키가 여러 번 나오면 등장 순서대로 접미사를 붙임
+    """
+    ids, seen = [], {}
+    for row in rows:
+        key = "|".join(str(row.get(col, "")).strip() for col in ("Name", "Address", "LAT", "LON"))
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        count = seen.get(digest, 0)
+        seen[digest] = count + 1
+        ids.append(f"fac_{digest}" if count == 0 else f"fac_{digest}_{count}")
+    return ids
+
+def content_hash(document: str, metadata: Dict) -> str:
+    """문서 + 메타데이터 해시 (바뀐 행만 다시 임베딩/업서트하기 위함)"""
+    payload = document + "\x00" + json.dumps(metadata, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
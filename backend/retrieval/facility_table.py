@@ -0,0 +1,121 @@
+from typing import Callable, Dict, List, Optional, Sequence
+import logging
+import threading
+import time
+from retrieval.geo_index import GeoIndex, parse_coordinates
+
+logger = logging.getLogger(__name__)
+
+
+class FacilityRecord:
+    """search_facilities 응답 한 건 (로드 시 한 번 검증/렌더링)"""
+    
+    __slots__ = ("id", "name", "lat", "lng", "approximate_location", "note", "category", "desc")
+    
+    def __init__(self, doc_id: str, document: str, metadata: Dict, geo: Optional[GeoIndex] = None):
+        self.id = doc_id
+        self.name = metadata.get("Name", metadata.get("name", "이름없음"))
+        self.note = metadata.get("Note", "")
+        
+        # 좌표 (없거나 잘못되면 시설이 속한 시군구/시도 중심 좌표로 근사)
+        self.approximate_location = False
+        coordinates = parse_coordinates(metadata)
+        if coordinates is None and geo is not None:
+            sido = [metadata["CTPRVN_NM"]] if metadata.get("CTPRVN_NM") else []
+            sigungu = [metadata["SIGNGU_NM"]] if metadata.get("SIGNGU_NM") else []
+            if sido or sigungu:
+                coordinates = geo.centroid(sido, sigungu)
+                self.approximate_location = coordinates is not None
+        self.lat, self.lng = coordinates if coordinates is not None else (None, None)
+        
+        # 설명
+        address = metadata.get("Address", "")
+        category1 = metadata.get("Category1", "")
+        category3 = metadata.get("Category3", "")
+        self.category = category3 or category1 or "시설"
+        
+        if document:
+            self.desc = document[:100]
+        elif address:
+            self.desc = address[:100]
+        elif category3:
+            self.desc = f"{category1} - {category3}"
+        else:
+            self.desc = ""
+    
+    @property
+    def exact_coordinates(self):
+        """실제 좌표 (근사 좌표면 None, 거리 정렬용)"""
+        if self.lat is None or self.approximate_location:
+            return None
+        return self.lat, self.lng
+    
+    def to_payload(self, distance: Optional[float], distance_km: Optional[float] = None) -> Dict:
+        """search_facilities 응답 dict"""
+        payload = {
+            "name": self.name,
+            "lat": self.lat,
+            "lng": self.lng,
+            "note": self.note,
+            "category": self.category,
+            "desc": self.desc,
+            "distance": distance
+        }
+        if self.approximate_location:
+            payload["approximate_location"] = True
+        if distance_km is not None:
+            payload["distance_km"] = round(distance_km, 2)
+        return payload
+
+
+class FacilityTable:
+    """
+    문서 ID → FacilityRecord (로드 시 전체 생성)
+    검색은 인덱스에서 ID + distance만 받아 이 테이블과 조인
+    테이블에 없는 ID(서버 기동 후 인덱싱된 문서 등)는 loader로 읽어서 추가
+    """
+    
+    def __init__(
+        self,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        metadatas: Sequence[Dict],
+        geo: Optional[GeoIndex] = None,
+        loader: Optional[Callable[[List[str]], Dict[str, List]]] = None
+    ):
+        started = time.perf_counter()
+        self.geo = geo
+        self.loader = loader
+        self.records: Dict[str, FacilityRecord] = {
+            doc_id: FacilityRecord(doc_id, document, metadata, geo)
+            for doc_id, document, metadata in zip(ids, documents, metadatas)
+        }
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "loaded_on_demand": 0, "missing": 0}
+        logger.info(f"✅ 시설 테이블 생성: {len(self.records)}개 ({time.perf_counter() - started:.2f}s)")
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def lookup(self, ids: Sequence[str]) -> List[Optional[FacilityRecord]]:
+        """ID 순서대로 레코드 (끝내 못 찾은 ID는 None)"""
+        missing = [doc_id for doc_id in ids if doc_id not in self.records]
+        if missing and self.loader is not None:
+            try:
+                loaded = self.loader(missing)
+                with self._lock:
+                    for doc_id, document, metadata in zip(loaded["ids"], loaded["documents"], loaded["metadatas"]):
+                        self.records[doc_id] = FacilityRecord(doc_id, document, metadata, self.geo)
+                    self._stats["loaded_on_demand"] += len(loaded["ids"])
+            except Exception as e:
+                logger.error(f"❌ 시설 레코드 로드 실패: {e}")
+        
+        records = [self.records.get(doc_id) for doc_id in ids]
+        with self._lock:
+            self._stats["lookups"] += len(ids)
+            self._stats["missing"] += sum(record is None for record in records)
+        return records
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "records": len(self.records)}
@@ -0,0 +1,207 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+import math
+import numpy as np
+from retrieval.geo_index import KM_PER_DEGREE_LAT, GeoIndex
+
+logger = logging.getLogger(__name__)
+
+# 짧은 지역명 → CTPRVN_NM (시도) 값
+SIDO_ALIASES: Dict[str, List[str]] = {
+    "서울": ["서울특별시"],
+    "부산": ["부산광역시"],
+    "대구": ["대구광역시"],
+    "인천": ["인천광역시"],
+    "광주": ["광주광역시"],
+    "대전": ["대전광역시"],
+    "울산": ["울산광역시"],
+    "세종": ["세종특별자치시"],
+    "경기": ["경기도"],
+    "강원": ["강원도", "강원특별자치도"],
+    "충북": ["충청북도"],
+    "충남": ["충청남도"],
+    "전북": ["전라북도", "전북특별자치도"],
+    "전남": ["전라남도"],
+    "경북": ["경상북도"],
+    "경남": ["경상남도"],
+    "제주": ["제주특별자치도"],
+    "수도권": ["서울특별시", "인천광역시", "경기도"],
+}
+
+# 시도 정식 명칭도 그대로 허용 (예: "서울특별시")
+for _names in list(SIDO_ALIASES.values()):
+    for _name in _names:
+        SIDO_ALIASES.setdefault(_name, [_name])
+
+# in_out 메타데이터 값
+INDOOR_VALUES = ["실내", "실내외"]
+OUTDOOR_VALUES = ["실외", "실내외"]
+
+
+def _sigungu_candidates(region: str) -> List[str]:
+    """시군구 이름 후보 (예: "수원" → ["수원", "수원시", "수원군", "수원구"])"""
+    if region.endswith(("시", "군", "구")) and len(region) > 1:
+        return [region]
+    return [region, f"{region}시", f"{region}군", f"{region}구"]
+
+
+class SearchFilters:
+    """
+    search_facilities 구조화 필터
+    - region: extract_user_intent의 location (시도 또는 시군구)
+    - is_indoor: get_weather_forecast의 is_indoor
+    - child_age: ChatRequest.child_age
+    - near: (lat, lng, radius_km) 반경 필터 (사용자 좌표 또는 지역 중심)
+    """
+    
+    def __init__(
+        self,
+        region: Optional[str] = None,
+        is_indoor: Optional[bool] = None,
+        child_age: Optional[int] = None,
+        near: Optional[Tuple[float, float, float]] = None
+    ):
+        self.region = region.strip() if region and region.strip() else None
+        self.is_indoor = is_indoor
+        self.child_age = child_age
+        self.near = near
+        
+        self.sido: List[str] = []
+        self.sigungu: List[str] = []
+        if self.region:
+            if self.region in SIDO_ALIASES:
+                self.sido = SIDO_ALIASES[self.region]
+            else:
+                self.sigungu = _sigungu_candidates(self.region)
+    
+    def __repr__(self) -> str:
+        return (f"SearchFilters(region={self.region!r}, is_indoor={self.is_indoor}, "
+                f"child_age={self.child_age}, near={self.near})")
+    
+    @property
+    def is_empty(self) -> bool:
+        return self.region is None and self.is_indoor is None and self.child_age is None and self.near is None
+    
+    @property
+    def in_out_values(self) -> List[str]:
+        if self.is_indoor is None:
+            return []
+        return INDOOR_VALUES if self.is_indoor else OUTDOOR_VALUES
+    
+    def relaxations(self, region_near: Optional[Tuple[float, float, float]] = None) -> Iterator["SearchFilters"]:
+        """
+        결과가 부족할 때 조건을 하나씩 풀어가며 검색
+        전체 조건 → 나이 제외 → 실내/실외 제외 → (지역 대신 반경) / (사용자 반경 → 필터 없음)
+        
+        지역 조건이 있으면 반경까지만 넓힘 (전국 결과로 채우면 다른 지역 시설이 그 지역 답처럼 보임)
+        
+        Args:
+            region_near: 지역 조건을 풀 때 대신 쓸 (지역 중심 lat, lng, 반경 km)
+                         → 전국으로 넓히지 않고 주변 지역까지만 채움
+        """
+        yield self
+        if self.child_age is not None:
+            yield SearchFilters(self.region, self.is_indoor, None, self.near)
+        if self.is_indoor is not None:
+            yield SearchFilters(self.region, None, None, self.near)
+        
+        if self.region is not None:
+            near = self.near or region_near
+            if near is not None:
+                yield SearchFilters(near=near)
+            return
+        if self.near is not None:
+            yield SearchFilters()
+    
+    def to_chroma_where(self) -> Optional[Dict]:
+        """Chroma where 절 (조건 없으면 None)"""
+        clauses = []
+        if self.sido:
+            clauses.append({"CTPRVN_NM": {"$in": self.sido}})
+        if self.sigungu:
+            clauses.append({"SIGNGU_NM": {"$in": self.sigungu}})
+        if self.in_out_values:
+            clauses.append({"in_out": {"$in": self.in_out_values}})
+        if self.child_age is not None:
+            clauses.append({"age_min": {"$lte": self.child_age}})
+            clauses.append({"age_max": {"$gte": self.child_age}})
+        if self.near is not None:
+            # Chroma는 거리 연산이 없으므로 반경을 감싸는 사각형으로 거름
+            lat, lng, radius_km = self.near
+            dlat = radius_km / KM_PER_DEGREE_LAT
+            dlng = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+            clauses.append({"LAT": {"$gte": lat - dlat}})
+            clauses.append({"LAT": {"$lte": lat + dlat}})
+            clauses.append({"LON": {"$gte": lng - dlng}})
+            clauses.append({"LON": {"$lte": lng + dlng}})
+        
+        if not clauses:
+            return None
+        if len(clauses) == 1:
+            return clauses[0]
+        return {"$and": clauses}
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+class MetadataInvertedIndex:
+    """
+    로컬 인덱스용 메타데이터 역색인 (로드 시 1회 생성)
+    (필드, 값) → 행 번호 배열, 나이는 float 배열로 범위 비교, 반경은 좌표 격자 인덱스
+    """
+    
+    FIELDS = ("CTPRVN_NM", "SIGNGU_NM", "in_out")
+    
+    def __init__(self, metadatas: List[Dict], geo: Optional[GeoIndex] = None):
+        """geo: 같은 행 순서로 만든 공유 좌표 격자 인덱스 (없으면 기본 격자 크기로 생성)"""
+        self.size = len(metadatas)
+        postings: Dict[tuple, List[int]] = {}
+        for row, metadata in enumerate(metadatas):
+            for field in self.FIELDS:
+                value = metadata.get(field)
+                if value:
+                    postings.setdefault((field, str(value).strip()), []).append(row)
+        self.postings = {key: np.asarray(rows, dtype=np.int64) for key, rows in postings.items()}
+        self.age_min = np.asarray([_to_float(m.get("age_min")) for m in metadatas], dtype=np.float32)
+        self.age_max = np.asarray([_to_float(m.get("age_max")) for m in metadatas], dtype=np.float32)
+        self.geo = geo if geo is not None else GeoIndex(metadatas)
+        logger.info(f"메타데이터 역색인 생성: {len(self.postings)}개 키, {self.size}개 행")
+    
+    def _rows_for(self, field: str, values: List[str]) -> np.ndarray:
+        arrays = [self.postings[(field, v)] for v in values if (field, v) in self.postings]
+        if not arrays:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(arrays))
+    
+    def candidate_rows(self, filters: SearchFilters) -> Optional[np.ndarray]:
+        """필터에 맞는 행 번호 (필터 없으면 None = 전체)"""
+        if filters is None or filters.is_empty:
+            return None
+        
+        mask = np.ones(self.size, dtype=bool)
+        if filters.sido:
+            selected = np.zeros(self.size, dtype=bool)
+            selected[self._rows_for("CTPRVN_NM", filters.sido)] = True
+            mask &= selected
+        if filters.sigungu:
+            selected = np.zeros(self.size, dtype=bool)
+            selected[self._rows_for("SIGNGU_NM", filters.sigungu)] = True
+            mask &= selected
+        if filters.in_out_values:
+            selected = np.zeros(self.size, dtype=bool)
+            selected[self._rows_for("in_out", filters.in_out_values)] = True
+            mask &= selected
+        if filters.child_age is not None:
+            # NaN 비교는 False → 나이 정보 없는 행은 제외 (Chroma where와 동일)
+            mask &= (self.age_min <= filters.child_age) & (self.age_max >= filters.child_age)
+        if filters.near is not None:
+            selected = np.zeros(self.size, dtype=bool)
+            selected[self.geo.within(*filters.near)[0]] = True
+            mask &= selected
+        
+        return np.flatnonzero(mask)
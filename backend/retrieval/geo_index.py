@@ -0,0 +1,151 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+import math
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.2
+
+# 국내 시설 좌표 범위 (벗어나면 잘못된 좌표로 보고 무시)
+LAT_RANGE = (33.0, 39.0)
+LON_RANGE = (124.0, 132.0)
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """(lat, lng)에서 각 좌표까지의 거리 (km)"""
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def parse_coordinates(metadata: Dict) -> Optional[Tuple[float, float]]:
+    """메타데이터 LAT/LON → (lat, lng), 없거나 범위를 벗어나면 None"""
+    try:
+        lat = float(metadata.get("LAT"))
+        lng = float(metadata.get("LON"))
+    except (ValueError, TypeError):
+        return None
+    if not (LAT_RANGE[0] <= lat <= LAT_RANGE[1] and LON_RANGE[0] <= lng <= LON_RANGE[1]):
+        return None
+    return lat, lng
+
+
+class GeoIndex:
+    """
+    시설 좌표 격자 인덱스 (로드 시 1회 생성)
+    - 위경도를 cell_degrees 크기 격자로 나눠 셀 → 행 번호 배열
+    - 반경 검색은 겹치는 셀만 모아서 haversine으로 정확히 거름
+    - 시도/시군구 중심 좌표 (해당 지역 시설 좌표의 중앙값)
+    """
+    
+    def __init__(self, metadatas: Sequence[Dict], cell_degrees: float = 0.05):
+        self.size = len(metadatas)
+        self.cell_degrees = cell_degrees
+        self.lats = np.full(self.size, np.nan, dtype=np.float64)
+        self.lngs = np.full(self.size, np.nan, dtype=np.float64)
+        
+        cells: Dict[Tuple[int, int], List[int]] = {}
+        regions: Dict[Tuple[str, str], List[int]] = {}
+        for row, metadata in enumerate(metadatas):
+            coordinates = parse_coordinates(metadata)
+            if coordinates is None:
+                continue
+            self.lats[row], self.lngs[row] = coordinates
+            cells.setdefault(self._cell(*coordinates), []).append(row)
+            for field in ("CTPRVN_NM", "SIGNGU_NM"):
+                value = str(metadata.get(field) or "").strip()
+                if value:
+                    regions.setdefault((field, value), []).append(row)
+        
+        self.cells = {cell: np.asarray(rows, dtype=np.int64) for cell, rows in cells.items()}
+        self.region_rows = {key: np.asarray(rows, dtype=np.int64) for key, rows in regions.items()}
+        self.located = int(np.count_nonzero(~np.isnan(self.lats)))
+        logger.info(f"좌표 격자 인덱스 생성: 좌표 있는 시설 {self.located}/{self.size}개, 셀 {len(self.cells)}개")
+    
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lng / self.cell_degrees))
+    
+    def coordinates(self, row: int) -> Optional[Tuple[float, float]]:
+        if np.isnan(self.lats[row]):
+            return None
+        return float(self.lats[row]), float(self.lngs[row])
+    
+    def distances_km(self, lat: float, lng: float, rows: np.ndarray) -> np.ndarray:
+        """행별 거리 (좌표 없는 행은 NaN)"""
+        return haversine_km(lat, lng, self.lats[rows], self.lngs[rows])
+    
+    def within(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        반경 안의 시설
+        
+        Returns:
+            (행 번호, 거리 km) 거리 오름차순
+        """
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        dlng = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        lat_lo, lng_lo = self._cell(lat - dlat, lng - dlng)
+        lat_hi, lng_hi = self._cell(lat + dlat, lng + dlng)
+        
+        blocks = [
+            self.cells[(i, j)]
+            for i in range(lat_lo, lat_hi + 1)
+            for j in range(lng_lo, lng_hi + 1)
+            if (i, j) in self.cells
+        ]
+        if not blocks:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        
+        rows = np.concatenate(blocks)
+        distances = self.distances_km(lat, lng, rows)
+        inside = distances <= radius_km
+        rows, distances = rows[inside], distances[inside]
+        order = np.argsort(distances)
+        return rows[order], distances[order]
+    
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        n: int,
+        candidate_rows: Optional[np.ndarray] = None,
+        max_radius_km: float = 100.0
+    ) -> List[Tuple[int, float]]:
+        """가까운 n개 (반경을 2배씩 넓혀 가며 찾음)"""
+        allowed = None
+        if candidate_rows is not None:
+            allowed = np.zeros(self.size, dtype=bool)
+            allowed[candidate_rows] = True
+        
+        radius = min(2.0, max_radius_km)
+        while True:
+            rows, distances = self.within(lat, lng, radius)
+            if allowed is not None:
+                keep = allowed[rows]
+                rows, distances = rows[keep], distances[keep]
+            if len(rows) >= n or radius >= max_radius_km:
+                return [(int(r), float(d)) for r, d in zip(rows[:n], distances[:n])]
+            radius = min(radius * 2, max_radius_km)
+    
+    def centroid(self, sido: Iterable[str] = (), sigungu: Iterable[str] = ()) -> Optional[Tuple[float, float]]:
+        """
+        지역 중심 좌표 (시설 좌표 중앙값)
+        sido/sigungu는 SearchFilters의 CTPRVN_NM / SIGNGU_NM 후보 값
+        """
+        selections = []
+        for field, values in (("CTPRVN_NM", sido), ("SIGNGU_NM", sigungu)):
+            values = list(values)
+            if values:
+                arrays = [self.region_rows[(field, v)] for v in values if (field, v) in self.region_rows]
+                selections.append(np.unique(np.concatenate(arrays)) if arrays else np.empty(0, dtype=np.int64))
+        if not selections:
+            return None
+        
+        rows = selections[0]
+        for other in selections[1:]:
+            rows = np.intersect1d(rows, other)
+        if len(rows) == 0:
+            return None
+        return float(np.median(self.lats[rows])), float(np.median(self.lngs[rows]))
@@ -0,0 +1,131 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+import logging
+import re
+import time
+import unicodedata
+import numpy as np
+from retrieval.filters import MetadataInvertedIndex
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[0-9a-z가-힣]+")
+_HANGUL_RE = re.compile(r"[가-힣]")
+_BIGRAM_PREFIX = "#"
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    BM25 색인어 추출
+    - 단어 (NFKC + 소문자, 한글/영문/숫자)
+    - 한글 단어는 글자 bigram도 추가 → 조사/붙여쓰기("배드민턴장", "배드민턴을")도 매칭
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    terms = []
+    for word in _WORD_RE.findall(text):
+        terms.append(word)
+        if len(word) > 1 and _HANGUL_RE.search(word):
+            terms.extend(_BIGRAM_PREFIX + word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+class LexicalIndex:
+    """
+    BM25 역색인 (build_doc 문서 기준)
+    문서 쪽 BM25 가중치를 색인 시점에 미리 계산해 두므로
+    검색은 쿼리 색인어별 posting 배열을 더하는 것뿐 (수만 건 기준 1ms 미만)
+    """
+    
+    def __init__(self, documents: Sequence[str], k1: float = 1.2, b: float = 0.75):
+        started = time.perf_counter()
+        self.size = len(documents)
+        
+        postings: Dict[str, Dict[int, int]] = {}
+        lengths = np.zeros(self.size, dtype=np.float32)
+        for row, document in enumerate(documents):
+            terms = tokenize(document)
+            lengths[row] = len(terms)
+            for term in terms:
+                counts = postings.setdefault(term, {})
+                counts[row] = counts.get(row, 0) + 1
+        
+        avg_length = float(lengths.mean()) if self.size else 0.0
+        norm = k1 * (1 - b + b * lengths / max(avg_length, 1e-9))
+        
+        # term → (행 번호, BM25 가중치)
+        self.postings: Dict[str, tuple] = {}
+        for term, counts in postings.items():
+            rows = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+            tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            idf = np.log(1 + (self.size - len(rows) + 0.5) / (len(rows) + 0.5))
+            self.postings[term] = (rows, (idf * tf * (k1 + 1) / (tf + norm[rows])).astype(np.float32))
+        
+        logger.info(f"✅ BM25 색인 완료: 문서 {self.size}개, 색인어 {len(self.postings)}개 "
+                    f"({time.perf_counter() - started:.2f}s)")
+    
+    def search(self, query: str, k: int, candidate_rows: Optional[np.ndarray] = None) -> List[tuple]:
+        """
+        BM25 top-k
+        
+        Args:
+            query: 검색어
+            k: 반환 개수
+            candidate_rows: 메타데이터 필터로 좁힌 행 번호 (None이면 전체)
+        
+        Returns:
+            [(row, score), ...] score 내림차순, 매칭 없는 문서는 제외
+        """
+        if self.size == 0 or k <= 0:
+            return []
+        
+        scores = np.zeros(self.size, dtype=np.float32)
+        matched = False
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is not None:
+                rows, weights = posting
+                scores[rows] += weights
+                matched = True
+        if not matched:
+            return []
+        
+        if candidate_rows is not None:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[candidate_rows] = True
+            scores[~mask] = 0.0
+        
+        hit_rows = np.flatnonzero(scores)
+        if len(hit_rows) == 0:
+            return []
+        k = min(k, len(hit_rows))
+        top = hit_rows[np.argpartition(-scores[hit_rows], k - 1)[:k]]
+        top = top[np.argsort(-scores[top])]
+        return [(int(row), float(scores[row])) for row in top]
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], rrf_k: int = 60) -> List[str]:
+    """
+    여러 순위 목록을 RRF로 합침 (score = Σ 1 / (rrf_k + rank))
+    점수가 같으면 먼저 나온 목록의 순서 유지
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(scores, key=lambda doc_id: -scores[doc_id])
+
+
+class LexicalSearcher:
+    """LexicalIndex + 메타데이터 필터, VectorBackend.query_ids와 같은 모양으로 결과 반환"""
+    
+    def __init__(self, ids: List[str], documents: List[str], metadatas: List[Dict], geo=None):
+        self.ids = ids
+        self.index = LexicalIndex(documents)
+        self.metadata_index = MetadataInvertedIndex(metadatas, geo=geo)
+    
+    def query(self, text: str, k: int, filters=None) -> Dict[str, List]:
+        candidate_rows = self.metadata_index.candidate_rows(filters)
+        hits = self.index.search(text, k, candidate_rows=candidate_rows)
+        return {
+            "ids": [self.ids[row] for row, _ in hits],
+            "scores": [score for _, score in hits],
+        }
@@ -0,0 +1,296 @@
+from typing import Dict, List, Optional, Sequence
+import json
+import logging
+import os
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.f32"
+META_FILE = "meta.json"
+HNSW_FILE = "hnsw.bin"
+
+# 양자화별 저장 형식: 파일 이름, dtype
+QUANTIZATIONS = {
+    "none": ("vectors.f32", np.float32),
+    "int8": ("vectors.i8", np.int8),      # 행마다 scale(float32) 별도 저장
+    "binary": ("vectors.bin", np.uint8),  # 부호 비트 (np.packbits)
+}
+SCALES_FILE = "scales.f32"
+
+# 바이트별 1비트 개수 (binary 해밍 거리 계산용)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+# 한 번에 점수를 계산할 행 수 (int8 → float32 변환 메모리 제한)
+_SCORE_BLOCK_ROWS = 8192
+
+
+def quantize(vectors: np.ndarray, quantization: str):
+    """
+    정규화된 float32 벡터 → (저장 행렬, 행별 scale 또는 None)
+    - int8: 행마다 최대 절댓값을 127로 맞춤 (벡터당 d + 4 바이트)
+    - binary: 부호 비트만 저장 (벡터당 d/8 바이트), 코사인은 해밍 거리로 추정
+    """
+    if quantization == "none":
+        return np.asarray(vectors, dtype=np.float32), None
+    if quantization == "int8":
+        scales = np.abs(vectors).max(axis=1).astype(np.float32) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales
+    if quantization == "binary":
+        return np.packbits(vectors > 0, axis=1), None
+    raise ValueError(f"알 수 없는 양자화 방식: {quantization} (가능: {', '.join(QUANTIZATIONS)})")
+
+
+class LocalVectorIndex:
+    """
+    프로세스 내 벡터 인덱스
+    - 정규화된 float32 행렬을 디스크에서 memory-map으로 로드
+    - 기본은 정확한 내적 top-k, 선택적으로 HNSW (hnswlib 설치 시, 양자화 없을 때만)
+    - int8/binary 양자화로 저장하면 인덱스 크기 4배/32배 감소
+    - distance는 Chroma 기본값(l2)과 같은 squared L2 (정규화 벡터: 2 - 2·cos)
+    """
+    
+    def __init__(
+        self,
+        ids: List[str],
+        vectors: np.ndarray,
+        documents: List[str],
+        metadatas: List[Dict],
+        ann: str = "exact",
+        quantization: str = "none",
+        scales: Optional[np.ndarray] = None,
+        dimensions: Optional[int] = None,
+        hnsw_path: Optional[str] = None
+    ):
+        self.ids = ids
+        self.vectors = vectors  # quantization에 따라 float32 / int8 코드 / packbits
+        self.documents = documents
+        self.metadatas = metadatas
+        self.quantization = quantization
+        self.scales = scales
+        self._dimensions = dimensions or vectors.shape[1]
+        self.id_to_row = {doc_id: i for i, doc_id in enumerate(ids)}
+        self.path: Optional[str] = None
+        self._hnsw = None
+        
+        if ann == "hnsw":
+            if quantization == "none":
+                self._hnsw = self._build_hnsw(hnsw_path)
+            else:
+                logger.warning(f"{quantization} 양자화 인덱스는 HNSW 미지원 → 정확한 검색(exact) 사용")
+    
+    @classmethod
+    def from_embeddings(
+        cls,
+        ids: List[str],
+        embeddings: Sequence[Sequence[float]],
+        documents: List[str],
+        metadatas: List[Dict],
+        ann: str = "exact",
+        quantization: str = "none"
+    ) -> "LocalVectorIndex":
+        """메모리에서 바로 인덱스 생성 (벤치마크/테스트용)"""
+        vectors = cls.normalize(np.asarray(embeddings, dtype=np.float32))
+        stored, scales = quantize(vectors, quantization)
+        return cls(ids, stored, documents, metadatas, ann=ann, quantization=quantization,
+                   scales=scales, dimensions=vectors.shape[1])
+    
+    @property
+    def dimensions(self) -> int:
+        return self._dimensions
+    
+    @property
+    def nbytes(self) -> int:
+        """벡터 저장 크기 (바이트)"""
+        size = int(np.prod(self.vectors.shape)) * self.vectors.dtype.itemsize
+        if self.scales is not None:
+            size += self.scales.nbytes
+        return size
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @staticmethod
+    def normalize(vectors: np.ndarray) -> np.ndarray:
+        """행 단위 L2 정규화 (float32)"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+    
+    # ------------------------------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(
+        cls,
+        path: str,
+        ids: List[str],
+        embeddings: Sequence[Sequence[float]],
+        documents: List[str],
+        metadatas: List[Dict],
+        quantization: str = "none"
+    ):
+        """벡터를 정규화(+양자화)해서 path 디렉토리에 저장"""
+        os.makedirs(path, exist_ok=True)
+        vectors = cls.normalize(np.asarray(embeddings, dtype=np.float32))
+        stored, scales = quantize(vectors, quantization)
+        
+        # 다른 양자화 형식의 이전 파일 정리
+        for filename, _ in QUANTIZATIONS.values():
+            old = os.path.join(path, filename)
+            if os.path.exists(old):
+                os.remove(old)
+        
+        stored.tofile(os.path.join(path, QUANTIZATIONS[quantization][0]))
+        if scales is not None:
+            scales.tofile(os.path.join(path, SCALES_FILE))
+        
+        with open(os.path.join(path, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({
+                "count": len(ids),
+                "dimensions": int(vectors.shape[1]),
+                "quantization": quantization,
+                "ids": ids,
+                "documents": documents,
+                "metadatas": metadatas,
+            }, f, ensure_ascii=False)
+        
+        # 이전 HNSW 그래프는 더 이상 맞지 않음 (ann=hnsw로 처음 로드할 때 다시 생성해서 저장)
+        hnsw_path = os.path.join(path, HNSW_FILE)
+        if os.path.exists(hnsw_path):
+            os.remove(hnsw_path)
+        
+        logger.info(f"✅ 로컬 인덱스 저장: {path} ({len(ids)}개, {vectors.shape[1]}차원, {quantization})")
+    
+    @classmethod
+    def load(cls, path: str, ann: str = "exact") -> "LocalVectorIndex":
+        """path 디렉토리에서 인덱스 로드 (벡터는 memory-map)"""
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        
+        quantization = meta.get("quantization", "none")
+        filename, dtype = QUANTIZATIONS[quantization]
+        width = (meta["dimensions"] + 7) // 8 if quantization == "binary" else meta["dimensions"]
+        
+        vectors = np.memmap(
+            os.path.join(path, filename),
+            dtype=dtype,
+            mode="r",
+            shape=(meta["count"], width)
+        )
+        scales = None
+        if quantization == "int8":
+            scales = np.fromfile(os.path.join(path, SCALES_FILE), dtype=np.float32)
+        
+        index = cls(meta["ids"], vectors, meta["documents"], meta["metadatas"], ann=ann,
+                    quantization=quantization, scales=scales, dimensions=meta["dimensions"],
+                    hnsw_path=os.path.join(path, HNSW_FILE))
+        index.path = path
+        logger.info(f"✅ 로컬 인덱스 로드: {path} ({meta['count']}개, {meta['dimensions']}차원, {quantization}, {ann})")
+        return index
+    
+    def _build_hnsw(self, hnsw_path: Optional[str] = None):
+        """
+        HNSW 그래프 (hnsw_path에 저장된 그래프가 있으면 로드, 없으면 생성 후 저장)
+        build()가 벡터를 다시 저장할 때 그래프 파일을 지우므로 저장된 그래프는 항상 현재 벡터 기준
+        """
+        try:
+            import hnswlib
+        except ImportError:
+            logger.warning("hnswlib 미설치 → 정확한 검색(exact) 사용")
+            return None
+        
+        index = hnswlib.Index(space="ip", dim=self.dimensions)
+        if hnsw_path and os.path.exists(hnsw_path):
+            try:
+                index.load_index(hnsw_path, max_elements=len(self))
+                if index.get_current_count() == len(self):
+                    index.set_ef(64)
+                    logger.info(f"HNSW 그래프 로드: {hnsw_path} ({len(self)}개)")
+                    return index
+                logger.warning(f"HNSW 그래프 항목 수 불일치 → 다시 생성: {hnsw_path}")
+            except Exception as e:
+                logger.warning(f"HNSW 그래프 로드 실패 → 다시 생성: {e}")
+            index = hnswlib.Index(space="ip", dim=self.dimensions)
+        
+        index.init_index(max_elements=len(self), ef_construction=200, M=16)
+        index.add_items(np.asarray(self.vectors), np.arange(len(self)))
+        index.set_ef(64)
+        logger.info(f"HNSW 그래프 생성 완료: {len(self)}개")
+        if hnsw_path:
+            try:
+                index.save_index(hnsw_path)
+            except OSError as e:
+                logger.warning(f"HNSW 그래프 저장 실패 (다음 기동 때 다시 생성): {e}")
+        return index
+    
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+    def _scores(self, query: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        """쿼리와 각 행의 코사인 유사도 (양자화 인덱스는 근사값)"""
+        if self.quantization == "none":
+            return (self.vectors[rows] if rows is not None else self.vectors) @ query
+        
+        query_bits = np.packbits(query > 0) if self.quantization == "binary" else None
+        n = len(rows) if rows is not None else len(self)
+        scores = np.empty(n, dtype=np.float32)
+        
+        for start in range(0, n, _SCORE_BLOCK_ROWS):
+            end = min(n, start + _SCORE_BLOCK_ROWS)
+            block_rows = rows[start:end] if rows is not None else slice(start, end)
+            block = self.vectors[block_rows]
+            if query_bits is not None:
+                # SimHash: 부호가 다른 비트 비율 ≈ 두 벡터 사이 각도 / π
+                hamming = _POPCOUNT[np.bitwise_xor(block, query_bits)].sum(axis=1)
+                scores[start:end] = np.cos(np.pi * hamming / self.dimensions)
+            else:
+                scores[start:end] = (np.asarray(block, dtype=np.float32) @ query) * self.scales[block_rows]
+        return scores
+    
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        k: int,
+        candidate_rows: Optional[np.ndarray] = None
+    ) -> List[tuple]:
+        """
+        top-k 검색
+        
+        Args:
+            query_embedding: 쿼리 벡터
+            k: 반환 개수
+            candidate_rows: 후보 행 번호 (메타데이터 필터 등으로 미리 좁힌 경우)
+        
+        Returns:
+            [(row, distance), ...] distance 오름차순
+        """
+        if len(self) == 0 or k <= 0:
+            return []
+        
+        query = self.normalize(np.asarray(query_embedding, dtype=np.float32))
+        
+        if self._hnsw is not None and candidate_rows is None:
+            labels, distances = self._hnsw.knn_query(query, k=min(k, len(self)))
+            # hnswlib ip 거리 = 1 - dot
+            return [
+                (int(row), float(2.0 * dist))
+                for row, dist in zip(labels[0], distances[0])
+            ]
+        
+        if candidate_rows is not None and len(candidate_rows) == 0:
+            return []
+        rows = candidate_rows
+        scores = self._scores(query, rows)
+        
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        
+        return [
+            (int(rows[i]) if rows is not None else int(i), float(2.0 - 2.0 * scores[i]))
+            for i in top
+        ]
@@ -1,146 +1,597 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from models.schemas import ChatRequest, ChatResponse, MapData, MarkerData
-from agent import create_agent
+from agent import create_agent, AGENT_LLM_TAG, route_turn, record_agent_turn, get_router_stats
+from models.chat_models import get_llm_metrics
+from models.pca_embeddings import pca_embeddings
+from tools.extract_info_tool import get_intent_stats
+from tools.weather_tool import get_weather_cache_stats
+from config import settings
+from utils.admission import AdmissionRejected, AdmissionTicket, create_admission_controller
+from utils.concurrency import run_blocking
+from utils.history_window import build_history_window
+from utils.resilience import get_dependency_stats
+from utils.response_cache import ResponseCacheKey, create_response_cache
+from utils.tracing import finish_trace, register_stats_collector, span, start_trace, tracing_callback
 from utils.conversation_memory import (
     get_conversation_history,
     add_message,
     save_search_results,
     get_last_search_results,
-    set_current_conversation_id 
+    set_current_conversation_id,
+    reset_current_conversation_id,
+    set_current_child_age,
+    reset_current_child_age,
+    set_current_user_location,
+    reset_current_user_location,
+    get_conversation_store_stats
 )
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import json
 import logging
+import threading
 import uuid
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-agent_executor = create_agent()
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
-    """채팅 엔드포인트"""
-    
-    # conversation_id 없으면 생성
+# Agent는 첫 요청 또는 시작 작업(lifespan)에서 생성 (import 시 LLM 생성 / 모델 로딩 없음)
+agent_executor = None
+_agent_lock = threading.Lock()
+
+def get_agent_executor():
+    """AgentExecutor (없으면 생성)"""
+    global agent_executor
+    if agent_executor is None:
+        with _agent_lock:
+            if agent_executor is None:
+                agent_executor = create_agent()
+    return agent_executor
+
+# 첫 턴 응답 캐시 (RESPONSE_CACHE_ENABLED=False면 None)
+response_cache = create_response_cache(settings)
+
+# 동시 처리 턴 수 / 대기열 / 대화별 순서 (ADMISSION_ENABLED=False면 None)
+admission = create_admission_controller(settings)
+
+# /metrics에 함께 내보낼 stats
+register_stats_collector("conversations", get_conversation_store_stats)
+register_stats_collector("router", get_router_stats)
+register_stats_collector("llm", get_llm_metrics)
+register_stats_collector("intent", get_intent_stats)
+register_stats_collector("weather_cache", get_weather_cache_stats)
+register_stats_collector("query_embedding_cache", pca_embeddings.cache_stats)
+register_stats_collector("dependencies", get_dependency_stats)
+if response_cache is not None:
+    register_stats_collector("response_cache", response_cache.stats)
+if admission is not None:
+    register_stats_collector("admission", admission.stats)
+
+# 스트리밍 진행 이벤트 (도구 이름 → SSE 이벤트 이름)
+TOOL_EVENTS = {
+    "extract_user_intent": "intent",
+    "get_weather_forecast": "weather",
+    "search_facilities": "facilities",
+}
+
+def _user_location(request: ChatRequest) -> Optional[Tuple[float, float]]:
+    """요청 좌표 (위도/경도 둘 다 있을 때만)"""
+    if request.latitude is None or request.longitude is None:
+        return None
+    return request.latitude, request.longitude
+
+async def _admit(conversation_id: str) -> Optional[AdmissionTicket]:
+    """입장 대기 (대기 시간은 queue span으로 기록), 거절되면 429/503 + Retry-After"""
+    if admission is None:
+        return None
+    try:
+        with span("admission.wait", kind="queue"):
+            return await admission.acquire(conversation_id)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.reason,
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+def _resolve_conversation_id(request: ChatRequest) -> str:
+    """conversation_id 없으면 생성"""
     conversation_id = request.conversation_id
     
     if not conversation_id or conversation_id.strip() == "":
         conversation_id = str(uuid.uuid4())
     
-    user_message = request.message
+    return conversation_id
 
+def _build_agent_input(conversation_id: str, request: ChatRequest) -> Dict:
+    """히스토리를 읽고 사용자 메시지를 저장한 뒤 Agent 입력 생성"""
+    user_message = request.message
+    
+    # 대화 히스토리 가져오기 (토큰 예산 안으로 줄임)
+    chat_history = build_history_window(
+        get_conversation_history(conversation_id),
+        max_tokens=settings.HISTORY_MAX_TOKENS,
+        summary_max_tokens=settings.HISTORY_SUMMARY_MAX_TOKENS,
+        last_search_results=get_last_search_results(conversation_id)
+    )
+    
+    # 사용자 메시지 추가
+    add_message(conversation_id, "user", user_message)
     
+    # role에 상관없는 모든 대화 기록 문자열 생성
+    history_str = "\n\n".join([
+        f"[{msg.type.upper()}]\n{msg.content}" 
+        for msg in chat_history
+    ])
+    
+    return {
+        "input": user_message,
+        "chat_history": chat_history,
+        "conversation_history": history_str,  # show_map_for_facilities용
+        "child_age": request.child_age,
+        "original_query": user_message
+    }
+
+def _store_search_results(conversation_id: str, facilities_data: List[Dict]):
+    """검색 결과를 대화에 저장 (show_map_for_facilities / 다음 턴에서 사용)"""
+    save_search_results(conversation_id, facilities_data)
+    add_message(
+        conversation_id, 
+        "search_result", 
+        f"마지막 검색 결과: {facilities_data}"
+    )
+    logger.info(f"✅ 검색 결과 저장: {len(facilities_data)}개 시설")
+
+def _parse_search_step(observation: str) -> List[Dict]:
+    """search_facilities 결과 → 시설 리스트 (실패/파싱 오류면 빈 리스트)"""
     try:
-        # 대화 히스토리 가져오기
-        set_current_conversation_id(conversation_id)
-        chat_history = get_conversation_history(conversation_id)
+        search_result = json.loads(observation)
+        if search_result.get("success"):
+            return search_result.get("facilities", [])
+    except Exception as e:
+        logger.error(f"검색 결과 파싱 실패: {e}")
+    return []
+
+def _save_search_step(conversation_id: str, observation: str):
+    """search_facilities 결과 저장"""
+    try:
+        facilities_data = _parse_search_step(observation)
+        if facilities_data:
+            _store_search_results(conversation_id, facilities_data)
+    except Exception as e:
+        logger.error(f"검색 결과 저장 실패: {e}")
+
+def _build_map_payload(observation: str) -> Optional[Tuple[MapData, str, str]]:
+    """
+    show_map_for_facilities 결과 → (MapData, 카카오맵 링크, 응답 메시지)
+    지도 데이터가 없으면 None
+    """
+    try:
+        map_result = json.loads(observation)
+        if not map_result.get("success"):
+            return None
         
-        # 사용자 메시지 추가
-        add_message(conversation_id, "user", user_message)
+        facilities = map_result.get("facilities", [])
+        selected_indices = map_result.get("selected_indices", [0, 1, 2])
         
-        # role에 상관없는 모든 대화 기록 문자열 생성
-        history_str = "\n\n".join([
-            f"[{msg.type.upper()}]\n{msg.content}" 
-            for msg in chat_history
-        ])
+        if not facilities:
+            return None
         
-        # Agent 실행 (모든 요청 처리)
-        result = agent_executor.invoke({
-            "input": user_message,
-            "chat_history": chat_history,
-            "conversation_history": history_str,  # show_map_for_facilities용
-            "child_age": request.child_age,
-            "original_query": user_message
-        })
+        logger.info(f"✅ 지도 데이터 생성: {len(facilities)}개 시설 (인덱스: {selected_indices})")
         
-        output = result["output"]
-        intermediate_steps = result.get("intermediate_steps", [])
+        # MarkerData 생성 (필터링된 시설 중 좌표 있는 것만)
+        markers = [
+            MarkerData(
+                name=f["name"],
+                lat=f["lat"],
+                lng=f["lng"],
+                desc=f.get("desc", "")
+            )
+            for f in facilities
+            if f.get("lat") is not None and f.get("lng") is not None
+        ]
+        if not markers:
+            return None
         
-        # search_facilities 결과 저장
-        for step in intermediate_steps:
-            if step[0].tool == "search_facilities":
-                try:
-                    search_result = json.loads(step[1])
-                    if search_result.get("success"):
-                        facilities_data = search_result.get("facilities", [])
-                        if facilities_data:
-                            save_search_results(conversation_id, facilities_data)
-                            add_message(
-                            conversation_id, 
-                            "search_result", 
-                            f"마지막 검색 결과: {facilities_data}"
-                        )
-                            logger.info(f"✅ 검색 결과 저장: {len(facilities_data)}개 시설")
-                except Exception as e:
-                    logger.error(f"검색 결과 저장 실패: {e}")
+        # 필터링된 첫 번째 시설을 중심으로
+        # (예: 인덱스 [1,2] 선택 시 → 두 번째 시설이 중심)
+        map_data = MapData(
+            center={"lat": markers[0].lat, "lng": markers[0].lng},
+            markers=markers
+        )
         
-        # show_map_for_facilities 결과 처리
-        map_data = None
-        kakao_link = None
-        response_type = "text"
+        # 카카오맵 링크도 필터링된 첫 번째 시설
+        kakao_link = f"https://map.kakao.com/link/to/{markers[0].name},{markers[0].lat},{markers[0].lng}"
         
-        for step in intermediate_steps:
-            if step[0].tool == "show_map_for_facilities":
-                try:
-                    map_result = json.loads(step[1])
-                    if map_result.get("success"):
-                        facilities = map_result.get("facilities", [])
-                        selected_indices = map_result.get("selected_indices", [0, 1, 2])
-                        
-                        if facilities and len(facilities) > 0:
-                            logger.info(f"✅ 지도 데이터 생성: {len(facilities)}개 시설 (인덱스: {selected_indices})")
-                            
-                            # MarkerData 생성 (필터링된 시설만)
-                            markers = [
-                                MarkerData(
-                                    name=f["name"],
-                                    lat=f["lat"],
-                                    lng=f["lng"],
-                                    desc=f.get("desc", "")
-                                )
-                                for f in facilities
-                            ]
-                            
-                            # 필터링된 첫 번째 시설을 중심으로
-                            # (예: 인덱스 [1,2] 선택 시 → 두 번째 시설이 중심)
-                            center_lat = markers[0].lat
-                            center_lng = markers[0].lng
-                            
-                            map_data = MapData(
-                                center={"lat": center_lat, "lng": center_lng},
-                                markers=markers
-                            )
-                            
-                            # 카카오맵 링크도 필터링된 첫 번째 시설
-                            kakao_link = f"https://map.kakao.com/link/to/{markers[0].name},{markers[0].lat},{markers[0].lng}"
-                            
-                            response_type = "map"
-                            
-                            # 지도 응답 메시지
-                            if len(facilities) == 1:
-                                output = f"{markers[0].name}의 지도를 표시합니다."
-                            else:
-                                output = f"{len(facilities)}개 시설의 지도를 표시합니다."
-                            
-                except Exception as e:
-                    logger.error(f"지도 데이터 처리 실패: {e}")
+        # 지도 응답 메시지
+        if len(markers) == 1:
+            output = f"{markers[0].name}의 지도를 표시합니다."
+        else:
+            output = f"{len(markers)}개 시설의 지도를 표시합니다."
         
-        # AI 응답 저장
-        add_message(conversation_id, "ai", output)
-        print("최종 chat_history:", get_conversation_history(conversation_id))
+        return map_data, kakao_link, output
+    
+    except Exception as e:
+        logger.error(f"지도 데이터 처리 실패: {e}")
+        return None
+
+def _finalize_turn(conversation_id: str, output: str, intermediate_steps: List) -> ChatResponse:
+    """도구 결과 저장 + 지도 데이터 처리 + AI 응답 저장"""
+    # search_facilities 결과 저장
+    for step in intermediate_steps:
+        if step[0].tool == "search_facilities":
+            _save_search_step(conversation_id, step[1])
+    
+    # show_map_for_facilities 결과 처리
+    map_data = None
+    kakao_link = None
+    response_type = "text"
+    
+    for step in intermediate_steps:
+        if step[0].tool == "show_map_for_facilities":
+            payload = _build_map_payload(step[1])
+            if payload:
+                map_data, kakao_link, output = payload
+                response_type = "map"
+    
+    # AI 응답 저장
+    add_message(conversation_id, "ai", output)
+    
+    # 응답 생성
+    return ChatResponse(
+        role="ai",
+        content=output,
+        type=response_type,
+        link=kakao_link,
+        data=map_data,
+        conversation_id=conversation_id
+    )
+
+# ============================================
+# 첫 턴 응답 캐시
+# ============================================
+async def _lookup_cached_turn(conversation_id: str, request: ChatRequest) -> Tuple[Optional[ResponseCacheKey], Optional[Dict]]:
+    """
+    새 대화의 첫 질문이면 캐시 조회
+    Returns:
+        (캐시 키 또는 None, 저장된 응답 또는 None)
+    """
+    if response_cache is None or get_conversation_history(conversation_id):
+        return None, None
+    key = response_cache.make_key(request.message, request.child_age, _user_location(request))
+    if key is None:
+        return None, None
+    # 유사 질문 매칭은 임베딩 호출이 있을 수 있으므로 스레드 풀에서 실행
+    return key, await run_blocking(response_cache.get, key)
+
+def _replay_cached_turn(conversation_id: str, request: ChatRequest, cached: Dict) -> ChatResponse:
+    """캐시된 응답으로 턴 완료 (대화 기록/검색 결과도 Agent 실행 때와 똑같이 저장)"""
+    add_message(conversation_id, "user", request.message)
+    if cached.get("facilities"):
+        _store_search_results(conversation_id, cached["facilities"])
+    add_message(conversation_id, "ai", cached["content"])
+    
+    return ChatResponse(
+        role="ai",
+        content=cached["content"],
+        type=cached["type"],
+        link=cached.get("link"),
+        data=MapData(**cached["data"]) if cached.get("data") else None,
+        conversation_id=conversation_id
+    )
+
+def _is_cacheable_turn(intermediate_steps: List) -> bool:
+    """
+    모든 도구가 성공한 턴만 캐시 (장애 중 실패/성능 저하 답변이 TTL 동안 재사용되지 않게)
+    - search_facilities: success + 시설 있음 + degraded 아님
+    - get_weather_forecast: 의도에서 날씨 확인이 필요했으면 성공해야 함
+    """
+    needs_weather = weather_ok = False
+    for action, observation in intermediate_steps:
+        try:
+            result = json.loads(observation)
+        except (TypeError, ValueError):
+            return False
+        if not isinstance(result, dict) or result.get("success") is False:
+            return False
+        if action.tool == "extract_user_intent":
+            needs_weather = needs_weather or bool(result.get("needs_weather_check"))
+        elif action.tool == "get_weather_forecast":
+            weather_ok = True
+        elif action.tool == "search_facilities":
+            if not result.get("success") or not result.get("facilities") or result.get("degraded"):
+                return False
+    return weather_ok or not needs_weather
+
+async def _store_cached_turn(key: Optional[ResponseCacheKey], response: ChatResponse, intermediate_steps: List):
+    """첫 턴 응답을 캐시에 저장 (마지막 검색 결과 포함, 도구가 하나라도 실패했으면 저장 안 함)"""
+    if key is None:
+        return
+    if not _is_cacheable_turn(intermediate_steps):
+        response_cache.count_skipped_failed_turn()
+        return
+    facilities = []
+    for step in intermediate_steps:
+        if step[0].tool == "search_facilities":
+            facilities = _parse_search_step(step[1]) or facilities
+    
+    payload = {
+        "content": response.content,
+        "type": response.type,
+        "link": response.link,
+        "data": response.data.model_dump() if response.data else None,
+        "facilities": facilities,
+    }
+    try:
+        await run_blocking(response_cache.put, key, payload)
+    except Exception as e:
+        logger.warning(f"응답 캐시 저장 실패: {e}")
+
+async def _route_turn(conversation_id: str, request: ChatRequest):
+    """규칙 라우터 (확실한 패턴이면 도구를 직접 실행, 아니면 None)"""
+    if not settings.ROUTER_ENABLED:
+        return None
+    routed = await run_blocking(route_turn, conversation_id, request.message)
+    if routed is not None:
+        add_message(conversation_id, "user", request.message)
+    return routed
+
+async def _run_turn(conversation_id: str, request: ChatRequest) -> ChatResponse:
+    """캐시 → 규칙 라우터 → Agent 순서로 한 턴 처리"""
+    with span("response_cache.lookup", kind="cache"):
+        cache_key, cached = await _lookup_cached_turn(conversation_id, request)
+    if cached is not None:
+        return _replay_cached_turn(conversation_id, request, cached)
+    
+    # 확실한 패턴은 Agent 없이 처리
+    with span("router", kind="router") as s:
+        routed = await _route_turn(conversation_id, request)
+        s.set("route", routed.route if routed else None)
+    if routed is not None:
+        output, intermediate_steps = routed.output, routed.intermediate_steps
+    else:
+        agent_input = _build_agent_input(conversation_id, request)
         
-        # 응답 생성
-        return ChatResponse(
-            role="ai",
-            content=output,
-            type=response_type,
-            link=kakao_link,
-            data=map_data,
-            conversation_id=conversation_id
-        )
+        # Agent 실행 (애매한 요청)
+        # ainvoke: LLM 호출은 async, 동기 도구는 공유 스레드 풀에서 실행되어 이벤트 루프를 막지 않음
+        with span("agent", kind="agent"):
+            result = await get_agent_executor().ainvoke(agent_input, config={"callbacks": [tracing_callback]})
+        output, intermediate_steps = result["output"], result.get("intermediate_steps", [])
+        record_agent_turn(intermediate_steps)
+    
+    response = _finalize_turn(conversation_id, output, intermediate_steps)
+    await _store_cached_turn(cache_key, response, intermediate_steps)
+    return response
+
+@router.post("/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest):
+    """채팅 엔드포인트"""
+    conversation_id = _resolve_conversation_id(request)
+
+    # 요청 단위 컨텍스트 (동시 요청끼리 섞이지 않음)
+    context_token = set_current_conversation_id(conversation_id)
+    child_age_token = set_current_child_age(request.child_age)
+    location_token = set_current_user_location(_user_location(request))
+    trace, trace_tokens = start_trace("chat", conversation_id=conversation_id)
+    error = None
+    ticket = None
+    
+    try:
+        ticket = await _admit(conversation_id)
+        response = await _run_turn(conversation_id, request)
+    
+    except HTTPException as e:
+        error = e
+        raise
     
     except Exception as e:
+        error = e
         logger.error(f"채팅 오류: {e}")
         import traceback
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(e))
+    
+    finally:
+        if ticket is not None:
+            ticket.release()
+        finish_trace(trace, trace_tokens, error)
+        reset_current_user_location(location_token)
+        reset_current_child_age(child_age_token)
+        reset_current_conversation_id(context_token)
+    
+    if request.trace:
+        response.trace = trace.to_dict()
+    return response
+
+def _sse(event: str, data) -> str:
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _parse_tool_output(output) -> object:
+    content = getattr(output, "content", output)
+    try:
+        return json.loads(content)
+    except (TypeError, ValueError):
+        return content
+
+async def _stream_events(conversation_id: str, request: ChatRequest) -> AsyncIterator[str]:
+    """캐시 → 규칙 라우터 → Agent 순서로 한 턴 처리하면서 SSE 이벤트 생성"""
+    with span("response_cache.lookup", kind="cache"):
+        cache_key, cached = await _lookup_cached_turn(conversation_id, request)
+    if cached is not None:
+        response = _replay_cached_turn(conversation_id, request, cached)
+        if cached.get("facilities"):
+            yield _sse("facilities", {"success": True, "facilities": cached["facilities"], "cached": True})
+        if response.data is not None:
+            yield _sse("map", {"data": response.data.model_dump(), "link": response.link})
+        yield _sse("token", {"content": response.content})
+        yield _sse("done", response.model_dump())
+        return
+    
+    with span("router", kind="router") as s:
+        routed = await _route_turn(conversation_id, request)
+        s.set("route", routed.route if routed else None)
+    if routed is not None:
+        # Agent 실행 때와 같은 이벤트 순서로 내보냄
+        for action, observation in routed.intermediate_steps:
+            yield _sse("progress", {"step": action.tool})
+            if action.tool in TOOL_EVENTS:
+                yield _sse(TOOL_EVENTS[action.tool], _parse_tool_output(observation))
+            elif action.tool == "show_map_for_facilities":
+                payload = _build_map_payload(observation)
+                if payload:
+                    map_data, kakao_link, _ = payload
+                    yield _sse("map", {"data": map_data.model_dump(), "link": kakao_link})
+        response = _finalize_turn(conversation_id, routed.output, routed.intermediate_steps)
+        yield _sse("token", {"content": response.content})
+        yield _sse("done", response.model_dump())
+        await _store_cached_turn(cache_key, response, routed.intermediate_steps)
+        return
+    
+    agent_input = _build_agent_input(conversation_id, request)
+    result = None
+    
+    with span("agent", kind="agent"):
+        events = get_agent_executor().astream_events(agent_input, version="v2", config={"callbacks": [tracing_callback]})
+        async for event in events:
+            kind = event["event"]
+            name = event.get("name")
+            
+            if kind == "on_tool_start":
+                yield _sse("progress", {"step": name})
+            
+            elif kind == "on_tool_end":
+                output = event["data"].get("output")
+                if name in TOOL_EVENTS:
+                    yield _sse(TOOL_EVENTS[name], _parse_tool_output(output))
+                elif name == "show_map_for_facilities":
+                    payload = _build_map_payload(getattr(output, "content", output))
+                    if payload:
+                        map_data, kakao_link, _ = payload
+                        yield _sse("map", {"data": map_data.model_dump(), "link": kakao_link})
+            
+            elif kind == "on_chat_model_stream" and AGENT_LLM_TAG in event.get("tags", []):
+                # 함수 호출 단계는 content가 비어 있고, 최종 답변만 텍스트 토큰이 나옴
+                chunk = event["data"].get("chunk")
+                token = getattr(chunk, "content", "")
+                if token:
+                    yield _sse("token", {"content": token})
+            
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                # 최상위 AgentExecutor 실행 결과
+                result = event["data"].get("output")
+    
+    if not result:
+        raise RuntimeError("Agent 실행 결과가 없습니다")
+    
+    intermediate_steps = result.get("intermediate_steps", [])
+    record_agent_turn(intermediate_steps)
+    response = _finalize_turn(conversation_id, result["output"], intermediate_steps)
+    yield _sse("done", response.model_dump())
+    await _store_cached_turn(cache_key, response, intermediate_steps)
+
+async def _stream_turn(
+    conversation_id: str,
+    request: ChatRequest,
+    ticket: Optional[AdmissionTicket] = None
+) -> AsyncIterator[str]:
+    """
+    Agent 실행을 SSE 이벤트로 스트리밍
+    - start: conversation_id
+    - progress: 도구 시작 (step)
+    - intent / weather / facilities: 도구 결과 (나오는 즉시)
+    - map: MapData (show_map_for_facilities 완료 즉시)
+    - token: 최종 답변 토큰
+    - done: 최종 ChatResponse (/chat 응답과 동일)
+    - trace: 요청 trace (요청에 trace=true일 때, done 다음)
+    - error: 오류
+    """
+    # 스트리밍 응답은 별도 태스크에서 돌 수 있으므로 컨텍스트를 제너레이터 안에서 설정
+    context_token = set_current_conversation_id(conversation_id)
+    child_age_token = set_current_child_age(request.child_age)
+    location_token = set_current_user_location(_user_location(request))
+    trace, trace_tokens = start_trace("chat_stream", conversation_id=conversation_id)
+    error = None
+    
+    try:
+        yield _sse("start", {"conversation_id": conversation_id})
+        async for message in _stream_events(conversation_id, request):
+            yield message
+    
+    except Exception as e:
+        error = e
+        logger.error(f"스트리밍 채팅 오류: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        yield _sse("error", {"detail": str(e), "conversation_id": conversation_id})
+    
+    finally:
+        if ticket is not None:
+            ticket.release()
+        finish_trace(trace, trace_tokens, error)
+        reset_current_user_location(location_token)
+        reset_current_child_age(child_age_token)
+        reset_current_conversation_id(context_token)
+    
+    if request.trace:
+        yield _sse("trace", trace.to_dict())
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """채팅 스트리밍 엔드포인트 (SSE)"""
+    conversation_id = _resolve_conversation_id(request)
+    # 거절은 스트림을 열기 전에 상태 코드로 응답
+    ticket = await _admit(conversation_id)
+    
+    return StreamingResponse(
+        _stream_turn(conversation_id, request, ticket),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # 프록시 버퍼링 끄기
+        },
+        # 스트림 시작 전에 연결이 끊겨도 슬롯 반환 (release는 한 번만 반영)
+        background=BackgroundTask(ticket.release) if ticket is not None else None
+    )
+
+
+@router.get("/conversations/stats")
+async def conversation_stats():
+    """대화 저장소 상태 (대화 수, 메모리 사용량, eviction 횟수)"""
+    return get_conversation_store_stats()
+
+
+@router.get("/response-cache/stats")
+async def response_cache_stats():
+    """첫 턴 응답 캐시 hit/miss (정확히 같은 질문 / 유사 질문)"""
+    if response_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **response_cache.stats()}
+
+
+@router.get("/router/stats")
+async def router_stats():
+    """규칙 라우터 처리 비율 / 절약한 LLM 호출 수"""
+    return get_router_stats()
+
+
+@router.get("/admission/stats")
+async def admission_stats():
+    """동시 처리 턴 수 / 대기열 길이 / 대기 시간 / 거절 수"""
+    if admission is None:
+        return {"enabled": False}
+    return {"enabled": True, **admission.stats()}
+
+
+@router.get("/dependencies/stats")
+async def dependency_stats():
+    """외부 의존성별 서킷 브레이커 상태 / 실패·타임아웃·거절 수"""
+    return get_dependency_stats()
+
+
+@router.get("/llm/stats")
+async def llm_stats():
+    """모델별 LLM 호출 수 / 지연 시간 히스토그램"""
+    return get_llm_metrics()
@@ -43,7 +43,10 @@ def test_search_facilities():
                     print(f"    📍 위치: ({facility['lat']}, {facility['lng']})")
                     print(f"    📁 카테고리: {facility['category']}")
                     print(f"    📝 설명: {facility['desc'][:50]}...")
-                    print(f"    📊 유사도: {facility['distance']:.4f}")
+                    if facility['distance'] is None:
+                        print("    📊 유사도: - (키워드 매칭)")
+                    else:
+                        print(f"    📊 유사도: {facility['distance']:.4f}")
                     print(f"특이사항: {facility.get('note', '없음')}")
                     print()
             else:
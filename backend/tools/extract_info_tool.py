@@ -1,7 +1,30 @@
 from langchain.tools import tool
 from models.chat_models import get_llm  # 수정
+from utils.intent_parser import parse_intent
+from utils.resilience import guarded_call
 from datetime import datetime
 import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 규칙 기반 / LLM 처리 건수
+_stats_lock = threading.Lock()
+intent_stats = {"rules": 0, "llm": 0}
+
+def _count(source: str):
+    with _stats_lock:
+        intent_stats[source] += 1
+
+def get_intent_stats() -> dict:
+    """규칙 기반으로 처리한 비율"""
+    with _stats_lock:
+        total = intent_stats["rules"] + intent_stats["llm"]
+        return {
+            **intent_stats,
+            "rule_rate": intent_stats["rules"] / total if total else 0.0
+        }
 
 @tool
 def extract_user_intent(user_message: str) -> str:
@@ -14,6 +37,16 @@ def extract_user_intent(user_message: str) -> str:
     Returns:
         JSON 문자열
     """
+    # 1) 규칙 기반 빠른 경로 (지역 사전 + 날짜/날씨 정규식)
+    parsed = parse_intent(user_message)
+    if parsed.confident:
+        _count("rules")
+        logger.info(f"의도 추출 (규칙): {parsed.result}")
+        return json.dumps({**parsed.result, "source": "rules"}, ensure_ascii=False)
+    
+    # 2) 애매한 메시지만 LLM으로
+    logger.info(f"의도 추출 LLM fallback: {parsed.reasons}")
+    _count("llm")
     llm = get_llm()
     
     # 현재 날짜 정보
@@ -62,12 +95,18 @@ def extract_user_intent(user_message: str) -> str:
 }}
 """
     
-    response = llm.invoke(prompt)
+    # LLM이 느리거나 장애면(타임아웃은 ChatOpenAI 설정) 규칙 파서 결과로 계속 진행
+    try:
+        response = guarded_call("openai_chat", llm.invoke, prompt)
+    except Exception as e:
+        logger.warning(f"⚠️ 의도 추출 LLM 실패, 규칙 결과 사용: {e}")
+        return json.dumps({**parsed.result, "source": "rules_fallback"}, ensure_ascii=False)
     
     try:
         content = response.content if hasattr(response, 'content') else str(response)
         content = content.replace("```json", "").replace("```", "").strip()
         result = json.loads(content)
+        result["source"] = "llm"
         return json.dumps(result, ensure_ascii=False)
     except Exception as e:
         # 기본값
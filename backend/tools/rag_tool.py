@@ -1,41 +1,125 @@
 from langchain.tools import tool
-import chromadb
-from chromadb.config import Settings as ChromaSettings
-from config import settings
 from models.pca_embeddings import pca_embeddings
-from typing import Optional
+from config import settings
+from retrieval.backends import get_facility_table, get_geo_index, get_lexical_searcher, get_vector_backend
+from retrieval.filters import SearchFilters
+from retrieval.geo_index import haversine_km
+from retrieval.lexical_index import reciprocal_rank_fusion
+from utils.cache import TTLCache
+from utils.conversation_memory import get_current_child_age, get_current_user_location
+from utils.tracing import record_cache, span
+from typing import List, Optional, Tuple
 import json
 import logging
+import math
 
 logger = logging.getLogger(__name__)
 
-# ChromaDB 클라이언트 초기화
-try:
-    chroma_client = chromadb.HttpClient(
-        host=settings.CHROMA_HOST,
-        port=settings.CHROMA_PORT,
-        settings=ChromaSettings(
-            anonymized_telemetry=False
-        )
-    )
-    print(settings.CHROMA_PORT,"chroma_port")
-    print(settings.CHROMA_HOST,"chroma_host")
-    collection = chroma_client.get_collection(
-        name="kid_program_collection"
-    )
-    print(collection)
+# 최근 검색 응답 (임베딩/벡터 DB와 BM25를 모두 쓸 수 없을 때 같은 질문이면 이걸로 응답)
+search_fallback_cache = TTLCache(
+    ttl_seconds=settings.SEARCH_FALLBACK_TTL_SECONDS,
+    max_entries=1024,
+    name="search_fallback",
+    on_lookup=lambda hit: record_cache("search_fallback", hit)
+)
+
+def _hybrid_query(query_text: str, query_embedding, k: int, filters: SearchFilters):
+    """
+    벡터 검색 + BM25 결과를 RRF로 합침 (ID + distance만)
+    BM25에만 나온 문서는 distance가 None, query_embedding이 None이면 BM25만 사용
+    """
+    results = {"ids": [], "distances": []}
+    if query_embedding is not None:
+        vector_backend = get_vector_backend()
+        with span(f"{vector_backend.name}.query", kind="vector", k=k) as s:
+            results = vector_backend.query_ids(query_embedding, k, filters=filters)
+            s.set("results", len(results["ids"]))
+    
+    lexical = get_lexical_searcher()
+    if lexical is None:
+        return results
+    with span("bm25.query", kind="lexical", k=settings.LEXICAL_TOP_K) as s:
+        lexical_results = lexical.query(query_text, settings.LEXICAL_TOP_K, filters=filters)
+        s.set("results", len(lexical_results["ids"]))
+    if not lexical_results["ids"]:
+        return results
+    
+    distances = dict(zip(results["ids"], results["distances"]))
+    fused_ids = reciprocal_rank_fusion([results["ids"], lexical_results["ids"]], settings.RRF_K)[:k]
+    return {"ids": fused_ids, "distances": [distances.get(doc_id) for doc_id in fused_ids]}
+
+def _query_with_relaxation(
+    query_text: str,
+    query_embedding,
+    k: int,
+    filters: SearchFilters,
+    region_near: Optional[Tuple[float, float, float]] = None
+):
+    """
+    필터를 적용해 검색하고, k개가 안 되면 조건을 하나씩 풀어서 채움
+    (엄격한 조건의 결과가 항상 앞에 옴, 지역 조건은 region_near 반경으로 먼저 넓힘)
+    벡터 검색이 실패하면(타임아웃, 서킷 open) 남은 단계는 BM25만 사용
+    
+    Returns:
+        (merged, degraded) degraded는 벡터 검색 없이 만든 결과인지 여부
+    """
+    merged = {"ids": [], "distances": []}
+    
+    for level in filters.relaxations(region_near):
+        try:
+            results = _hybrid_query(query_text, query_embedding, k, level)
+        except Exception as e:
+            if query_embedding is None or get_lexical_searcher() is None:
+                raise
+            logger.warning(f"⚠️ 벡터 검색 실패, 키워드 검색만 사용: {e}")
+            query_embedding = None
+            results = _hybrid_query(query_text, None, k, level)
+        logger.info(f"  필터 {level}: {len(results['ids'])}개")
+        
+        for i, doc_id in enumerate(results["ids"]):
+            if doc_id in merged["ids"]:
+                continue
+            for key in merged:
+                merged[key].append(results[key][i])
+        
+        if len(merged["ids"]) >= k:
+            break
+    
+    return merged, query_embedding is None
+
+def _rank_by_distance(records: List, distances: List, user_location: Tuple[float, float]):
+    """
+    관련도 순위와 사용자 거리를 합쳐 재정렬
+    점수 = (1 - w) · (1 - 순위/개수) + w · exp(-거리 / scale), 좌표 없는 시설은 근접 점수 0
+    
+    Returns:
+        (records, distances, distances_km) 재정렬된 순서
+    """
+    n = len(records)
+    distances_km = []
+    for record in records:
+        coordinates = record.exact_coordinates
+        if coordinates is None:
+            distances_km.append(None)
+        else:
+            distances_km.append(float(haversine_km(*user_location, [coordinates[0]], [coordinates[1]])[0]))
     
-    logger.info(f"✅ ChromaDB 연결 성공: {collection.name}")
-    logger.info(f"컬렉션 항목 수: {collection.count()}")
+    weight = settings.GEO_PROXIMITY_WEIGHT
+    scores = []
+    for i, distance_km in enumerate(distances_km):
+        proximity = 0.0 if distance_km is None else math.exp(-distance_km / settings.GEO_DISTANCE_SCALE_KM)
+        scores.append((1 - weight) * (1 - i / n) + weight * proximity)
     
-except Exception as e:
-    logger.error(f"❌ ChromaDB 연결 실패: {e}")
-    collection = None
+    order = sorted(range(n), key=lambda i: -scores[i])
+    return [records[i] for i in order], [distances[i] for i in order], [distances_km[i] for i in order]
 
 @tool
 def search_facilities(
     original_query: str,
-    k: int = 5
+    k: int = 5,
+    region: Optional[str] = None,
+    is_indoor: Optional[bool] = None,
+    child_age: Optional[int] = None
 ) -> str:
     """
     사용자 질문과 가장 유사한 시설을 검색합니다.
@@ -43,106 +127,103 @@ def search_facilities(
     Args:
         original_query: 사용자의 원본 질문 (예: "부산 자전거 타기 좋은 곳", "서울 실내 놀이터")
         k: 반환할 결과 개수 (기본값: 10)
+        region: 지역 필터 - extract_user_intent의 location (예: "서울", "수원")
+        is_indoor: 실내/실외 필터 - get_weather_forecast의 is_indoor
+        child_age: 아이 나이 필터 (생략하면 요청의 child_age 사용)
     
     Returns:
-        시설 정보 JSON (유사도 높은 순으로 정렬)
+        시설 정보 JSON (벡터 + 키워드 검색 순위를 합친 순서, 키워드로만 찾은 시설은 distance가 null,
+        사용자 좌표가 있으면 가까운 시설 우선 + distance_km 포함)
     """
+    if child_age is None:
+        child_age = get_current_child_age()
+    filters = SearchFilters(region=region, is_indoor=is_indoor, child_age=child_age)
+    user_location = get_current_user_location()
+    fallback_key = (original_query, k, region, is_indoor, child_age, user_location)
+    
     logger.info(f"\n{'='*50}")
     logger.info(f"시설 검색 시작")
-    logger.info(f"original_query: {original_query}, k: {k}")
+    logger.info(f"original_query: {original_query}, k: {k}, filters: {filters}")
     logger.info(f"{'='*50}")
     
-    if collection is None:
-        logger.error("ChromaDB 컬렉션이 없음")
+    # 벡터 검색 백엔드 (VECTOR_BACKEND: chroma | local, 첫 검색 또는 시작 작업에서 연결)
+    vector_backend = get_vector_backend()
+    facility_table = get_facility_table()
+    if vector_backend is None or facility_table is None:
+        logger.error("벡터 검색 백엔드가 없음")
         return json.dumps({
             "success": False,
-            "message": "ChromaDB 연결 실패",
+            "message": "벡터 DB 연결 실패",
             "facilities": []
         }, ensure_ascii=False)
     
     # 쿼리 텍스트는 사용자 질문 그대로 사용
     query_text = original_query
     
-    print(f"쿼리 텍스트: {query_text}")
+    logger.info(f"쿼리 텍스트: {query_text}")
     
     try:
-        # 임베딩 생성
-        print("임베딩 생성 중...")
-        query_embedding = pca_embeddings.embed_query(query_text)
-        print(f"✅ 임베딩 완료: {len(query_embedding)}차원")
+        # 임베딩 생성 (캐시 hit/miss, API 호출 시간은 trace span으로 기록)
+        # 실패하면(타임아웃, 서킷 open) BM25가 있을 때만 키워드 검색으로 계속
+        try:
+            query_embedding = pca_embeddings.embed_query(query_text)
+        except Exception as e:
+            if get_lexical_searcher() is None:
+                raise
+            logger.warning(f"⚠️ 쿼리 임베딩 실패, 키워드 검색만 사용: {e}")
+            query_embedding = None
         
-        # 벡터 검색
-        print("ChromaDB 벡터 검색 중...")
-        print(f"✅ 임베딩 완료: {len(query_embedding)}차원")
+        # 벡터 + BM25 검색
+        logger.info(f"벡터 검색 중... ({vector_backend.name}{' + BM25' if settings.HYBRID_SEARCH else ''})")
         
-        # 벡터 검색
-        print("ChromaDB 벡터 검색 중...")
+        # 위치: 사용자 좌표가 있으면 반경 필터 + 거리 재정렬, 지역 결과가 부족하면 지역 중심 반경으로 확장
+        geo = get_geo_index()
+        region_near = None
+        if geo is not None and filters.region:
+            center = geo.centroid(filters.sido, filters.sigungu)
+            if center is not None:
+                region_near = (center[0], center[1], settings.GEO_REGION_RADIUS_KM)
+        if user_location is not None and not filters.region:
+            filters.near = (user_location[0], user_location[1], settings.GEO_USER_RADIUS_KM)
         
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=k,
-            include=["metadatas", "documents", "distances"]
-        )
+        fetch_k = k * settings.GEO_CANDIDATE_MULTIPLIER if user_location is not None else k
+        results, degraded = _query_with_relaxation(query_text, query_embedding, fetch_k, filters, region_near)
         
-        logger.info(f"✅ 벡터 검색 완료: {len(results['ids'][0])}개")
+        logger.info(f"✅ {'키워드' if degraded else '벡터'} 검색 완료: {len(results['ids'])}개")
         
-        facilities = []
+        # ID → 미리 만들어 둔 시설 레코드 조인
+        records, distances = [], []
+        with span("facility_table.lookup", kind="join", ids=len(results["ids"])):
+            looked_up = facility_table.lookup(results["ids"])
+        for record, distance in zip(looked_up, results["distances"]):
+            if record is not None:
+                records.append(record)
+                distances.append(distance)
         
-        if results and results['ids'] and len(results['ids'][0]) > 0:
-            metadatas = results['metadatas'][0]
-            documents = results['documents'][0]
-            distances = results['distances'][0]
-            
-            # 유사도 높은 순으로 상위 k개 반환
-            for i, metadata in enumerate(metadatas):
-                name = metadata.get("Name", metadata.get("name", "이름없음"))
-                
-                logger.info(f"  ✅ [{i+1}] {name} (distance: {distances[i]:.4f})")
-                
-                # 좌표
-                lat = metadata.get("LAT", "37.5665")
-                lon = metadata.get("LON", "126.9780")
-                
-                try:
-                    lat = float(lat)
-                    lon = float(lon)
-                except (ValueError, TypeError):
-                    lat = 37.5665
-                    lon = 126.9780
-                
-                # 설명
-                address = metadata.get("Address", "")
-                category1 = metadata.get("Category1", "")
-                category3 = metadata.get("Category3", "")
-                
-                desc = ""
-                if i < len(documents) and documents[i]:
-                    desc = documents[i][:100]
-                elif address:
-                    desc = address[:100]
-                elif category3:
-                    desc = f"{category1} - {category3}"
-                
-                facilities.append({
-                    "name": name,
-                    "lat": lat,
-                    "lng": lon,
-                    "note": metadata.get("Note", ""),
-                    "category": category3 or category1 or "시설",
-                    "desc": desc,
-                    "distance": distances[i]
-                })
+        distances_km = [None] * len(records)
+        if user_location is not None and records:
+            records, distances, distances_km = _rank_by_distance(records, distances, user_location)
         
-        else:
-            logger.warning("⚠️  ChromaDB 결과가 비어있음")
+        # 응답에 쓰는 상위 3개만 dict로 만듦
+        facilities = []
+        for i, record in enumerate(records[:3]):
+            if distances[i] is None:
+                logger.info(f"  ✅ [{i+1}] {record.name} (BM25)")
+            else:
+                logger.info(f"  ✅ [{i+1}] {record.name} (distance: {distances[i]:.4f})")
+            facilities.append(record.to_payload(distances[i], distances_km[i]))
         
-        logger.info(f"최종 반환: {len(facilities)}개 시설")
-        facilities = facilities[:3]
+        if not facilities:
+            logger.warning("⚠️  벡터 검색 결과가 비어있음")
         
-        return json.dumps({
-            "success": True,
-            "facilities": facilities
-        }, ensure_ascii=False)
+        logger.info(f"최종 반환: {len(facilities)}개 시설 (후보 {len(records)}개)")
+        
+        payload = {"success": True, "facilities": facilities}
+        if degraded:
+            payload["degraded"] = True
+        elif facilities:
+            search_fallback_cache.set(fallback_key, payload)
+        return json.dumps(payload, ensure_ascii=False)
         
     except Exception as e:
         logger.error(f"❌ 검색 중 오류: {type(e).__name__}")
@@ -150,6 +231,11 @@ def search_facilities(
         import traceback
         logger.error(f"스택 트레이스:\n{traceback.format_exc()}")
         
+        cached = search_fallback_cache.get(fallback_key)
+        if cached is not None:
+            logger.warning("⚠️ 최근 검색 결과로 응답")
+            return json.dumps({**cached, "degraded": True}, ensure_ascii=False)
+        
         return json.dumps({
             "success": False,
             "message": f"검색 중 오류: {str(e)}",
@@ -1,46 +1,51 @@
 from langchain.tools import tool
 from models.chat_models import get_llm
-from utils.conversation_memory import get_conversation_history, get_current_conversation_id  # 추가!
+from utils.conversation_memory import (
+    get_conversation_history,
+    get_current_conversation_id,
+    get_last_search_results
+)
+from typing import Dict, List, Optional
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
-@tool
-def show_map_for_facilities(facility_indices: str = "0,1,2") -> str:
-    """
-    대화 기록에서 추천된 시설들의 지도 데이터를 생성합니다.
-    
-    Args:
-        facility_indices: 표시할 시설 인덱스 (쉼표로 구분)
-                         예: "0" = 첫 번째만
-                             "1,2" = 두 번째와 세 번째
-                             "0,1,2" = 전체 (기본값)
-    
-    Returns:
-        지도 데이터 JSON (name, lat, lng, desc 포함)
-    """
-    # 현재 conversation_id 가져오기
-    conversation_id = get_current_conversation_id()
+def _filter_by_indices(all_facilities: List[Dict], indices: List[int]) -> str:
+    """인덱스로 시설 필터링 후 도구 응답 JSON 생성"""
+    filtered_facilities = []
+    for idx in indices:
+        if 0 <= idx < len(all_facilities):
+            facility = all_facilities[idx]
+            filtered_facilities.append({
+                "name": facility["name"],
+                "lat": facility["lat"],
+                "lng": facility["lng"],
+                "desc": facility.get("desc", "")
+            })
+        else:
+            logger.warning(f"인덱스 {idx}가 범위를 벗어남 (총 {len(all_facilities)}개)")
     
-    if not conversation_id:
-        logger.error("❌ conversation_id를 찾을 수 없음")
+    if filtered_facilities:
+        logger.info(f"✅ 지도 생성 성공: {len(filtered_facilities)}개 시설 (인덱스: {indices})")
         return json.dumps({
-            "success": False,
-            "message": "대화 세션을 찾을 수 없습니다",
-            "facilities": []
+            "success": True,
+            "facilities": filtered_facilities,
+            "selected_indices": indices
         }, ensure_ascii=False)
     
-    logger.info(f"지도 생성 도구 호출: conversation_id={conversation_id}, indices={facility_indices}")
-    
-    # 인덱스 파싱
-    try:
-        indices = [int(idx.strip()) for idx in facility_indices.split(",")]
-        logger.info(f"요청된 시설 인덱스: {indices}")
-    except:
-        indices = [0, 1, 2]  # 기본값
-        logger.warning(f"인덱스 파싱 실패, 기본값 사용: {indices}")
-    
+    logger.warning("⚠️ 필터링 후 시설이 없음")
+    return json.dumps({
+        "success": False,
+        "message": "요청한 인덱스에 해당하는 시설이 없습니다",
+        "facilities": []
+    }, ensure_ascii=False)
+
+def _extract_facilities_with_llm(conversation_id: str) -> Optional[List[Dict]]:
+    """
+    저장된 검색 결과가 없을 때만 사용하는 fallback
+    대화 기록 전체를 LLM에 넘겨 시설 정보를 다시 추출
+    """
     # conversation_id로 직접 히스토리 가져오기
     chat_history = get_conversation_history(conversation_id)
     
@@ -50,8 +55,7 @@ def show_map_for_facilities(facility_indices: str = "0,1,2") -> str:
         for msg in chat_history
     ])
     
-    print("show_map에서 보는 conversation_id:", conversation_id)
-    print("show_map에서 보는 chat_history 메시지 수:", len(chat_history))
+    logger.debug(f"LLM 추출 fallback: conversation_id={conversation_id}, 메시지 {len(chat_history)}개")
     
     llm = get_llm()
     
@@ -93,39 +97,65 @@ def show_map_for_facilities(facility_indices: str = "0,1,2") -> str:
   "facilities": []
 }}
 """
+
+    response = llm.invoke(prompt)
+    content = response.content if hasattr(response, 'content') else str(response)
+    content = content.replace("```json", "").replace("```", "").strip()
+    
+    result = json.loads(content)
+    
+    if result.get("success") and result.get("facilities"):
+        return result.get("facilities", [])
+    return None
+
+@tool
+def show_map_for_facilities(facility_indices: str = "0,1,2") -> str:
+    """
+    대화 기록에서 추천된 시설들의 지도 데이터를 생성합니다.
+    
+    Args:
+        facility_indices: 표시할 시설 인덱스 (쉼표로 구분)
+                         예: "0" = 첫 번째만
+                             "1,2" = 두 번째와 세 번째
+                             "0,1,2" = 전체 (기본값)
+    
+    Returns:
+        지도 데이터 JSON (name, lat, lng, desc 포함)
+    """
+    # 현재 conversation_id 가져오기
+    conversation_id = get_current_conversation_id()
+    
+    if not conversation_id:
+        logger.error("❌ conversation_id를 찾을 수 없음")
+        return json.dumps({
+            "success": False,
+            "message": "대화 세션을 찾을 수 없습니다",
+            "facilities": []
+        }, ensure_ascii=False)
+    
+    logger.info(f"지도 생성 도구 호출: conversation_id={conversation_id}, indices={facility_indices}")
     
+    # 인덱스 파싱
     try:
-        response = llm.invoke(prompt)
-        content = response.content if hasattr(response, 'content') else str(response)
-        content = content.replace("```json", "").replace("```", "").strip()
-        
-        result = json.loads(content)
+        indices = [int(idx.strip()) for idx in facility_indices.split(",")]
+        logger.info(f"요청된 시설 인덱스: {indices}")
+    except:
+        indices = [0, 1, 2]  # 기본값
+        logger.warning(f"인덱스 파싱 실패, 기본값 사용: {indices}")
+    
+    # 1) 저장된 검색 결과에서 바로 조회 (LLM 호출 없음)
+    stored_facilities = get_last_search_results(conversation_id)
+    if stored_facilities:
+        logger.info(f"저장된 검색 결과 사용: {len(stored_facilities)}개 시설")
+        return _filter_by_indices(stored_facilities, indices)
+    
+    # 2) 구조화된 결과가 없으면 대화 기록에서 LLM으로 추출
+    logger.info("저장된 검색 결과 없음 → LLM 추출로 fallback")
+    try:
+        all_facilities = _extract_facilities_with_llm(conversation_id)
         
-        if result.get("success") and result.get("facilities"):
-            all_facilities = result.get("facilities", [])
-            
-            # 인덱스로 필터링
-            filtered_facilities = []
-            for idx in indices:
-                if 0 <= idx < len(all_facilities):
-                    filtered_facilities.append(all_facilities[idx])
-                else:
-                    logger.warning(f"인덱스 {idx}가 범위를 벗어남 (총 {len(all_facilities)}개)")
-            
-            if filtered_facilities:
-                logger.info(f"✅ 지도 생성 성공: {len(filtered_facilities)}개 시설 (인덱스: {indices})")
-                return json.dumps({
-                    "success": True,
-                    "facilities": filtered_facilities,
-                    "selected_indices": indices
-                }, ensure_ascii=False)
-            else:
-                logger.warning("⚠️ 필터링 후 시설이 없음")
-                return json.dumps({
-                    "success": False,
-                    "message": "요청한 인덱스에 해당하는 시설이 없습니다",
-                    "facilities": []
-                }, ensure_ascii=False)
+        if all_facilities:
+            return _filter_by_indices(all_facilities, indices)
         else:
             logger.warning("⚠️ 추출된 시설이 없음")
             return json.dumps({
@@ -140,4 +170,4 @@ def show_map_for_facilities(facility_indices: str = "0,1,2") -> str:
             "success": False,
             "message": f"지도 생성 중 오류: {str(e)}",
             "facilities": []
-        }, ensure_ascii=False)
\ No newline at end of file
+        }, ensure_ascii=False)
@@ -1,8 +1,105 @@
 from langchain.tools import tool
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import settings  # 수정
+from utils.cache import TTLCache
+from utils.resilience import DependencyError, guarded_call
+from utils.tracing import record_cache, span
 from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
 import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"
+
+class WeatherUnavailableError(Exception):
+    """OpenWeatherMap 응답 실패"""
+
+def _create_session() -> requests.Session:
+    """커넥션 풀 + 재시도가 설정된 공유 세션"""
+    session = requests.Session()
+    retry = Retry(
+        total=settings.WEATHER_MAX_RETRIES,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"]
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=settings.TOOL_THREAD_POOL_SIZE,
+        max_retries=retry
+    )
+    session.mount("https://", adapter)
+    return session
+
+_session = _create_session()
+
+# (도시, 예보 발행 구간) → 5일/3시간 예보 리스트
+# 같은 구간 안에서는 모든 사용자에게 같은 예보이므로 공유
+forecast_cache = TTLCache(
+    ttl_seconds=settings.WEATHER_CACHE_TTL_SECONDS,
+    max_entries=256,
+    name="weather_forecast",
+    on_lookup=lambda hit: record_cache("weather_forecast", hit)
+)
+
+# 도시별 마지막으로 받은 예보 (API 장애 시 WEATHER_STALE_SECONDS 안이면 이걸로 응답)
+# 5일치 예보라 몇 시간 지난 것도 오늘/내일 판단에는 충분함
+_last_forecasts: Dict[str, Tuple[float, List[Dict]]] = {}
+
+# 재시도까지 포함한 전체 제한 시간 (requests timeout은 시도별 connect/read 기준)
+_FETCH_DEADLINE_SECONDS = settings.WEATHER_TIMEOUT_SECONDS * (settings.WEATHER_MAX_RETRIES + 1)
+
+def _fetch_forecast(english_city: str) -> List[Dict]:
+    """OpenWeatherMap 5일 예보 조회 (캐시 miss일 때만 호출됨)"""
+    params = {
+        "q": f"{english_city},KR",
+        "appid": settings.OPENWEATHER_API_KEY,
+        "lang": "kr",
+        "units": "metric"
+    }
+    
+    with span("openweathermap.forecast", kind="http", city=english_city) as s:
+        response = _session.get(FORECAST_URL, params=params, timeout=settings.WEATHER_TIMEOUT_SECONDS)
+        s.set("status", response.status_code)
+    if response.status_code != 200:
+        raise WeatherUnavailableError(f"status={response.status_code}")
+    
+    logger.info(f"날씨 예보 조회: {english_city}")
+    forecast_list = response.json()["list"]
+    _last_forecasts[english_city] = (time.time(), forecast_list)
+    return forecast_list
+
+def get_forecast_list(english_city: str) -> List[Dict]:
+    """
+    캐시된 예보 반환 (동시 요청은 한 번의 upstream 호출을 공유)
+    
+    API가 느리거나 실패하면(서킷 open 포함) 최근 예보로 대신 응답하고,
+    그것도 없으면 예외를 그대로 올려 날씨 없이 진행하게 함
+    """
+    window = int(time.time() // settings.WEATHER_FORECAST_WINDOW_SECONDS)
+    try:
+        return forecast_cache.get_or_load(
+            (english_city, window),
+            lambda: guarded_call(
+                "openweathermap", _fetch_forecast, english_city,
+                timeout=_FETCH_DEADLINE_SECONDS
+            )
+        )
+    except (DependencyError, WeatherUnavailableError, requests.RequestException) as e:
+        fetched_at, forecast_list = _last_forecasts.get(english_city, (0.0, None))
+        if forecast_list is None or time.time() - fetched_at > settings.WEATHER_STALE_SECONDS:
+            raise
+        logger.warning(f"⚠️ 날씨 API 실패, {(time.time() - fetched_at) / 60:.0f}분 전 예보 사용 ({english_city}): {e}")
+        return forecast_list
+
+def get_weather_cache_stats() -> Dict:
+    """날씨 캐시 hit/miss 지표"""
+    return forecast_cache.stats()
 
 def get_target_datetime(date_str: str) -> datetime:
     """날짜 문자열을 datetime으로 변환"""
@@ -51,24 +148,15 @@ def get_weather_forecast(city_name: str, date: str = "today") -> str:
     
     english_city = city_mapping.get(city_name, city_name)
     
-    url = "https://api.openweathermap.org/data/2.5/forecast"
-    params = {
-        "q": f"{english_city},KR",
-        "appid": settings.OPENWEATHER_API_KEY,
-        "lang": "kr",
-        "units": "metric"
-    }
-    
-    response = requests.get(url, params=params)
-    if response.status_code != 200:
+    try:
+        forecast_list = get_forecast_list(english_city)
+    except (DependencyError, WeatherUnavailableError, requests.RequestException, KeyError, ValueError) as e:
+        logger.error(f"날씨 조회 실패 ({english_city}): {e}")
         return json.dumps({
             "success": False,
             "message": f"날씨 정보를 가져올 수 없습니다: {city_name}"
         }, ensure_ascii=False)
     
-    data = response.json()
-    forecast_list = data["list"]
-    
     target_datetime = get_target_datetime(date)
     target_date_str = target_datetime.strftime("%Y-%m-%d")
     
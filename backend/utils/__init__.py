@@ -6,12 +6,14 @@ from .conversation_memory import (
     get_conversation_history,
     add_message,
     clear_conversation,
-    get_all_conversations
+    get_all_conversations,
+    get_conversation_store_stats
 )
 
 __all__ = [
     "get_conversation_history",
     "add_message",
     "clear_conversation",
-    "get_all_conversations"
+    "get_all_conversations",
+    "get_conversation_store_stats"
 ]
\ No newline at end of file
@@ -0,0 +1,197 @@
+"""
+/api/chat 입장 제어 (admission control)
+
+턴 하나가 LLM을 여러 번 부르므로, 동시에 처리하는 턴 수를 제한하지 않으면
+트래픽이 몰릴 때 OpenAI rate limit에 걸리고 모든 요청이 같이 느려짐
+
+- 동시 처리 턴 수 max_concurrent, 넘으면 대기열 (최대 max_queue개, queue_timeout초)
+- 대기열이 꽉 찼거나 대기 시간이 지나면 바로 503 + Retry-After
+- 같은 conversation_id의 턴은 순서대로 하나씩 (대화 히스토리 경쟁 방지),
+  처리 중인 턴 뒤에 max_pending_per_conversation개보다 많이 쌓이면 429 + Retry-After
+
+상태는 이벤트 루프 스레드에서만 바뀌므로 별도 락이 필요 없음
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+import asyncio
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """입장 거절 (status_code: 429 | 503, retry_after: 초)"""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Conversation:
+    __slots__ = ("lock", "holders")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.holders = 0  # 처리 중 + 대기 중인 턴 수
+
+
+class AdmissionTicket:
+    """입장한 턴 (release는 여러 번 불러도 한 번만 반영)"""
+
+    def __init__(self, controller: "AdmissionController", conversation_id: str, wait_seconds: float):
+        self.controller = controller
+        self.conversation_id = conversation_id
+        self.wait_seconds = wait_seconds
+        self.admitted_at = time.perf_counter()
+        self._released = False
+
+    def release(self):
+        if self._released:
+            return
+        self._released = True
+        self.controller._release(self)
+
+
+class AdmissionController:
+    """동시 처리 턴 수 / 대기열 길이 / 대화별 순서 보장"""
+
+    # 평균 처리 시간 EWMA 가중치 (Retry-After 추정용)
+    SERVICE_EWMA_ALPHA = 0.1
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        max_pending_per_conversation: int = 1
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_pending_per_conversation = max_pending_per_conversation
+
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._conversations: Dict[str, _Conversation] = {}
+        self._in_flight = 0
+        self._queued = 0
+        self._service_avg = 1.0
+        self._stats = {
+            "admitted": 0,
+            "rejected_queue_full": 0,
+            "rejected_queue_timeout": 0,
+            "rejected_conversation_busy": 0,
+            "queue_wait_sum": 0.0,
+            "queue_wait_max": 0.0,
+        }
+
+    def _retry_after(self) -> int:
+        """대기열이 빠지는 데 걸릴 시간 추정 (평균 처리 시간 × 앞에 있는 턴 / 동시 처리 수)"""
+        estimate = self._service_avg * (self._queued + 1) / self.max_concurrent
+        return max(1, min(60, math.ceil(estimate)))
+
+    def _reject(self, status_code: int, reason: str, stat: str, retry_after: int):
+        self._stats[stat] += 1
+        logger.warning(f"🚦 요청 거절 ({status_code} {reason}): 처리 중 {self._in_flight}, 대기 {self._queued}")
+        raise AdmissionRejected(status_code, reason, retry_after)
+
+    async def acquire(self, conversation_id: str) -> AdmissionTicket:
+        """
+        입장할 때까지 대기 후 AdmissionTicket 반환 (턴이 끝나면 ticket.release())
+        거절되면 AdmissionRejected
+        """
+        conversation = self._conversations.get(conversation_id)
+        if conversation is not None and conversation.holders > self.max_pending_per_conversation:
+            self._reject(429, "같은 대화의 이전 메시지를 처리 중입니다", "rejected_conversation_busy",
+                         max(1, math.ceil(self._service_avg)))
+
+        # 처리 중 + 대기 중 합계로 판단 (대기 중인 턴은 아직 슬롯을 잡기 전일 수 있음)
+        if self._in_flight + self._queued >= self.max_concurrent + self.max_queue:
+            self._reject(503, "요청이 많아 잠시 후 다시 시도해주세요", "rejected_queue_full", self._retry_after())
+
+        if conversation is None:
+            conversation = self._conversations[conversation_id] = _Conversation()
+        conversation.holders += 1
+
+        start = time.perf_counter()
+        deadline = start + self.queue_timeout
+        self._queued += 1
+        locked = False
+        try:
+            # 대화 순서 → 전체 슬롯 순서로 잡음 (대화 하나가 슬롯을 둘 이상 잡지 않음)
+            await asyncio.wait_for(conversation.lock.acquire(), timeout=max(0.0, deadline - time.perf_counter()))
+            locked = True
+            await asyncio.wait_for(self._slots.acquire(), timeout=max(0.0, deadline - time.perf_counter()))
+        except asyncio.TimeoutError:
+            if locked:
+                conversation.lock.release()
+            self._leave_conversation(conversation_id, conversation)
+            self._reject(503, "대기 시간이 초과되었습니다", "rejected_queue_timeout", self._retry_after())
+        except BaseException:
+            # 클라이언트 연결 끊김 등으로 취소
+            if locked:
+                conversation.lock.release()
+            self._leave_conversation(conversation_id, conversation)
+            raise
+        finally:
+            self._queued -= 1
+
+        wait_seconds = time.perf_counter() - start
+        self._in_flight += 1
+        self._stats["admitted"] += 1
+        self._stats["queue_wait_sum"] += wait_seconds
+        self._stats["queue_wait_max"] = max(self._stats["queue_wait_max"], wait_seconds)
+        return AdmissionTicket(self, conversation_id, wait_seconds)
+
+    def _leave_conversation(self, conversation_id: str, conversation: _Conversation):
+        conversation.holders -= 1
+        if conversation.holders == 0:
+            self._conversations.pop(conversation_id, None)
+
+    def _release(self, ticket: AdmissionTicket):
+        service = time.perf_counter() - ticket.admitted_at
+        self._service_avg += self.SERVICE_EWMA_ALPHA * (service - self._service_avg)
+        self._in_flight -= 1
+        self._slots.release()
+        conversation = self._conversations.get(ticket.conversation_id)
+        if conversation is not None:
+            conversation.lock.release()
+            self._leave_conversation(ticket.conversation_id, conversation)
+
+    @asynccontextmanager
+    async def admit(self, conversation_id: str) -> AsyncIterator[AdmissionTicket]:
+        """async with controller.admit(conversation_id) as ticket: ..."""
+        ticket = await self.acquire(conversation_id)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def stats(self) -> Dict:
+        admitted = self._stats["admitted"]
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queued": self._queued,
+            "active_conversations": len(self._conversations),
+            **self._stats,
+            "queue_wait_avg": self._stats["queue_wait_sum"] / admitted if admitted else 0.0,
+            "service_avg": self._service_avg,
+        }
+
+
+def create_admission_controller(settings) -> Optional[AdmissionController]:
+    """설정에 맞는 입장 제어 (ADMISSION_ENABLED=False면 None)"""
+    if not settings.ADMISSION_ENABLED:
+        return None
+    return AdmissionController(
+        max_concurrent=settings.ADMISSION_MAX_CONCURRENT,
+        max_queue=settings.ADMISSION_MAX_QUEUE,
+        queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        max_pending_per_conversation=settings.ADMISSION_MAX_PENDING_PER_CONVERSATION
+    )
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Flight:
+    """진행 중인 로드 (같은 키의 동시 요청이 결과를 기다림)"""
+    __slots__ = ("event", "value", "error")
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """
+    스레드 안전 TTL + LRU 캐시
+    - get_or_load: single-flight (같은 키를 동시에 요청하면 로더는 한 번만 실행)
+    - 로더가 예외를 던지면 캐시하지 않고 기다리던 호출 모두에 같은 예외 전달
+    - on_lookup(hit): 조회마다 호출 (소유자가 지표 기록 등에 사용, 락 밖에서 호출)
+    """
+    
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int = 1024,
+        name: str = "cache",
+        on_lookup: Optional[Callable[[bool], None]] = None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.name = name
+        self.on_lookup = on_lookup
+        
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "coalesced": 0, "load_errors": 0}
+    
+    def _get_locked(self, key: Hashable):
+        entry = self._data.get(key)
+        if entry is None:
+            return None, False
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return None, False
+        self._data.move_to_end(key)
+        return value, True
+    
+    def _set_locked(self, key: Hashable, value: Any, ttl: Optional[float]):
+        self._data[key] = (time.monotonic() + (self.ttl_seconds if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            value, found = self._get_locked(key)
+            self._stats["hits" if found else "misses"] += 1
+        if self.on_lookup is not None:
+            self.on_lookup(found)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """캐시 저장 (ttl 생략 시 기본 TTL)"""
+        with self._lock:
+            self._set_locked(key, value, ttl)
+    
+    def get_or_load(self, key: Hashable, loader: Callable[[], T], ttl: Optional[float] = None) -> T:
+        """캐시에 없으면 loader 실행 후 저장 (동시 요청은 하나의 loader 결과를 공유)"""
+        with self._lock:
+            value, found = self._get_locked(key)
+            if found:
+                self._stats["hits"] += 1
+            else:
+                self._stats["misses"] += 1
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = _Flight()
+                    self._inflight[key] = flight
+                else:
+                    self._stats["coalesced"] += 1
+        
+        if self.on_lookup is not None:
+            self.on_lookup(found)
+        if found:
+            return value
+        
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        
+        try:
+            flight.value = loader()
+            with self._lock:
+                self._stats["loads"] += 1
+                self._set_locked(key, flight.value, ttl)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._stats["load_errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+    
+    def stats(self) -> Dict:
+        """hit/miss/single-flight 지표"""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "name": self.name,
+                **self._stats,
+                "entries": len(self._data),
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            }
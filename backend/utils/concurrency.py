@@ -0,0 +1,55 @@
+import asyncio
+import contextvars
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 블로킹 호출 전용 스레드 풀 (요청 수와 무관하게 크기 고정)
+_executor: Optional[ThreadPoolExecutor] = None
+
+def get_executor() -> ThreadPoolExecutor:
+    """공유 스레드 풀 가져오기 (없으면 생성)"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.TOOL_THREAD_POOL_SIZE,
+            thread_name_prefix="blocking-tool"
+        )
+        logger.info(f"블로킹 작업 스레드 풀 생성: {settings.TOOL_THREAD_POOL_SIZE}개")
+    return _executor
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    블로킹 함수를 스레드 풀에서 실행 (이벤트 루프를 막지 않음)
+    
+    contextvars를 복사해서 넘기므로 요청 단위 상태가 스레드에서도 유지됩니다.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), call)
+
+def install_default_executor(loop: Optional[asyncio.AbstractEventLoop] = None):
+    """
+    이벤트 루프의 기본 executor를 공유 스레드 풀로 교체
+    
+    LangChain은 async 구현이 없는 도구를 loop.run_in_executor(None, ...)로 실행하므로,
+    AgentExecutor.ainvoke 안의 동기 도구들도 이 풀의 크기로 제한됩니다.
+    """
+    loop = loop or asyncio.get_running_loop()
+    loop.set_default_executor(get_executor())
+    logger.info("기본 executor를 공유 스레드 풀로 설정")
+
+def shutdown_executor():
+    """스레드 풀 종료"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        logger.info("블로킹 작업 스레드 풀 종료")
@@ -1,78 +1,112 @@
-from typing import Dict, List, Optional
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional, Tuple
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from config import settings
+from utils.conversation_store import ConversationStore, create_conversation_store
 import logging
-import json
 
 logger = logging.getLogger(__name__)
 
-# 메모리에 대화 히스토리 저장
-conversation_history: Dict[str, List] = {}
+# 대화 히스토리 + 마지막 검색 결과 저장소 (CONVERSATION_STORE 설정으로 선택)
+conversation_store: ConversationStore = create_conversation_store(settings)
 
-# 마지막 검색 결과 저장 (conversation_id -> facilities)
-last_search_results: Dict[str, List[Dict]] = {}
+# 현재 요청의 conversation_id (요청/태스크 단위로 격리)
+# asyncio 태스크마다 컨텍스트가 분리되고, 도구 스레드로는 컨텍스트가 복사되어 전달됨
+_current_conversation_id: ContextVar[Optional[str]] = ContextVar(
+    "current_conversation_id", default=None
+)
 
-# 현재 실행 중인 conversation_id 저장 (추가!)
-_current_conversation_id: Optional[str] = None
-
-def set_current_conversation_id(conversation_id: str):
-    """현재 실행 중인 conversation_id 설정"""
-    global _current_conversation_id
-    _current_conversation_id = conversation_id
+def set_current_conversation_id(conversation_id: str) -> Token:
+    """현재 요청의 conversation_id 설정 (reset용 토큰 반환)"""
+    token = _current_conversation_id.set(conversation_id)
     logger.info(f"현재 conversation_id 설정: {conversation_id}")
+    return token
+
+def reset_current_conversation_id(token: Token):
+    """set_current_conversation_id 이전 상태로 복원"""
+    _current_conversation_id.reset(token)
 
 def get_current_conversation_id() -> Optional[str]:
-    """현재 실행 중인 conversation_id 가져오기"""
-    return _current_conversation_id
+    """현재 요청의 conversation_id 가져오기"""
+    return _current_conversation_id.get()
+
+# 현재 요청의 아이 나이 (ChatRequest.child_age → search_facilities 나이 필터)
+_current_child_age: ContextVar[Optional[int]] = ContextVar(
+    "current_child_age", default=None
+)
+
+def set_current_child_age(child_age: Optional[int]) -> Token:
+    """현재 요청의 아이 나이 설정 (reset용 토큰 반환)"""
+    return _current_child_age.set(child_age)
+
+def reset_current_child_age(token: Token):
+    """set_current_child_age 이전 상태로 복원"""
+    _current_child_age.reset(token)
+
+def get_current_child_age() -> Optional[int]:
+    """현재 요청의 아이 나이 가져오기"""
+    return _current_child_age.get()
+
+# 현재 요청의 사용자 좌표 (ChatRequest.latitude/longitude → search_facilities 거리 정렬)
+_current_user_location: ContextVar[Optional[Tuple[float, float]]] = ContextVar(
+    "current_user_location", default=None
+)
+
+def set_current_user_location(location: Optional[Tuple[float, float]]) -> Token:
+    """현재 요청의 사용자 좌표 (lat, lng) 설정 (reset용 토큰 반환)"""
+    return _current_user_location.set(location)
+
+def reset_current_user_location(token: Token):
+    """set_current_user_location 이전 상태로 복원"""
+    _current_user_location.reset(token)
+
+def get_current_user_location() -> Optional[Tuple[float, float]]:
+    """현재 요청의 사용자 좌표 가져오기"""
+    return _current_user_location.get()
 
 def get_conversation_history(conversation_id: str) -> List:
-    """대화 히스토리 가져오기"""
-    if conversation_id not in conversation_history:
-        conversation_history[conversation_id] = []
+    """대화 히스토리 가져오기 (복사본)"""
+    messages = conversation_store.get_messages(conversation_id)
+    if not messages:
         logger.info(f"새로운 대화 시작: {conversation_id}")
     else:
-        logger.info(f"기존 대화 로드: {conversation_id} ({len(conversation_history[conversation_id])}개 메시지)")
+        logger.info(f"기존 대화 로드: {conversation_id} ({len(messages)}개 메시지)")
     
-    return conversation_history[conversation_id]
+    return messages
 
 def add_message(conversation_id: str, role: str, content: str):
     """메시지 추가"""
-    if conversation_id not in conversation_history:
-        conversation_history[conversation_id] = []
-    
     if role == "user":
-        conversation_history[conversation_id].append(HumanMessage(content=content))
+        message = HumanMessage(content=content)
     elif role == "ai":
-        conversation_history[conversation_id].append(AIMessage(content=content))
+        message = AIMessage(content=content)
     elif role == "search_result":
-        conversation_history[conversation_id].append(SystemMessage(content=content))
+        message = SystemMessage(content=content)
+    else:
+        logger.warning(f"알 수 없는 role 무시: {role}")
+        return
     
+    conversation_store.append_message(conversation_id, message)
     logger.info(f"메시지 추가: {conversation_id} - {role}: {content[:100]}...")
 
 def save_search_results(conversation_id: str, facilities: List[Dict]):
     """검색 결과 저장"""
-    last_search_results[conversation_id] = facilities
-    
-    # 시스템 메시지로도 저장 (Agent가 참조할 수 있게)
-    facilities_summary = json.dumps(facilities, ensure_ascii=False)
-    
-    
+    conversation_store.set_search_results(conversation_id, facilities)
     logger.info(f"검색 결과 저장: {conversation_id} - {len(facilities)}개 시설")
 
 def get_last_search_results(conversation_id: str) -> Optional[List[Dict]]:
     """마지막 검색 결과 가져오기"""
-    return last_search_results.get(conversation_id)
+    return conversation_store.get_search_results(conversation_id)
 
 def clear_conversation(conversation_id: str):
     """대화 히스토리 삭제"""
-    if conversation_id in conversation_history:
-        del conversation_history[conversation_id]
-    if conversation_id in last_search_results:
-        del last_search_results[conversation_id]
+    conversation_store.delete(conversation_id)
     logger.info(f"대화 삭제: {conversation_id}")
 
 def get_all_conversations() -> Dict:
     """모든 대화 ID 목록"""
-    return {
-        conv_id: len(messages) 
-        for conv_id, messages in conversation_history.items()
-    }
\ No newline at end of file
+    return conversation_store.list_conversations()
+
+def get_conversation_store_stats() -> Dict:
+    """대화 저장소 상태 (대화 수, 메모리 사용량, eviction 횟수)"""
+    return conversation_store.stats()
@@ -0,0 +1,386 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 메시지 타입 <-> 메시지 클래스 (직렬화용)
+MESSAGE_CLASSES = {
+    "human": HumanMessage,
+    "ai": AIMessage,
+    "system": SystemMessage,
+}
+
+def _message_from_row(message_type: str, content: str) -> BaseMessage:
+    return MESSAGE_CLASSES.get(message_type, SystemMessage)(content=content)
+
+def _estimate_bytes(obj) -> int:
+    """메모리 사용량 추정 (문자열 길이 기준 근사치)"""
+    if isinstance(obj, BaseMessage):
+        return sys.getsizeof(obj.content) + 64
+    return len(json.dumps(obj, ensure_ascii=False).encode("utf-8")) + 64
+
+
+class ConversationStore(ABC):
+    """대화 히스토리 + 마지막 검색 결과 저장소"""
+    
+    @abstractmethod
+    def get_messages(self, conversation_id: str) -> List[BaseMessage]:
+        """메시지 목록 (복사본) 반환, 없으면 빈 리스트"""
+    
+    @abstractmethod
+    def append_message(self, conversation_id: str, message: BaseMessage):
+        """메시지 추가 (대화별 최대 개수 초과 시 오래된 것부터 삭제)"""
+    
+    @abstractmethod
+    def set_search_results(self, conversation_id: str, facilities: List[Dict]):
+        """마지막 검색 결과 저장"""
+    
+    @abstractmethod
+    def get_search_results(self, conversation_id: str) -> Optional[List[Dict]]:
+        """마지막 검색 결과 반환"""
+    
+    @abstractmethod
+    def delete(self, conversation_id: str):
+        """대화 삭제"""
+    
+    @abstractmethod
+    def list_conversations(self) -> Dict[str, int]:
+        """conversation_id -> 메시지 수"""
+    
+    @abstractmethod
+    def stats(self) -> Dict:
+        """저장소 상태 (대화 수, 메모리, eviction 횟수 등)"""
+
+
+class _Conversation:
+    __slots__ = ("messages", "search_results", "last_access", "size_bytes")
+    
+    def __init__(self):
+        self.messages: List[BaseMessage] = []
+        self.search_results: Optional[List[Dict]] = None
+        self.last_access = time.monotonic()
+        self.size_bytes = 0
+
+
+class InMemoryConversationStore(ConversationStore):
+    """
+    프로세스 메모리 저장소
+    - LRU: 대화 수 / 전체 바이트 한도 초과 시 가장 오래 안 쓴 대화부터 삭제
+    - TTL: 마지막 접근 후 ttl_seconds 지나면 삭제
+    - 대화별 메시지 수 제한
+    """
+    
+    def __init__(
+        self,
+        max_conversations: int,
+        ttl_seconds: float,
+        max_messages: int,
+        max_total_bytes: int
+    ):
+        self.max_conversations = max_conversations
+        self.ttl_seconds = ttl_seconds
+        self.max_messages = max_messages
+        self.max_total_bytes = max_total_bytes
+        
+        self._conversations: "OrderedDict[str, _Conversation]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._total_bytes = 0
+        self._evictions = {"lru": 0, "ttl": 0, "bytes": 0}
+    
+    def _touch(self, conversation_id: str, create: bool) -> Optional[_Conversation]:
+        conv = self._conversations.get(conversation_id)
+        now = time.monotonic()
+        if conv is not None and now - conv.last_access > self.ttl_seconds:
+            self._remove(conversation_id, reason="ttl")
+            conv = None
+        if conv is None:
+            if not create:
+                return None
+            conv = _Conversation()
+            self._conversations[conversation_id] = conv
+        conv.last_access = now
+        self._conversations.move_to_end(conversation_id)
+        return conv
+    
+    def _remove(self, conversation_id: str, reason: Optional[str] = None):
+        conv = self._conversations.pop(conversation_id, None)
+        if conv is None:
+            return
+        self._total_bytes -= conv.size_bytes
+        if reason:
+            self._evictions[reason] += 1
+            logger.info(f"대화 eviction ({reason}): {conversation_id}")
+    
+    def _evict(self):
+        now = time.monotonic()
+        # OrderedDict 앞쪽이 가장 오래 안 쓴 대화
+        while self._conversations:
+            oldest_id, oldest = next(iter(self._conversations.items()))
+            if now - oldest.last_access > self.ttl_seconds:
+                self._remove(oldest_id, reason="ttl")
+            elif len(self._conversations) > self.max_conversations:
+                self._remove(oldest_id, reason="lru")
+            elif self._total_bytes > self.max_total_bytes and len(self._conversations) > 1:
+                self._remove(oldest_id, reason="bytes")
+            else:
+                break
+    
+    def _resize(self, conv: _Conversation, delta: int):
+        conv.size_bytes += delta
+        self._total_bytes += delta
+    
+    def get_messages(self, conversation_id: str) -> List[BaseMessage]:
+        with self._lock:
+            conv = self._touch(conversation_id, create=False)
+            return list(conv.messages) if conv else []
+    
+    def append_message(self, conversation_id: str, message: BaseMessage):
+        with self._lock:
+            conv = self._touch(conversation_id, create=True)
+            conv.messages.append(message)
+            self._resize(conv, _estimate_bytes(message))
+            while len(conv.messages) > self.max_messages:
+                dropped = conv.messages.pop(0)
+                self._resize(conv, -_estimate_bytes(dropped))
+            self._evict()
+    
+    def set_search_results(self, conversation_id: str, facilities: List[Dict]):
+        with self._lock:
+            conv = self._touch(conversation_id, create=True)
+            if conv.search_results is not None:
+                self._resize(conv, -_estimate_bytes(conv.search_results))
+            conv.search_results = facilities
+            self._resize(conv, _estimate_bytes(facilities))
+            self._evict()
+    
+    def get_search_results(self, conversation_id: str) -> Optional[List[Dict]]:
+        with self._lock:
+            conv = self._touch(conversation_id, create=False)
+            return conv.search_results if conv else None
+    
+    def delete(self, conversation_id: str):
+        with self._lock:
+            self._remove(conversation_id)
+    
+    def list_conversations(self) -> Dict[str, int]:
+        with self._lock:
+            self._evict()
+            return {conv_id: len(conv.messages) for conv_id, conv in self._conversations.items()}
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "conversations": len(self._conversations),
+                "total_bytes": self._total_bytes,
+                "max_total_bytes": self.max_total_bytes,
+                "evictions": dict(self._evictions),
+            }
+
+
+class SQLiteConversationStore(ConversationStore):
+    """
+    SQLite 저장소 (재시작 후에도 유지, 같은 호스트의 여러 uvicorn 워커가 공유)
+    - WAL 모드로 여러 프로세스의 동시 읽기/쓰기 허용
+    - TTL/LRU 정리는 쓰기 N회마다 실행
+    """
+    
+    PURGE_EVERY = 100
+    
+    def __init__(
+        self,
+        path: str,
+        max_conversations: int,
+        ttl_seconds: float,
+        max_messages: int
+    ):
+        self.path = path
+        self.max_conversations = max_conversations
+        self.ttl_seconds = ttl_seconds
+        self.max_messages = max_messages
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._evictions = {"lru": 0, "ttl": 0}
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS conversations (
+                id TEXT PRIMARY KEY,
+                search_results TEXT,
+                last_access REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS messages (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                conversation_id TEXT NOT NULL,
+                type TEXT NOT NULL,
+                content TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages(conversation_id, seq);
+            CREATE INDEX IF NOT EXISTS idx_conversations_access ON conversations(last_access);
+        """)
+        self._conn.commit()
+        logger.info(f"SQLite 대화 저장소 사용: {path}")
+    
+    def _is_expired(self, last_access: float) -> bool:
+        return time.time() - last_access > self.ttl_seconds
+    
+    def _touch(self, conversation_id: str):
+        self._conn.execute(
+            "INSERT INTO conversations (id, last_access) VALUES (?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET last_access = excluded.last_access",
+            (conversation_id, time.time())
+        )
+    
+    def _delete(self, conversation_id: str):
+        self._conn.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation_id,))
+        self._conn.execute("DELETE FROM conversations WHERE id = ?", (conversation_id,))
+    
+    def _after_write(self):
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self._purge()
+        self._conn.commit()
+    
+    def _purge(self):
+        cutoff = time.time() - self.ttl_seconds
+        expired = [row[0] for row in self._conn.execute(
+            "SELECT id FROM conversations WHERE last_access < ?", (cutoff,)
+        )]
+        overflow = [row[0] for row in self._conn.execute(
+            "SELECT id FROM conversations WHERE last_access >= ? "
+            "ORDER BY last_access DESC LIMIT -1 OFFSET ?",
+            (cutoff, self.max_conversations)
+        )]
+        for conversation_id in expired:
+            self._delete(conversation_id)
+        for conversation_id in overflow:
+            self._delete(conversation_id)
+        self._evictions["ttl"] += len(expired)
+        self._evictions["lru"] += len(overflow)
+        if expired or overflow:
+            logger.info(f"대화 정리: ttl {len(expired)}개, lru {len(overflow)}개")
+    
+    def _load_conversation(self, conversation_id: str):
+        row = self._conn.execute(
+            "SELECT search_results, last_access FROM conversations WHERE id = ?",
+            (conversation_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        if self._is_expired(row[1]):
+            self._delete(conversation_id)
+            self._evictions["ttl"] += 1
+            self._conn.commit()
+            return None
+        return row
+    
+    def get_messages(self, conversation_id: str) -> List[BaseMessage]:
+        with self._lock:
+            if self._load_conversation(conversation_id) is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT type, content FROM messages WHERE conversation_id = ? ORDER BY seq",
+                (conversation_id,)
+            ).fetchall()
+            self._touch(conversation_id)
+            self._conn.commit()
+            return [_message_from_row(message_type, content) for message_type, content in rows]
+    
+    def append_message(self, conversation_id: str, message: BaseMessage):
+        with self._lock:
+            self._load_conversation(conversation_id)
+            self._touch(conversation_id)
+            self._conn.execute(
+                "INSERT INTO messages (conversation_id, type, content) VALUES (?, ?, ?)",
+                (conversation_id, message.type, message.content)
+            )
+            self._conn.execute(
+                "DELETE FROM messages WHERE conversation_id = ? AND seq NOT IN ("
+                "SELECT seq FROM messages WHERE conversation_id = ? ORDER BY seq DESC LIMIT ?)",
+                (conversation_id, conversation_id, self.max_messages)
+            )
+            self._after_write()
+    
+    def set_search_results(self, conversation_id: str, facilities: List[Dict]):
+        with self._lock:
+            self._load_conversation(conversation_id)
+            self._touch(conversation_id)
+            self._conn.execute(
+                "UPDATE conversations SET search_results = ? WHERE id = ?",
+                (json.dumps(facilities, ensure_ascii=False), conversation_id)
+            )
+            self._after_write()
+    
+    def get_search_results(self, conversation_id: str) -> Optional[List[Dict]]:
+        with self._lock:
+            row = self._load_conversation(conversation_id)
+            if row is None or row[0] is None:
+                return None
+            return json.loads(row[0])
+    
+    def delete(self, conversation_id: str):
+        with self._lock:
+            self._delete(conversation_id)
+            self._conn.commit()
+    
+    def list_conversations(self) -> Dict[str, int]:
+        with self._lock:
+            cutoff = time.time() - self.ttl_seconds
+            rows = self._conn.execute(
+                "SELECT c.id, COUNT(m.seq) FROM conversations c "
+                "LEFT JOIN messages m ON m.conversation_id = c.id "
+                "WHERE c.last_access >= ? GROUP BY c.id",
+                (cutoff,)
+            ).fetchall()
+            return {conversation_id: count for conversation_id, count in rows}
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            conversations = self._conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+            messages = self._conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+            return {
+                "backend": "sqlite",
+                "path": self.path,
+                "conversations": conversations,
+                "messages": messages,
+                "file_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+                "evictions": dict(self._evictions),
+            }
+
+
+def create_conversation_store(settings) -> ConversationStore:
+    """설정(CONVERSATION_STORE)에 따라 저장소 생성"""
+    backend = settings.CONVERSATION_STORE.lower()
+    
+    if backend == "sqlite":
+        return SQLiteConversationStore(
+            path=settings.CONVERSATION_SQLITE_PATH,
+            max_conversations=settings.CONVERSATION_MAX_CONVERSATIONS,
+            ttl_seconds=settings.CONVERSATION_TTL_SECONDS,
+            max_messages=settings.CONVERSATION_MAX_MESSAGES
+        )
+    
+    if backend != "memory":
+        raise ValueError(f"알 수 없는 CONVERSATION_STORE: {settings.CONVERSATION_STORE}")
+    
+    return InMemoryConversationStore(
+        max_conversations=settings.CONVERSATION_MAX_CONVERSATIONS,
+        ttl_seconds=settings.CONVERSATION_TTL_SECONDS,
+        max_messages=settings.CONVERSATION_MAX_MESSAGES,
+        max_total_bytes=settings.CONVERSATION_MAX_BYTES
+    )
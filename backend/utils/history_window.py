@@ -0,0 +1,169 @@
+"""
+토큰 예산 기반 대화 히스토리 창
+
+Agent 프롬프트에 넣는 chat_history를 예산 안으로 줄입니다.
+1. 오래된 "마지막 검색 결과" 메시지는 버리고 가장 최근 것만 남김 (시설 목록은 간단히 다시 렌더링)
+2. 최근 메시지부터 예산이 찰 때까지 포함 (잘라야 하면 요약 예산을 먼저 뺀 나머지로,
+   가장 최근 메시지 하나가 예산을 넘으면 그 내용을 토큰 수에 맞춰 자름)
+3. 잘려 나간 오래된 턴은 사용자 요청 위주의 짧은 요약 메시지 하나로 합침
+"""
+
+from typing import Dict, List, Optional
+from langchain_core.messages import BaseMessage, SystemMessage
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+SEARCH_RESULT_PREFIX = "마지막 검색 결과:"
+SUMMARY_PREFIX = "이전 대화 요약:"
+TRUNCATED_SUFFIX = " …(생략)"
+
+_HANGUL = re.compile(r"[가-힣ㄱ-ㅎㅏ-ㅣ]")
+
+_encoding = None
+_encoding_checked = False
+
+def _get_encoding():
+    """tiktoken 인코더 (설치 안 됐거나 로드 실패하면 None → 근사치 사용)"""
+    global _encoding, _encoding_checked
+    if not _encoding_checked:
+        _encoding_checked = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")  # gpt-4o / gpt-4o-mini
+        except Exception as e:
+            logger.info(f"tiktoken 사용 불가, 글자 수 근사치 사용: {e}")
+    return _encoding
+
+def count_tokens(text: str) -> int:
+    """토큰 수 (tiktoken 없으면 한글 1자=1토큰, 그 외 4자=1토큰으로 근사)"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    hangul = len(_HANGUL.findall(text))
+    return hangul + (len(text) - hangul + 3) // 4
+
+def _message_tokens(message: BaseMessage) -> int:
+    return count_tokens(message.content) + 4  # 역할/구분자 오버헤드
+
+def _truncate_message(message: BaseMessage, max_tokens: int) -> Optional[BaseMessage]:
+    """메시지 내용을 앞에서부터 max_tokens(오버헤드 포함) 안으로 자름 (오버헤드도 못 넣으면 None)"""
+    if max_tokens < 4:
+        return None
+    content = message.content
+    # count_tokens가 접두사 길이에 단조 증가하므로 들어가는 가장 긴 접두사를 이분 탐색
+    lo, hi = 0, len(content)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(content[:mid] + TRUNCATED_SUFFIX) + 4 <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    truncated = content[:lo] + TRUNCATED_SUFFIX
+    if count_tokens(truncated) + 4 > max_tokens:
+        truncated = ""
+    return message.model_copy(update={"content": truncated})
+
+def render_search_results(facilities: List[Dict]) -> str:
+    """검색 결과를 짧게 렌더링 (Agent가 '두 번째' 같은 지시를 해석할 수 있을 정도만)"""
+    lines = [SEARCH_RESULT_PREFIX]
+    for i, facility in enumerate(facilities):
+        category = facility.get("category", "")
+        lines.append(f"{i + 1}. {facility.get('name', '')} ({category})" if category else f"{i + 1}. {facility.get('name', '')}")
+    return "\n".join(lines)
+
+def _summarize(dropped: List[BaseMessage], max_tokens: int) -> Optional[SystemMessage]:
+    """잘려 나간 턴의 사용자 요청을 모아 짧은 요약 생성 (LLM 호출 없음)"""
+    requests = [m.content.strip().replace("\n", " ") for m in dropped if m.type == "human"]
+    if not requests:
+        return None
+    
+    # 최근 요청부터 예산 안에서 채우고 시간 순서로 되돌림
+    header = f"{SUMMARY_PREFIX} 사용자가 앞서 요청한 내용 - "
+    picked, used = [], count_tokens(header)
+    for text in reversed(requests):
+        text = text[:60]
+        cost = count_tokens(text) + 2
+        if used + cost > max_tokens:
+            break
+        picked.append(text)
+        used += cost
+    if not picked:
+        return None
+    
+    picked.reverse()
+    return SystemMessage(content=header + " / ".join(picked))
+
+def build_history_window(
+    messages: List[BaseMessage],
+    max_tokens: int,
+    summary_max_tokens: int = 200,
+    last_search_results: Optional[List[Dict]] = None
+) -> List[BaseMessage]:
+    """
+    토큰 예산 안의 히스토리 반환
+    
+    Args:
+        messages: 전체 히스토리 (오래된 것부터)
+        max_tokens: chat_history 전체 예산 (요약 포함)
+        summary_max_tokens: 잘린 턴 요약 예산
+        last_search_results: 저장된 마지막 검색 결과 (있으면 검색 결과 메시지를 짧게 다시 렌더링)
+    
+    Returns:
+        예산 안으로 줄인 메시지 리스트
+    """
+    # 1) 가장 최근 검색 결과 메시지만 남김
+    last_search_idx = None
+    for i in range(len(messages) - 1, -1, -1):
+        if messages[i].type == "system" and messages[i].content.startswith(SEARCH_RESULT_PREFIX):
+            last_search_idx = i
+            break
+    
+    collapsed: List[BaseMessage] = []
+    for i, message in enumerate(messages):
+        if message.type == "system" and message.content.startswith(SEARCH_RESULT_PREFIX):
+            if i != last_search_idx:
+                continue
+            if last_search_results:
+                message = SystemMessage(content=render_search_results(last_search_results))
+        collapsed.append(message)
+    
+    # 2) 최근 메시지부터 예산 안에서 포함 (잘라야 하면 요약 예산을 먼저 떼어 둠 → 요약 때문에 최근 메시지를 버리지 않음)
+    costs = [_message_tokens(message) for message in collapsed]
+    if sum(costs) <= max_tokens:
+        return collapsed
+    
+    budget = max_tokens - summary_max_tokens
+    kept: List[BaseMessage] = []
+    cut = 0
+    for i in range(len(collapsed) - 1, -1, -1):
+        message, cost = collapsed[i], costs[i]
+        if cost > budget:
+            if kept:
+                cut = i + 1
+                break
+            # 가장 최근 메시지 하나가 예산을 넘음 → 내용을 잘라서 넣음
+            # (요약할 이전 턴이 없거나 요약 예산을 빼면 내용이 안 남으면 전체 예산 사용)
+            min_tokens = count_tokens(TRUNCATED_SUFFIX) + 4
+            limit = budget if i > 0 and budget > min_tokens else max_tokens
+            message = _truncate_message(message, limit)
+            if message is None:
+                return []
+            cost = _message_tokens(message)
+            logger.info(f"히스토리 창: 최근 메시지 {costs[i]} → {cost}토큰으로 자름")
+        kept.append(message)
+        budget -= cost
+    kept.reverse()
+    
+    if cut == 0:
+        return kept
+    
+    # 3) 잘린 턴 요약 (최근 메시지에 쓰고 남은 예산 안에서만, 모자라면 줄이거나 생략)
+    summary_budget = min(summary_max_tokens, max_tokens - sum(_message_tokens(m) for m in kept)) - 4
+    summary = _summarize(collapsed[:cut], summary_budget) if summary_budget > 0 else None
+    if summary is not None:
+        kept.insert(0, summary)
+    
+    logger.info(f"히스토리 창: {len(messages)}개 → {len(kept)}개 (잘린 메시지 {cut}개)")
+    return kept
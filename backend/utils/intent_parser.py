@@ -0,0 +1,238 @@
+"""
+규칙 기반 사용자 의도 추출 (extract_user_intent 빠른 경로)
+
+지역(전국 시도/시군구), 날짜 표현(오늘/내일/주말/요일), 날씨 키워드를 정규식으로 추출합니다.
+애매한 메시지(지역 여러 개, 동음이의 지명, 모르는 날짜 표현 등)는 confident=False로
+돌려주고 LLM이 처리합니다.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import re
+
+from utils.region_gazetteer import (
+    AMBIGUOUS_BASES,
+    DISTRICT_ALIASES,
+    DISTRICTS,
+    REGION_GROUPS,
+    SIDO_NAMES,
+    SIGUNGU_BY_SIDO,
+    strip_suffix,
+)
+
+# ----------------------------------------------------------------------
+# 지역
+# ----------------------------------------------------------------------
+# 표기 → [(정규화된 지역명, 시도, 종류, 동음이의 여부)]
+_LOCATION_ENTRIES: Dict[str, List[Tuple[str, Optional[str], str, bool]]] = {}
+
+def _add_entry(surface: str, location: str, sido: Optional[str], kind: str, ambiguous: bool = False):
+    entries = _LOCATION_ENTRIES.setdefault(surface, [])
+    if (location, sido, kind, ambiguous) not in entries:
+        entries.append((location, sido, kind, ambiguous))
+
+def _canonical_sigungu(name: str) -> str:
+    """검색/날씨 도구에 넘길 이름: 시/군은 접미사 제거 (수원시 → 수원), 구는 그대로"""
+    return name if name.endswith("구") else strip_suffix(name)
+
+def _build_entries():
+    sido_surfaces = {alias for aliases in SIDO_NAMES.values() for alias in aliases}
+    
+    for group in REGION_GROUPS:
+        _add_entry(group, group, None, "group")
+    
+    for sido, aliases in SIDO_NAMES.items():
+        for alias in aliases:
+            _add_entry(alias, sido, sido, "sido")
+    
+    for sido, names in SIGUNGU_BY_SIDO.items():
+        for name in names:
+            canonical = _canonical_sigungu(name)
+            _add_entry(name, canonical, sido, "sigungu")
+            base = strip_suffix(name)
+            if base != name and base not in sido_surfaces and len(base) >= 2:
+                _add_entry(base, canonical, sido, "sigungu", ambiguous=base in AMBIGUOUS_BASES)
+    
+    for district, (sido, city) in DISTRICTS.items():
+        _add_entry(district, strip_suffix(city), sido, "district")
+    for alias, district in DISTRICT_ALIASES.items():
+        sido, city = DISTRICTS[district]
+        _add_entry(alias, strip_suffix(city), sido, "district")
+
+_build_entries()
+
+# 긴 표기부터 매칭 (강남구가 남구보다, 일산동구가 동구보다 먼저)
+_LOCATION_PATTERN = re.compile(
+    "|".join(re.escape(s) for s in sorted(_LOCATION_ENTRIES, key=len, reverse=True))
+)
+
+# 지명 사전에 없는 동네/역 이름 (예: 잠실역, 판교동) → LLM이 더 잘 앎
+_UNKNOWN_PLACE_PATTERN = re.compile(r"[가-힣]{2,}(?:역|읍|면)(?=\s|$|[에으로근주쪽])|[가-힣]{2,}동(?=\s|$|[에으로근주쪽])")
+_NOT_PLACES = {"운동", "활동", "행동", "이동", "자동", "공동", "아동", "감동", "체험활동", "야외활동", "실내활동"}
+
+
+def _parse_location(message: str, reasons: List[str]) -> Tuple[Optional[str], Optional[str]]:
+    """(지역명, 시도) 반환, 애매하면 reasons에 이유 추가"""
+    mentioned_sido = set()
+    groups = set()
+    specific: List[List[Tuple[str, Optional[str], str, bool]]] = []
+    
+    for match in _LOCATION_PATTERN.finditer(message):
+        entries = _LOCATION_ENTRIES[match.group()]
+        kind = entries[0][2]
+        if kind == "group":
+            groups.add(entries[0][0])
+        elif kind == "sido":
+            mentioned_sido.add(entries[0][1])
+        else:
+            specific.append(entries)
+    
+    if specific:
+        resolved = set()
+        for entries in specific:
+            candidates = entries
+            if mentioned_sido:
+                candidates = [e for e in entries if e[1] in mentioned_sido]
+                if not candidates:
+                    reasons.append(f"시도와 시군구 불일치: {entries[0][0]}")
+                    return None, None
+            if any(e[3] for e in candidates) and not mentioned_sido:
+                reasons.append(f"동음이의 지명: {candidates[0][0]}")
+                return None, None
+            for location, sido, _, _ in candidates:
+                resolved.add((location, sido))
+        
+        if len(resolved) > 1:
+            reasons.append(f"지역 여러 개: {sorted(f'{loc}({sido})' for loc, sido in resolved)}")
+            return None, None
+        return next(iter(resolved))
+    
+    if groups:
+        if len(groups) > 1 or mentioned_sido - set(REGION_GROUPS[next(iter(groups))]):
+            reasons.append("권역과 시도 혼합")
+            return None, None
+        return next(iter(groups)), None
+    
+    if len(mentioned_sido) > 1:
+        reasons.append(f"시도 여러 개: {sorted(mentioned_sido)}")
+        return None, None
+    if mentioned_sido:
+        sido = next(iter(mentioned_sido))
+        return sido, sido
+    
+    for match in _UNKNOWN_PLACE_PATTERN.finditer(message):
+        if match.group() not in _NOT_PLACES:
+            reasons.append(f"사전에 없는 지명 후보: {match.group()}")
+            break
+    return None, None
+
+# ----------------------------------------------------------------------
+# 날짜
+# ----------------------------------------------------------------------
+_WEEKDAYS = "월화수목금토일"
+
+_DATE_PATTERN = re.compile(
+    r"(?P<next_weekend>다음\s*주\s*주?말)"
+    r"|(?P<weekend>주말)"
+    r"|(?:(?P<week>이번|다음)\s*주\s*)?(?P<weekday>[월화수목금토일])요일"
+    r"|(?P<day_after>내일\s*모레|모레)"
+    r"|(?P<tomorrow>내일)"
+    r"|(?P<three_days>글피)"
+    r"|(?P<today>오늘|지금|당장)"
+)
+
+# 규칙으로 계산하지 않는 날짜 표현
+_UNKNOWN_DATE_PATTERN = re.compile(
+    r"\d+\s*월|\d+\s*일(?:\s|$|에|날)|다음\s*달|다다음|연휴|방학|어린이날|크리스마스|추석|설날|며칠|언제"
+)
+
+
+def _parse_date(message: str, today: datetime, reasons: List[str]) -> str:
+    """extract_user_intent와 같은 형식 (today/tomorrow/this_weekend/YYYY-MM-DD)"""
+    if _UNKNOWN_DATE_PATTERN.search(message):
+        reasons.append("규칙에 없는 날짜 표현")
+        return "today"
+    
+    resolved = []
+    for match in _DATE_PATTERN.finditer(message):
+        if match.group("next_weekend"):
+            days = (5 - today.weekday()) % 7 + 7
+            resolved.append((today + timedelta(days=days)).strftime("%Y-%m-%d"))
+        elif match.group("weekend"):
+            resolved.append("this_weekend")
+        elif match.group("weekday"):
+            target = _WEEKDAYS.index(match.group("weekday"))
+            if match.group("week") == "다음":
+                days = 7 - today.weekday() + target
+            else:
+                days = (target - today.weekday()) % 7
+            resolved.append((today + timedelta(days=days)).strftime("%Y-%m-%d"))
+        elif match.group("day_after"):
+            resolved.append((today + timedelta(days=2)).strftime("%Y-%m-%d"))
+        elif match.group("tomorrow"):
+            resolved.append("tomorrow")
+        elif match.group("three_days"):
+            resolved.append((today + timedelta(days=3)).strftime("%Y-%m-%d"))
+        elif match.group("today"):
+            resolved.append("today")
+    
+    distinct = list(dict.fromkeys(resolved))
+    if len(distinct) > 1:
+        reasons.append(f"날짜 여러 개: {distinct}")
+    return distinct[0] if distinct else "today"
+
+# ----------------------------------------------------------------------
+# 날씨
+# ----------------------------------------------------------------------
+_WEATHER_PATTERNS = [
+    ("비", re.compile(r"비\s*(?:가|오|와|올|온|내리|소식|예보)|우천|장마|소나기")),
+    ("눈", re.compile(r"눈\s*(?:이\s*)?(?:오|와|올|온|내리|소식)|폭설|함박눈")),
+    ("맑음", re.compile(r"맑|화창")),
+    ("흐림", re.compile(r"흐리|흐린|흐림|구름\s*많")),
+    ("더움", re.compile(r"폭염|더운|더워|무더")),
+    ("추움", re.compile(r"한파|추운|추워|쌀쌀")),
+]
+
+
+def _parse_weather(message: str, reasons: List[str]) -> Optional[str]:
+    conditions = [label for label, pattern in _WEATHER_PATTERNS if pattern.search(message)]
+    if len(conditions) > 1:
+        reasons.append(f"날씨 조건 여러 개: {conditions}")
+    return conditions[0] if conditions else None
+
+# ----------------------------------------------------------------------
+# 전체
+# ----------------------------------------------------------------------
+class IntentParse:
+    """규칙 기반 추출 결과"""
+    __slots__ = ("result", "province", "confident", "reasons")
+    
+    def __init__(self, result: Dict, province: Optional[str], reasons: List[str]):
+        self.result = result
+        self.province = province
+        self.reasons = reasons
+        self.confident = not reasons
+
+
+def parse_intent(message: str, today: Optional[datetime] = None) -> IntentParse:
+    """
+    메시지에서 지역/날짜/날씨 추출
+    
+    Returns:
+        IntentParse (confident=False면 LLM으로 넘겨야 함)
+    """
+    today = today or datetime.now()
+    reasons: List[str] = []
+    
+    location, province = _parse_location(message, reasons)
+    date = _parse_date(message, today, reasons)
+    condition = _parse_weather(message, reasons)
+    
+    result = {
+        "location": location,
+        "weather_mentioned": condition is not None,
+        "weather_condition": condition,
+        "date": date,
+        "needs_weather_check": condition is None,
+    }
+    return IntentParse(result, province, reasons)
@@ -0,0 +1,98 @@
+"""
+서버 시작 작업 / readiness 상태
+
+- liveness (/health): 프로세스가 이벤트 루프를 돌리고 있으면 항상 200
+- readiness (/ready): 시작 작업(벡터 백엔드 연결, 보조 인덱스, Agent/LLM, 임베딩 클라이언트)이
+  끝나야 200, 필수 작업이 실패하면 503
+시작 작업은 lifespan에서 백그라운드로 실행되어 포트를 바로 열고,
+그 전에 들어온 요청은 필요한 것만 그때 초기화합니다 (모든 초기화 함수가 lazy + 재사용).
+실패한 필수 작업은 lifespan이 retry_failed로 간격을 늘려가며 다시 실행합니다
+(Chroma가 서버보다 늦게 뜨는 경우 등).
+"""
+
+from typing import Callable, Dict, List, NamedTuple
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StartupStep(NamedTuple):
+    name: str
+    func: Callable[[], object]
+    required: bool = True  # False면 실패해도 ready (해당 기능 없이 동작)
+
+
+class StartupState:
+    """시작 작업별 상태 (pending → running → ok | error)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.created_at = time.time()
+        self.finished_at = None
+        self.steps: Dict[str, Dict] = {}
+        self._pending_retry: List[StartupStep] = []
+
+    def _update(self, name: str, **fields):
+        with self._lock:
+            self.steps.setdefault(name, {}).update(fields)
+
+    def run(self, steps: List[StartupStep]):
+        """시작 작업을 순서대로 실행 (블로킹, run_blocking으로 호출)"""
+        for step in steps:
+            self._update(step.name, status="pending", required=step.required, attempts=0)
+
+        failed = [step for step in steps if not self._run_step(step)]
+        with self._lock:
+            self._pending_retry = [step for step in failed if step.required]
+            self.finished_at = time.time()
+        logger.info(f"🚀 시작 작업 종료 ({self.finished_at - self.created_at:.2f}s), ready={self.ready}")
+
+    def _run_step(self, step: StartupStep) -> bool:
+        with self._lock:
+            attempts = self.steps[step.name]["attempts"] + 1
+        self._update(step.name, status="running", attempts=attempts)
+        start = time.perf_counter()
+        try:
+            step.func()
+        except Exception as e:
+            self._update(step.name, status="error", error=str(e), seconds=time.perf_counter() - start)
+            log = logger.error if step.required else logger.warning
+            log(f"❌ 시작 작업 실패: {step.name} ({e}, {attempts}회째)")
+            return False
+        seconds = time.perf_counter() - start
+        self._update(step.name, status="ok", error=None, seconds=seconds)
+        logger.info(f"✅ 시작 작업 완료: {step.name} ({seconds:.2f}s)")
+        return True
+
+    def retry_failed(self) -> bool:
+        """실패한 필수 작업 다시 실행 (블로킹), 남은 실패가 없으면 True"""
+        with self._lock:
+            steps = list(self._pending_retry)
+        still_failed = [step for step in steps if not self._run_step(step)]
+        with self._lock:
+            self._pending_retry = still_failed
+        if not still_failed:
+            logger.info(f"🚀 실패했던 시작 작업 복구, ready={self.ready}")
+        return not still_failed
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            if self.finished_at is None:
+                return False
+            return all(step["status"] == "ok" for step in self.steps.values() if step["required"])
+
+    def snapshot(self) -> Dict:
+        ready = self.ready
+        with self._lock:
+            return {
+                "ready": ready,
+                "finished": self.finished_at is not None,
+                "uptime_seconds": time.time() - self.created_at,
+                "steps": {name: dict(step) for name, step in self.steps.items()},
+            }
+
+
+startup_state = StartupState()
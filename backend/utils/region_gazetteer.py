@@ -0,0 +1,128 @@
+"""
+전국 시도 / 시군구 지명 사전 (규칙 기반 지역 추출용)
+"""
+
+from typing import Dict, List
+
+# 시도 약칭 → 메시지에서 인식할 표기
+SIDO_NAMES: Dict[str, List[str]] = {
+    "서울": ["서울", "서울시", "서울특별시"],
+    "부산": ["부산", "부산시", "부산광역시"],
+    "대구": ["대구", "대구시", "대구광역시"],
+    "인천": ["인천", "인천시", "인천광역시"],
+    "광주": ["광주", "광주광역시"],
+    "대전": ["대전", "대전시", "대전광역시"],
+    "울산": ["울산", "울산시", "울산광역시"],
+    "세종": ["세종", "세종시", "세종특별자치시"],
+    "경기": ["경기", "경기도"],
+    "강원": ["강원", "강원도", "강원특별자치도"],
+    "충북": ["충북", "충청북도"],
+    "충남": ["충남", "충청남도"],
+    "전북": ["전북", "전라북도", "전북특별자치도"],
+    "전남": ["전남", "전라남도"],
+    "경북": ["경북", "경상북도"],
+    "경남": ["경남", "경상남도"],
+    "제주": ["제주", "제주도", "제주특별자치도"],
+}
+
+# 여러 시도를 묶는 권역
+REGION_GROUPS: Dict[str, List[str]] = {
+    "수도권": ["서울", "인천", "경기"],
+}
+
+# 시도 약칭 → 시군구 (행정구역 정식 명칭)
+SIGUNGU_BY_SIDO: Dict[str, List[str]] = {
+    "서울": [
+        "종로구", "중구", "용산구", "성동구", "광진구", "동대문구", "중랑구", "성북구",
+        "강북구", "도봉구", "노원구", "은평구", "서대문구", "마포구", "양천구", "강서구",
+        "구로구", "금천구", "영등포구", "동작구", "관악구", "서초구", "강남구", "송파구", "강동구",
+    ],
+    "부산": [
+        "중구", "서구", "동구", "영도구", "부산진구", "동래구", "남구", "북구", "해운대구",
+        "사하구", "금정구", "강서구", "연제구", "수영구", "사상구", "기장군",
+    ],
+    "대구": ["중구", "동구", "서구", "남구", "북구", "수성구", "달서구", "달성군", "군위군"],
+    "인천": ["중구", "동구", "미추홀구", "연수구", "남동구", "부평구", "계양구", "서구", "강화군", "옹진군"],
+    "광주": ["동구", "서구", "남구", "북구", "광산구"],
+    "대전": ["동구", "중구", "서구", "유성구", "대덕구"],
+    "울산": ["중구", "남구", "동구", "북구", "울주군"],
+    "세종": [],
+    "경기": [
+        "수원시", "성남시", "의정부시", "안양시", "부천시", "광명시", "평택시", "동두천시",
+        "안산시", "고양시", "과천시", "구리시", "남양주시", "오산시", "시흥시", "군포시",
+        "의왕시", "하남시", "용인시", "파주시", "이천시", "안성시", "김포시", "화성시",
+        "광주시", "양주시", "포천시", "여주시", "연천군", "가평군", "양평군",
+    ],
+    "강원": [
+        "춘천시", "원주시", "강릉시", "동해시", "태백시", "속초시", "삼척시", "홍천군",
+        "횡성군", "영월군", "평창군", "정선군", "철원군", "화천군", "양구군", "인제군",
+        "고성군", "양양군",
+    ],
+    "충북": [
+        "청주시", "충주시", "제천시", "보은군", "옥천군", "영동군", "증평군", "진천군",
+        "괴산군", "음성군", "단양군",
+    ],
+    "충남": [
+        "천안시", "공주시", "보령시", "아산시", "서산시", "논산시", "계룡시", "당진시",
+        "금산군", "부여군", "서천군", "청양군", "홍성군", "예산군", "태안군",
+    ],
+    "전북": [
+        "전주시", "군산시", "익산시", "정읍시", "남원시", "김제시", "완주군", "진안군",
+        "무주군", "장수군", "임실군", "순창군", "고창군", "부안군",
+    ],
+    "전남": [
+        "목포시", "여수시", "순천시", "나주시", "광양시", "담양군", "곡성군", "구례군",
+        "고흥군", "보성군", "화순군", "장흥군", "강진군", "해남군", "영암군", "무안군",
+        "함평군", "영광군", "장성군", "완도군", "진도군", "신안군",
+    ],
+    "경북": [
+        "포항시", "경주시", "김천시", "안동시", "구미시", "영주시", "영천시", "상주시",
+        "문경시", "경산시", "의성군", "청송군", "영양군", "영덕군", "청도군", "고령군",
+        "성주군", "칠곡군", "예천군", "봉화군", "울진군", "울릉군",
+    ],
+    "경남": [
+        "창원시", "진주시", "통영시", "사천시", "김해시", "밀양시", "거제시", "양산시",
+        "의령군", "함안군", "창녕군", "고성군", "남해군", "하동군", "산청군", "함양군",
+        "거창군", "합천군",
+    ],
+    "제주": ["제주시", "서귀포시"],
+}
+
+# 일반구 (시 아래 구) → (시도, 상위 시)
+DISTRICTS: Dict[str, tuple] = {
+    "장안구": ("경기", "수원시"), "권선구": ("경기", "수원시"),
+    "팔달구": ("경기", "수원시"), "영통구": ("경기", "수원시"),
+    "수정구": ("경기", "성남시"), "중원구": ("경기", "성남시"), "분당구": ("경기", "성남시"),
+    "만안구": ("경기", "안양시"), "동안구": ("경기", "안양시"),
+    "원미구": ("경기", "부천시"), "소사구": ("경기", "부천시"), "오정구": ("경기", "부천시"),
+    "상록구": ("경기", "안산시"), "단원구": ("경기", "안산시"),
+    "덕양구": ("경기", "고양시"), "일산동구": ("경기", "고양시"), "일산서구": ("경기", "고양시"),
+    "처인구": ("경기", "용인시"), "기흥구": ("경기", "용인시"), "수지구": ("경기", "용인시"),
+    "상당구": ("충북", "청주시"), "서원구": ("충북", "청주시"),
+    "흥덕구": ("충북", "청주시"), "청원구": ("충북", "청주시"),
+    "동남구": ("충남", "천안시"), "서북구": ("충남", "천안시"),
+    "완산구": ("전북", "전주시"), "덕진구": ("전북", "전주시"),
+    "의창구": ("경남", "창원시"), "성산구": ("경남", "창원시"),
+    "마산합포구": ("경남", "창원시"), "마산회원구": ("경남", "창원시"), "진해구": ("경남", "창원시"),
+}
+
+# 접미사 없이도 인식하는 일반구/생활권 이름 → 일반구
+DISTRICT_ALIASES: Dict[str, str] = {
+    "분당": "분당구", "일산": "일산서구", "기흥": "기흥구", "수지": "수지구",
+    "영통": "영통구", "팔달": "팔달구", "마산": "마산합포구", "진해": "진해구",
+}
+
+# 접미사 없이 쓰면 일반 명사와 헷갈리는 지명 (예: 고양이, 공주, 음성, 화성)
+# → 접미사 없이 나오면 애매한 것으로 보고 LLM에 넘김
+AMBIGUOUS_BASES = {
+    "고양", "공주", "음성", "영양", "예산", "진도", "장수", "부여", "영광", "진주",
+    "화성", "상주", "고령", "강진", "무안", "장성", "구리", "보은", "거창",
+    "동작", "인제", "성주", "고성", "남해", "동해", "영동", "의성", "정선",
+}
+
+
+def strip_suffix(name: str) -> str:
+    """시/군/구 접미사 제거 (한 글자 이름은 그대로)"""
+    if len(name) > 2 and name[-1] in "시군구":
+        return name[:-1]
+    return name
@@ -0,0 +1,248 @@
+"""
+외부 의존성 호출 보호 (OpenAI / Chroma / OpenWeatherMap)
+
+- call_with_timeout: 자체 타임아웃이 없는 동기 클라이언트 호출을 전용 스레드 풀에서 기다리다 포기
+- hedged_call: 첫 요청이 hedge_after초 안에 안 끝나면 같은 요청을 한 번 더 보내고 먼저 끝난 결과 사용
+- CircuitBreaker: 연속 실패가 쌓이면 바로 실패(open) → recovery 후 소수 요청만 통과시켜 확인(half-open)
+- guarded_call: 브레이커 + 타임아웃/hedging을 한 번에 적용 (의존성 이름별 브레이커 공유)
+
+타임아웃으로 포기한 호출은 스레드에서 끝까지 실행되지만, 요청 처리 스레드는 바로 풀려남
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, TypeVar
+import contextvars
+import functools
+import logging
+import threading
+import time
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class DependencyError(Exception):
+    """외부 의존성을 쓸 수 없음 (호출하지 않았거나 포기함)"""
+
+
+class CircuitOpenError(DependencyError):
+    """서킷 브레이커가 열려 있어 호출하지 않음"""
+
+
+class DependencyTimeoutError(DependencyError):
+    """제한 시간 안에 응답이 없음"""
+
+
+# hedging으로 두 번째 요청을 보낸 횟수
+hedged_requests = [0]
+
+# 타임아웃 / hedging 호출 전용 풀 (블로킹 도구 풀과 분리해서 버려진 호출이 도구 실행을 막지 않음)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.RESILIENCE_THREAD_POOL_SIZE,
+                    thread_name_prefix="outbound"
+                )
+    return _executor
+
+
+def _submit(func: Callable[..., T], *args, **kwargs) -> "Future[T]":
+    # 요청 컨텍스트(conversation_id, trace)를 복사해서 넘김
+    ctx = contextvars.copy_context()
+    return _get_executor().submit(functools.partial(ctx.run, func, *args, **kwargs))
+
+
+def call_with_timeout(func: Callable[..., T], timeout: float, *args, **kwargs) -> T:
+    """timeout초 안에 끝나지 않으면 DependencyTimeoutError (timeout <= 0이면 그냥 호출)"""
+    if not timeout or timeout <= 0:
+        return func(*args, **kwargs)
+    future = _submit(func, *args, **kwargs)
+    done, _ = wait([future], timeout=timeout)
+    if not done:
+        future.cancel()
+        raise DependencyTimeoutError(f"{getattr(func, '__name__', 'call')}: {timeout:.1f}s 초과")
+    return future.result()
+
+
+def hedged_call(func: Callable[..., T], hedge_after: float, timeout: float, *args, **kwargs) -> T:
+    """
+    hedge_after초 안에 응답이 없으면 같은 호출을 한 번 더 보내고 먼저 성공한 결과 반환
+    (멱등 호출에만 사용, 예: 임베딩) 둘 다 실패하면 마지막 예외, timeout 초과 시 DependencyTimeoutError
+    """
+    deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+    futures = [_submit(func, *args, **kwargs)]
+    done, _ = wait(futures, timeout=hedge_after)
+    if not done or futures[0].exception() is not None:
+        logger.info(f"🔁 hedged 요청 전송: {getattr(func, '__name__', 'call')}")
+        hedged_requests[0] += 1
+        futures.append(_submit(func, *args, **kwargs))
+
+    error: Optional[BaseException] = None
+    pending = list(futures)
+    while pending:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, not_done = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            if future.exception() is None:
+                for other in not_done:
+                    other.cancel()
+                return future.result()
+            error = future.exception()
+        pending = list(not_done)
+
+    if pending:
+        raise DependencyTimeoutError(f"{getattr(func, '__name__', 'call')}: {timeout:.1f}s 초과")
+    raise error
+
+
+class CircuitBreaker:
+    """
+    closed: 정상 (연속 실패 failure_threshold회 → open)
+    open: 호출하지 않고 CircuitOpenError (recovery_seconds 후 half-open)
+    half-open: 동시에 half_open_max_calls개만 시험 호출, 성공하면 closed / 실패하면 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_seconds: float = 30.0, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._stats = {"calls": 0, "successes": 0, "failures": 0, "rejected": 0, "timeouts": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_locked()
+            return self._state
+
+    def _refresh_locked(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_seconds:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+            logger.info(f"🟡 서킷 half-open: {self.name}")
+
+    def _acquire(self) -> bool:
+        with self._lock:
+            self._refresh_locked()
+            if self._state == self.OPEN or (self._state == self.HALF_OPEN and self._probes >= self.half_open_max_calls):
+                self._stats["rejected"] += 1
+                return False
+            if self._state == self.HALF_OPEN:
+                self._probes += 1
+            self._stats["calls"] += 1
+            return True
+
+    def _on_success(self):
+        with self._lock:
+            self._stats["successes"] += 1
+            self._failures = 0
+            if self._state == self.HALF_OPEN:
+                logger.info(f"🟢 서킷 closed: {self.name}")
+            self._state = self.CLOSED
+            self._probes = 0
+
+    def _on_failure(self, timeout: bool):
+        with self._lock:
+            self._stats["failures"] += 1
+            self._stats["timeouts"] += int(timeout)
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._stats["opened"] += 1
+                    logger.warning(f"🔴 서킷 open: {self.name} (연속 실패 {self._failures}회)")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+
+    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """열려 있으면 CircuitOpenError, 아니면 호출하고 결과를 기록"""
+        if not self._acquire():
+            raise CircuitOpenError(f"{self.name} 서킷 open")
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self._on_failure(timeout=isinstance(e, DependencyTimeoutError))
+            raise
+        self._on_success()
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._refresh_locked()
+            return {
+                "state": self._state,
+                "open": self._state == self.OPEN,  # Prometheus용 (문자열 state는 지표로 안 나감)
+                "consecutive_failures": self._failures,
+                **self._stats,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """의존성 이름별 브레이커 (프로세스 전역, 설정의 기본값 사용)"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = _breakers[name] = CircuitBreaker(
+                    name,
+                    failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                    recovery_seconds=settings.CIRCUIT_RECOVERY_SECONDS,
+                    half_open_max_calls=settings.CIRCUIT_HALF_OPEN_MAX_CALLS
+                )
+    return breaker
+
+
+def guarded_call(
+    name: str,
+    func: Callable[..., T],
+    *args,
+    timeout: float = 0.0,
+    hedge_after: float = 0.0,
+    **kwargs
+) -> T:
+    """
+    의존성 호출 = 브레이커(name) + 타임아웃 (+ hedge_after > 0이면 hedging)
+    실패는 원래 예외 그대로, 호출하지 않았거나 포기한 경우는 DependencyError
+    """
+    breaker = get_breaker(name)
+    if not settings.RESILIENCE_ENABLED:
+        return func(*args, **kwargs)
+    if hedge_after and hedge_after > 0:
+        return breaker.call(hedged_call, func, hedge_after, timeout, *args, **kwargs)
+    return breaker.call(call_with_timeout, func, timeout, *args, **kwargs)
+
+
+def get_dependency_stats() -> Dict[str, Any]:
+    """의존성별 브레이커 상태 / 호출 수"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {
+        "hedged_requests": hedged_requests[0],
+        "breakers": {breaker.name: breaker.stats() for breaker in breakers},
+    }
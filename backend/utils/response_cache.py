@@ -0,0 +1,201 @@
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from datetime import datetime
+import logging
+import threading
+import time
+import numpy as np
+from models.embedding_cache import normalize_query
+from utils.cache import TTLCache
+from utils.tracing import record_cache
+from utils.intent_parser import parse_intent
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCacheKey(NamedTuple):
+    """
+    query: 정규화된 질문
+    context: 답변을 바꾸는 조건 (지역, 날짜, 날씨 조건/예보 구간, 아이 나이)
+    ttl: 이 응답을 재사용할 수 있는 시간 (날씨 예보 구간이 끝나면 만료)
+    """
+    query: str
+    context: tuple
+    ttl: float
+
+
+class ResponseCache:
+    """
+    첫 턴 채팅 응답 캐시
+    - 키: 정규화된 질문 + 규칙 기반 의도(지역/날짜/날씨) + 날씨 예보 구간 + 아이 나이
+    - 날씨를 직접 말하지 않은 질문은 예보 구간(WEATHER_FORECAST_WINDOW_SECONDS)이 바뀌면 만료
+    - similarity_threshold > 0 이면 같은 조건 안에서 임베딩 코사인 유사도로 비슷한 질문도 매칭
+    - 의도를 규칙으로 확정할 수 없거나(LLM 필요) 사용자 좌표가 있는 요청은 캐시하지 않음
+    """
+    
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        weather_window_seconds: float,
+        similarity_threshold: float = 0.0,
+        embed_fn: Optional[Callable[[str], Sequence[float]]] = None,
+        max_neighbors: int = 32
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.weather_window_seconds = weather_window_seconds
+        self.similarity_threshold = similarity_threshold
+        self.embed_fn = embed_fn if similarity_threshold > 0 else None
+        self.max_neighbors = max_neighbors
+        
+        # 내부 캐시는 지표를 기록하지 않음 (get 한 번에 response / response_semantic 중 하나만 기록)
+        self.responses = TTLCache(ttl_seconds, max_entries, name="response_entries")
+        # context → [(query, 정규화된 임베딩, 만료 시각)] (유사 질문 매칭용)
+        self.neighbors = TTLCache(ttl_seconds, max_entries, name="response_neighbors")
+        self._lock = threading.Lock()
+        self._stats = {
+            "lookups": 0, "exact_hits": 0, "semantic_hits": 0, "misses": 0, "stores": 0,
+            "skipped_not_confident": 0, "skipped_user_location": 0, "skipped_failed_turn": 0,
+            "embedding_errors": 0,
+        }
+    
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+    
+    def count_skipped_failed_turn(self):
+        """도구 실패 / 성능 저하 결과가 섞인 턴이라 저장하지 않음"""
+        self._count("skipped_failed_turn")
+    
+    def make_key(
+        self,
+        message: str,
+        child_age: Optional[int] = None,
+        user_location: Optional[Tuple[float, float]] = None,
+        now: Optional[float] = None
+    ) -> Optional[ResponseCacheKey]:
+        """캐시 키 생성 (캐시하면 안 되는 요청이면 None)"""
+        if user_location is not None:
+            self._count("skipped_user_location")
+            return None
+        
+        now = time.time() if now is None else now
+        parsed = parse_intent(message, today=datetime.fromtimestamp(now))
+        if not parsed.confident:
+            self._count("skipped_not_confident")
+            return None
+        
+        intent = parsed.result
+        ttl = self.ttl_seconds
+        weather_window = None
+        if intent["needs_weather_check"]:
+            # 예보를 조회해서 답하는 질문 → 날씨 캐시와 같은 구간 안에서만 재사용
+            weather_window = int(now // self.weather_window_seconds)
+            ttl = min(ttl, (weather_window + 1) * self.weather_window_seconds - now)
+        
+        context = (
+            intent["location"],
+            datetime.fromtimestamp(now).date().isoformat(),  # "today" 같은 상대 날짜 기준일
+            intent["date"],
+            intent["weather_condition"],
+            weather_window,
+            child_age,
+        )
+        return ResponseCacheKey(normalize_query(message), context, ttl)
+    
+    def _embed(self, query: str) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray(self.embed_fn(query), dtype=np.float32)
+        except Exception as e:
+            self._count("embedding_errors")
+            logger.warning(f"응답 캐시 임베딩 실패 (정확히 같은 질문만 매칭): {e}")
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+    
+    def get(self, key: ResponseCacheKey) -> Optional[Dict]:
+        """저장된 응답 (정확히 같은 질문 → 유사한 질문 순서로 찾음)"""
+        self._count("lookups")
+        
+        cached = self.responses.get((key.query, key.context))
+        if cached is not None:
+            self._count("exact_hits")
+            record_cache("response", True)
+            logger.info(f"✅ 응답 캐시 hit: {key.query}")
+            return cached
+        
+        if self.embed_fn is not None:
+            neighbors = self.neighbors.get(key.context) or []
+            now = time.time()
+            neighbors = [n for n in neighbors if n[2] > now]
+            if neighbors:
+                vector = self._embed(key.query)
+                if vector is not None:
+                    scores = np.stack([n[1] for n in neighbors]) @ vector
+                    best = int(np.argmax(scores))
+                    if scores[best] >= self.similarity_threshold:
+                        cached = self.responses.get((neighbors[best][0], key.context))
+                        if cached is not None:
+                            self._count("semantic_hits")
+                            record_cache("response_semantic", True)
+                            logger.info(f"✅ 응답 캐시 유사 질문 hit: {key.query} ≈ {neighbors[best][0]} ({scores[best]:.3f})")
+                            return cached
+        
+        self._count("misses")
+        record_cache("response", False)
+        return None
+    
+    def put(self, key: ResponseCacheKey, response: Dict):
+        """응답 저장 (키의 TTL 적용)"""
+        if key.ttl <= 0:
+            return
+        self.responses.set((key.query, key.context), response, ttl=key.ttl)
+        self._count("stores")
+        
+        if self.embed_fn is not None:
+            vector = self._embed(key.query)
+            if vector is None:
+                return
+            now = time.time()
+            with self._lock:
+                neighbors: List = [
+                    n for n in (self.neighbors.get(key.context) or [])
+                    if n[2] > now and n[0] != key.query
+                ]
+                neighbors.append((key.query, vector, now + key.ttl))
+                self.neighbors.set(key.context, neighbors[-self.max_neighbors:], ttl=key.ttl)
+    
+    def clear(self):
+        self.responses.clear()
+        self.neighbors.clear()
+    
+    def stats(self) -> Dict:
+        """hit/miss 지표 (hit_rate는 캐시 가능한 요청 기준)"""
+        with self._lock:
+            stats = dict(self._stats)
+        hits = stats["exact_hits"] + stats["semantic_hits"]
+        return {
+            **stats,
+            "hits": hits,
+            "hit_rate": hits / stats["lookups"] if stats["lookups"] else 0.0,
+            "entries": self.responses.stats()["entries"],
+            "similarity_threshold": self.similarity_threshold,
+        }
+
+
+def _embed_query(text: str) -> Sequence[float]:
+    # 검색 도구와 같은 쿼리 임베딩 캐시를 공유 (같은 질문이면 search_facilities에서 재사용)
+    from models.pca_embeddings import pca_embeddings
+    return pca_embeddings.embed_query(text)
+
+
+def create_response_cache(settings) -> Optional[ResponseCache]:
+    """설정에 맞는 응답 캐시 (RESPONSE_CACHE_ENABLED=False면 None)"""
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return None
+    return ResponseCache(
+        ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        weather_window_seconds=settings.WEATHER_FORECAST_WINDOW_SECONDS,
+        similarity_threshold=settings.RESPONSE_CACHE_SIMILARITY,
+        embed_fn=_embed_query
+    )
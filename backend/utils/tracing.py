@@ -0,0 +1,399 @@
+"""
+요청 단위 span 추적 + Prometheus 지표
+
+- start_trace / finish_trace: 요청 하나의 trace (contextvar, 스레드 풀로도 복사됨)
+- span(): 구간 시간 측정 → 현재 trace에 기록 + 종류/이름별 지연 시간 히스토그램
+- TracingCallbackHandler: AgentExecutor 안의 LLM / 도구 실행을 span으로 기록 (토큰 수 포함)
+- record_cache(): 캐시 hit/miss 카운터 + 현재 span 속성
+- render_prometheus(): /metrics 텍스트 포맷
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import bisect
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from langchain_core.callbacks import BaseCallbackHandler
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# span 지연 시간 히스토그램 버킷 (초)
+SPAN_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = "kids_chatbot"
+
+
+class Span:
+    """시간 측정 구간 하나"""
+
+    __slots__ = ("span_id", "parent_id", "name", "kind", "start", "duration", "attributes", "error")
+
+    def __init__(self, name: str, kind: str, parent_id: Optional[str], attributes: Optional[Dict] = None):
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.attributes = dict(attributes or {})
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_dict(self, origin: float) -> Dict:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": None if self.duration is None else round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """요청 하나의 span 모음 (도구 스레드에서도 추가되므로 lock)"""
+
+    def __init__(self, name: str, attributes: Optional[Dict] = None):
+        self.trace_id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.root = Span(name, "request", None, attributes)
+        self._lock = threading.Lock()
+        self._spans: List[Span] = []
+
+    def add(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return sorted(self._spans, key=lambda span: span.start)
+
+    def breakdown(self) -> Dict[str, float]:
+        """span 종류별 누적 시간 (ms, 중첩 구간은 각각 합산)"""
+        totals: Dict[str, float] = {}
+        for span in self.spans():
+            if span.duration is not None:
+                totals[span.kind] = totals.get(span.kind, 0.0) + span.duration * 1000
+        return {kind: round(ms, 1) for kind, ms in sorted(totals.items(), key=lambda item: -item[1])}
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "started_at": self.started_at,
+            "name": self.root.name,
+            "duration_ms": None if self.root.duration is None else round(self.root.duration * 1000, 3),
+            "attributes": self.root.attributes,
+            "error": self.root.error,
+            "breakdown_ms": self.breakdown(),
+            "spans": [span.to_dict(self.origin) for span in [self.root, *self.spans()]],
+        }
+
+
+# ----------------------------------------------------------------------
+# 지표 (프로세스 전역)
+# ----------------------------------------------------------------------
+class _Histogram:
+    __slots__ = ("count", "errors", "total", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(SPAN_BUCKETS) + 1)  # 마지막은 +Inf
+
+
+class SpanMetrics:
+    """종류/이름별 span 히스토그램 + LLM 토큰 수 + 캐시 hit/miss 카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans: Dict[Tuple[str, str], _Histogram] = {}
+        self.tokens: Dict[Tuple[str, str], int] = {}
+        self.cache: Dict[Tuple[str, str], int] = {}
+
+    def observe(self, kind: str, name: str, seconds: float, error: bool = False):
+        with self._lock:
+            histogram = self.spans.get((kind, name))
+            if histogram is None:
+                histogram = self.spans[(kind, name)] = _Histogram()
+            histogram.count += 1
+            histogram.errors += int(error)
+            histogram.total += seconds
+            histogram.buckets[bisect.bisect_left(SPAN_BUCKETS, seconds)] += 1
+
+    def add_tokens(self, model: str, prompt_tokens: int, completion_tokens: int):
+        with self._lock:
+            for token_type, count in (("prompt", prompt_tokens), ("completion", completion_tokens)):
+                self.tokens[(model, token_type)] = self.tokens.get((model, token_type), 0) + count
+
+    def add_cache(self, cache: str, hit: bool):
+        key = (cache, "hit" if hit else "miss")
+        with self._lock:
+            self.cache[key] = self.cache.get(key, 0) + 1
+
+    def render(self) -> List[str]:
+        name = f"{METRIC_PREFIX}_span_duration_seconds"
+        lines = [f"# HELP {name} 요청 구간별 지연 시간", f"# TYPE {name} histogram"]
+        errors = [
+            f"# HELP {METRIC_PREFIX}_span_errors_total 예외로 끝난 구간 수",
+            f"# TYPE {METRIC_PREFIX}_span_errors_total counter"
+        ]
+        with self._lock:
+            for (kind, span_name), histogram in sorted(self.spans.items()):
+                labels = f'kind="{_escape(kind)}",name="{_escape(span_name)}"'
+                cumulative = 0
+                for bound, count in zip(list(SPAN_BUCKETS) + ["+Inf"], histogram.buckets):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.total:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+                errors.append(f"{METRIC_PREFIX}_span_errors_total{{{labels}}} {histogram.errors}")
+
+            lines.extend(errors)
+            lines.append(f"# HELP {METRIC_PREFIX}_llm_tokens_total LLM 토큰 수")
+            lines.append(f"# TYPE {METRIC_PREFIX}_llm_tokens_total counter")
+            for (model, token_type), count in sorted(self.tokens.items()):
+                lines.append(f'{METRIC_PREFIX}_llm_tokens_total{{model="{_escape(model)}",type="{token_type}"}} {count}')
+
+            lines.append(f"# HELP {METRIC_PREFIX}_cache_requests_total 캐시 조회 수")
+            lines.append(f"# TYPE {METRIC_PREFIX}_cache_requests_total counter")
+            for (cache, result), count in sorted(self.cache.items()):
+                lines.append(f'{METRIC_PREFIX}_cache_requests_total{{cache="{_escape(cache)}",result="{result}"}} {count}')
+        return lines
+
+
+span_metrics = SpanMetrics()
+
+# /metrics에 gauge로 함께 내보낼 기존 stats 함수 (이름 → dict 반환 함수)
+_stats_collectors: Dict[str, Callable[[], Dict]] = {}
+
+
+def register_stats_collector(name: str, collector: Callable[[], Dict]):
+    """stats dict의 숫자 값을 /metrics gauge로 노출 (예: response_cache → kids_chatbot_response_cache_hit_rate)"""
+    _stats_collectors[name] = collector
+
+
+_METRIC_NAME_RE = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _flatten(prefix: str, stats: Dict, out: List[Tuple[str, float]]):
+    for key, value in stats.items():
+        metric = _METRIC_NAME_RE.sub("_", f"{prefix}_{key}")
+        if isinstance(value, (bool, int, float)):
+            out.append((metric, float(value)))
+        elif isinstance(value, dict):
+            _flatten(metric, value, out)
+
+
+def render_prometheus() -> str:
+    """Prometheus text exposition format"""
+    lines = span_metrics.render()
+    for name, collector in sorted(_stats_collectors.items()):
+        try:
+            stats = collector()
+        except Exception as e:
+            logger.warning(f"stats 수집 실패 ({name}): {e}")
+            continue
+        gauges: List[Tuple[str, float]] = []
+        _flatten(f"{METRIC_PREFIX}_{name}", stats, gauges)
+        for metric, value in gauges:
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# ----------------------------------------------------------------------
+# 요청 컨텍스트
+# ----------------------------------------------------------------------
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def get_current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def start_trace(name: str, **attributes):
+    """요청 trace 시작 (반환된 토큰으로 finish_trace 호출)"""
+    trace = Trace(name, attributes)
+    return trace, (_current_trace.set(trace), _current_span.set(trace.root))
+
+
+def finish_trace(trace: Trace, tokens, error: Optional[BaseException] = None):
+    """요청 trace 종료 → 지표 기록, 요약 로그, TRACE_LOG_PATH가 있으면 JSONL로 저장"""
+    trace_token, span_token = tokens
+    _current_span.reset(span_token)
+    _current_trace.reset(trace_token)
+
+    root = trace.root
+    root.duration = time.perf_counter() - root.start
+    if error is not None:
+        root.error = type(error).__name__
+    span_metrics.observe(root.kind, root.name, root.duration, error=error is not None)
+
+    breakdown = ", ".join(f"{kind} {ms:.0f}ms" for kind, ms in trace.breakdown().items())
+    logger.info(f"⏱️ {root.name} {root.duration * 1000:.0f}ms [{trace.trace_id[:8]}] {breakdown}")
+
+    if settings.TRACE_LOG_PATH:
+        try:
+            with open(settings.TRACE_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(trace.to_dict(), ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning(f"trace 저장 실패: {e}")
+
+
+def _finish_span(span: Span, error: Optional[BaseException] = None, trace: Optional[Trace] = None):
+    span.duration = time.perf_counter() - span.start
+    if error is not None:
+        span.error = type(error).__name__
+    span_metrics.observe(span.kind, span.name, span.duration, error=error is not None)
+    trace = trace or _current_trace.get()
+    if trace is not None:
+        trace.add(span)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes) -> Iterator[Span]:
+    """
+    구간 시간 측정 (trace가 없어도 히스토그램은 기록)
+
+    with span("chroma.query", kind="vector", k=10) as s:
+        ...
+        s.set("results", len(ids))
+    """
+    parent = _current_span.get()
+    current = Span(name, kind, parent.span_id if parent else None, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        _current_span.reset(token)
+        _finish_span(current, error=e)
+        raise
+    _current_span.reset(token)
+    _finish_span(current)
+
+
+def record_cache(cache: str, hit: bool):
+    """캐시 hit/miss 기록 (카운터 + 현재 span 속성)"""
+    span_metrics.add_cache(cache, hit)
+    current = _current_span.get()
+    if current is not None:
+        current.attributes.setdefault("cache", {})[cache] = "hit" if hit else "miss"
+
+
+# ----------------------------------------------------------------------
+# LangChain 콜백
+# ----------------------------------------------------------------------
+def _model_name(serialized: Optional[Dict], kwargs: Dict) -> str:
+    params = kwargs.get("invocation_params") or {}
+    metadata = kwargs.get("metadata") or {}
+    return (
+        params.get("model_name") or params.get("model") or metadata.get("ls_model_name")
+        or (serialized or {}).get("name") or "llm"
+    )
+
+
+def _token_usage(response) -> Tuple[int, int]:
+    """LLMResult → (prompt, completion) 토큰 수 (스트리밍이면 usage_metadata)"""
+    usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+    if usage:
+        return int(usage.get("prompt_tokens", 0)), int(usage.get("completion_tokens", 0))
+    prompt = completion = 0
+    for generations in getattr(response, "generations", None) or []:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            prompt += int(metadata.get("input_tokens", 0))
+            completion += int(metadata.get("output_tokens", 0))
+    return prompt, completion
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    LLM / 도구 실행을 현재 trace의 span으로 기록
+
+    run_inline: 요청 태스크 안에서 바로 호출되어야 도구 시작 시 current span을
+    바꿔 둘 수 있음 (도구 스레드로 복사되는 컨텍스트에 도구 span이 들어감)
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs: Dict[Any, Tuple[Span, Optional[Trace], Optional[Span]]] = {}
+
+    def _open(self, run_id, parent_run_id, name: str, kind: str, **attributes) -> Span:
+        current = _current_span.get()
+        with self._lock:
+            parent_run = self._runs.get(parent_run_id)
+        parent = parent_run[0] if parent_run else current
+        opened = Span(name, kind, parent.span_id if parent else None, attributes)
+        with self._lock:
+            self._runs[run_id] = (opened, _current_trace.get(), current)
+        return opened
+
+    def _close(self, run_id, error: Optional[BaseException] = None) -> Optional[Span]:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return None
+        closed, trace, _ = run
+        _finish_span(closed, error=error, trace=trace)
+        return closed
+
+    # LLM -----------------------------------------------------------------
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._open(run_id, parent_run_id, _model_name(serialized, kwargs), "llm")
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        self._open(run_id, parent_run_id, _model_name(serialized, kwargs), "llm")
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            run = self._runs.get(run_id)
+        if run is not None:
+            prompt_tokens, completion_tokens = _token_usage(response)
+            run[0].set("prompt_tokens", prompt_tokens)
+            run[0].set("completion_tokens", completion_tokens)
+            span_metrics.add_tokens(run[0].name, prompt_tokens, completion_tokens)
+        self._close(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._close(run_id, error=error)
+
+    # 도구 ----------------------------------------------------------------
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        opened = self._open(run_id, parent_run_id, (serialized or {}).get("name") or kwargs.get("name") or "tool", "tool")
+        _current_span.set(opened)
+
+    def _end_tool(self, run_id, error: Optional[BaseException] = None):
+        with self._lock:
+            run = self._runs.get(run_id)
+        if run is not None:
+            _current_span.set(run[2])  # 도구 시작 전 span으로 되돌림
+        self._close(run_id, error=error)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end_tool(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end_tool(run_id, error=error)
+
+
+# 요청 config의 callbacks로 넘겨서 하위 실행(도구 안의 LLM 호출 포함)까지 전달
+tracing_callback = TracingCallbackHandler()